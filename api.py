@@ -1,7 +1,7 @@
 from flask import Flask, jsonify, request, render_template
 from flask_cors import CORS
-from supabase import create_client, Client
 import os
+import re
 import subprocess
 from datetime import datetime  # ✅ Correct import
 import uuid
@@ -22,83 +22,131 @@ if not supabase_url or not supabase_key:
     )
     print("Please set these in your Render Secrets.")
 
-# Initialize Supabase client
-try:
-    supabase = create_client(supabase_url, supabase_key)
-    print("✅ Successfully connected to Supabase with Service Role Key.")
-except Exception as e:
-    print(f"❌ Error connecting to Supabase: {str(e)}")
-    supabase = None
+# Initialize Supabase client on first use, so starting the server never waits on it
+_supabase_client = None
+
+
+def get_supabase():
+    """Returns the shared Supabase client, creating it on first call (None if that fails)."""
+    global _supabase_client
+    if _supabase_client is None:
+        try:
+            from supabase import create_client  # slow to import, so only when first needed
+
+            _supabase_client = create_client(supabase_url, supabase_key)
+            print("✅ Successfully connected to Supabase with Service Role Key.")
+        except Exception as e:
+            print(f"❌ Error connecting to Supabase: {str(e)}")
+    return _supabase_client
+
+
+class _LazySupabase:
+    def __getattr__(self, name):
+        return getattr(get_supabase(), name)
+
+
+supabase = _LazySupabase()
+
+# Errors raised by our Postgres functions: P0002 = row missing, 22023 = bad input
+_RPC_ERROR_STATUS = {"P0002": 404, "22023": 400}
+
+
+def rpc_error_status(e):
+    """HTTP status for an error from supabase.rpc(): 404/400 for our functions' errors, else 500."""
+    return _RPC_ERROR_STATUS.get(getattr(e, "code", None), 500)
 
 logs = []  # In-memory storage (Optional: Store in Supabase)
 
+_LOG_ID = re.compile(r"[\w-]+")
+
+
+def _parse_log_cursor(cursor):
+    """(created_at, id) from a next_cursor "created_at|id"; ValueError if it isn't one.
+
+    Checked before the values go into the or() filter below (same as
+    parse_log_cursor in api/utils/helpers.py).
+    """
+    created_at, separator, log_id = cursor.partition("|")
+    if not separator or not _LOG_ID.fullmatch(log_id):
+        raise ValueError("Invalid cursor")
+    datetime.fromisoformat(created_at)  # raises ValueError for anything but an ISO timestamp
+    return created_at, log_id
+
 
 @app.route('/logs', methods=['POST'])
 def insert_log():
-        """
-        Inserts a log entry into the logs table.
-        Expects JSON payload with: severity, message, service, page, endpoint, user_id, ip_address, request_data, response_data, stack_trace.
-        """
-        try:
-            data = request.json
-            new_log = {
-                "id": str(uuid.uuid4()),
-                "severity": data.get("severity", "INFO"),  # Default to INFO
-                "message": data["message"],  # Required
-                "service": data["service"],  # Required: 'Frontend', 'Backend', 'API', 'Supabase'
-                "page": data.get("page"),  # Optional: Which frontend page triggered this
-                "endpoint": data.get("endpoint"),  # Optional: API route (if relevant)
-                "user_id": data.get("user_id"),  # Optional: Stores user identifier
-                "ip_address": request.remote_addr,  # Auto-capture user IP
-                "request_data": data.get("request_data"),  # Optional: JSON payload
-                "response_data": data.get("response_data"),  # Optional: JSON response
-                "stack_trace": data.get("stack_trace"),  # Optional: For error debugging
-                "created_at": datetime.datetime.utcnow().isoformat()  # Auto-timestamp
-            }
+    """
+    Inserts a log entry into the logs table.
+    Expects JSON payload with: severity, message, service, page, endpoint, user_id, ip_address, request_data, response_data, stack_trace.
+    """
+    try:
+        data = request.json
+        new_log = {
+            "id": str(uuid.uuid4()),
+            "severity": data.get("severity", "INFO"),  # Default to INFO
+            "message": data["message"],  # Required
+            "service": data["service"],  # Required: 'Frontend', 'Backend', 'API', 'Supabase'
+            "page": data.get("page"),  # Optional: Which frontend page triggered this
+            "endpoint": data.get("endpoint"),  # Optional: API route (if relevant)
+            "user_id": data.get("user_id"),  # Optional: Stores user identifier
+            "ip_address": request.remote_addr,  # Auto-capture user IP
+            "request_data": data.get("request_data"),  # Optional: JSON payload
+            "response_data": data.get("response_data"),  # Optional: JSON response
+            "stack_trace": data.get("stack_trace"),  # Optional: For error debugging
+            "created_at": datetime.utcnow().isoformat()  # Auto-timestamp
+        }
 
-            response = supabase.table("logs").insert(new_log).execute()
-            return jsonify({"message": "Log added successfully!", "data": response.data}), 201
+        response = supabase.table("logs").insert(new_log).execute()
+        return jsonify({"message": "Log added successfully!", "data": response.data}), 201
 
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 
-    @app.route('/logs', methods=['GET'])
-    def get_logs():
-        """
-        Fetches logs from the logs table with optional filters.
-        Query params: severity, service, page, endpoint, start_date, end_date, limit.
-        """
-        try:
-            query = supabase.table("logs").select("*")
-
-            # Optional filters
-            severity = request.args.get("severity")
-            service = request.args.get("service")
-            page = request.args.get("page")
-            endpoint = request.args.get("endpoint")
-            start_date = request.args.get("start_date")  # Format: YYYY-MM-DD
-            end_date = request.args.get("end_date")  # Format: YYYY-MM-DD
-            limit = request.args.get("limit", 50, type=int)  # Default: 50 logs
-
-            if severity:
-                query = query.eq("severity", severity)
-            if service:
-                query = query.eq("service", service)
-            if page:
-                query = query.eq("page", page)
-            if endpoint:
-                query = query.eq("endpoint", endpoint)
-            if start_date and end_date:
-                query = query.gte("created_at", start_date).lte("created_at", end_date)
-
-            query = query.order("created_at", desc=True).limit(limit)
-
-            response = query.execute()
-            return jsonify(response.data), 200
+@app.route('/logs', methods=['GET'])
+def get_logs():
+    """
+    Fetches logs from the logs table with optional filters.
+    Query params: severity (comma-separated), service, route, page, endpoint, start, end, cursor, limit.
+    Returns {"items": [...], "next_cursor": ...}; pass next_cursor back as ?cursor= for the next page.
+    """
+    try:
+        query = supabase.table("logs").select("*")
+
+        # Optional filters
+        severities = [s for s in request.args.get("severity", "").split(",") if s]
+        for column in ("service", "route", "page", "endpoint"):
+            value = request.args.get(column)
+            if value:
+                query = query.eq(column, value)
+        if severities:
+            query = query.in_("severity", severities)
+
+        start = request.args.get("start") or request.args.get("start_date")  # Inclusive
+        end = request.args.get("end") or request.args.get("end_date")  # Exclusive
+        if start:
+            query = query.gte("created_at", start)
+        if end:
+            query = query.lt("created_at", end)
+
+        # Keyset pagination: newest first by (created_at, id)
+        cursor = request.args.get("cursor")
+        if cursor:
+            try:
+                created_at, log_id = _parse_log_cursor(cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{log_id}")')
 
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+        limit = max(1, min(request.args.get("limit", 50, type=int), 500))  # Default: 50 logs
+        response = query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+
+        items = response.data
+        next_cursor = f"{items[-1]['created_at']}|{items[-1]['id']}" if len(items) == limit else None
+        return jsonify({"items": items, "next_cursor": next_cursor}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 
 # Route to check server status
@@ -146,22 +194,12 @@ def get_budgets():
         if month is None or year is None:
             return jsonify({"error": "Month and year are required"}), 400
 
-        # Get Regular Budget Categories (parent_id != 9)
-        regular_budgets = (
-            supabase.table("budgets").select(
-                "*, categories(parent_id, name)")  # ✅ Join with categories
-            .eq("month", month).eq("year",
-                                   year).neq("categories.parent_id",
-                                             9)  # ✅ Exclude Reserve categories
-            .execute())
-
-        # Get Reserve Budgets (parent_id = 9)
-        reserve_budgets = (
-            supabase.table("budgets").select(
-                "*, categories(parent_id, name)").eq("month", month).eq(
-                    "year", year).eq("categories.parent_id",
-                                     9)  # ✅ Only Reserve categories
-            .execute())
+        # One RPC each; the category join and the reserve (id 9) filter run in the database.
+        # An embedded filter like .neq("categories.parent_id", 9) only empties the
+        # embedded categories object, it never excludes the budget row itself.
+        params = {"p_month": month, "p_year": year}
+        regular_budgets = supabase.rpc("fetch_regular_budgets", params).execute()
+        reserve_budgets = supabase.rpc("fetch_reserve_budgets", params).execute()
 
         return jsonify({
             "regular_budgets": regular_budgets.data,
@@ -175,61 +213,46 @@ def get_budgets():
 @app.route('/split-transaction', methods=['POST'])
 def split_transaction():
     try:
-        data = request.json
-        transaction_id = data.get("transaction_id")
-        splits = data.get("splits", [])
-
-        if not transaction_id or not splits:
-            return jsonify({"error":
-                            "Missing transaction_id or splits data"}), 400
+        data = request.json or {}
+        # ✅ Accept a single split or a batch under "transactions"
+        split_requests = data.get("transactions") or [data]
 
-        # ✅ Fetch the original transaction
-        response = supabase.table("transactions").select("*").eq(
-            "transaction_id", transaction_id).execute()
-        if not response.data:
-            return jsonify({"error": "Original transaction not found"}), 404
-
-        original_transaction = response.data[
-            0]  # ✅ Now we have the original transaction
+        payload = []
+        for split_request in split_requests:
+            transaction_id = split_request.get("transaction_id")
+            splits = split_request.get("splits", [])
 
-        # ✅ Mark the original transaction as "split" and clear its categories
-        supabase.table("transactions").update({
-            "ignored": "split",
-            "user_category_id": None,
-            "user_subcategory_id": None
-        }).eq("transaction_id", transaction_id).execute()
+            if not transaction_id or not splits:
+                return jsonify({"error":
+                                "Missing transaction_id or splits data"}), 400
 
-        # ✅ Insert split transactions (ensuring ignored is FALSE)
-        new_splits = []
-        for split in splits:
-            new_splits.append({
+            payload.append({
                 "transaction_id":
-                str(uuid.uuid4()),  # Generate new unique ID
-                "parent_transaction_id":
-                transaction_id,  # Link to original
-                "amount":
-                split["amount"],
-                "user_category_id":
-                split["category_id"],
-                "user_subcategory_id":
-                split.get("subcategory_id"),
-                "date":
-                original_transaction[
-                    "date"],  # ✅ Use original transaction date
-                "name":
-                f"Split {original_transaction['name']} {original_transaction['date']}",
-                "account_id":
-                original_transaction["account_id"],  # ✅ Copy account_id
-                "ignored":
-                False,  # ✅ Ensure split transactions are active
+                str(transaction_id),
+                "splits": [{
+                    "amount": split["amount"],
+                    "user_category_id": split.get("category_id"),
+                    "user_subcategory_id": split.get("subcategory_id"),
+                    "date": split.get("date"),
+                    "name": split.get("name"),
+                } for split in splits]
             })
 
-        supabase.table("transactions").insert(new_splits).execute()
+        # ✅ Totals are validated and the parent marked in one database transaction
+        response = supabase.rpc("split_transactions", {
+            "requests": payload
+        }).execute()
 
-        return jsonify({"message": "Transaction split successfully!"}), 200
+        return jsonify({
+            "message": "Transaction split successfully!",
+            "results": response.data
+        }), 200
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        status = rpc_error_status(e)
+        if status == 404:
+            return jsonify({"error": "Original transaction not found"}), 404
+        return jsonify({"error": getattr(e, "message", None) or str(e)}), status
 
 
 @app.route('/setup')
@@ -241,7 +264,7 @@ def setup_page():
 @app.route('/manual-add', methods=['POST'])
 def add_manual_transaction():  # ✅ Renamed function
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         data = request.json
@@ -264,8 +287,10 @@ def add_manual_transaction():  # ✅ Renamed function
                 subcategory_id = transaction_data.get("user_subcategory_id")
                 amount = float(transaction_data.get("amount",
                                                     0))  # ✅ Ensure float
-                ignored = bool(transaction_data.get(
-                    "ignored", False))  # ✅ Convert to boolean
+                ignored = bool(
+                    transaction_data.get("is_ignored",
+                                         transaction_data.get("ignored", False))
+                )  # ✅ Convert to boolean; "ignored" is the old field name
                 date = str(transaction_data.get("date"))  # ✅ Ensure string
                 name = str(transaction_data.get("name"))  # ✅ Ensure string
 
@@ -290,8 +315,8 @@ def add_manual_transaction():  # ✅ Renamed function
                     None,  # ✅ Ensure integer
                     "account_id":
                     account_id,
-                    "ignored":
-                    ignored  # ✅ Boolean instead of string
+                    "is_ignored":
+                    ignored  # ✅ Same flag the blueprints and work queue use
                 }
 
                 print("📤 Sending to Supabase:",
@@ -375,7 +400,7 @@ def ping():
 @app.route('/categories', methods=['GET'])
 def get_categories():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         # Fetch all categories
@@ -455,7 +480,7 @@ def get_budget_categories():
 @app.route('/transactions', methods=['GET'])
 def get_transactions():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         transactions = supabase.table('transactions').select('*').order(
@@ -469,12 +494,12 @@ def get_transactions():
 @app.route('/processed-transactions', methods=['GET'])
 def get_processed_transactions():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         # Get transactions that are either ignored OR have a user_category_id set
         transactions = supabase.table('transactions').select('*').or_(
-            'ignored.eq.true,user_category_id.not.is.null').execute()
+            'is_ignored.eq.true,user_category_id.not.is.null').execute()
         return jsonify(transactions.data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -484,14 +509,14 @@ def get_processed_transactions():
 @app.route('/unprocessed-transactions', methods=['GET'])
 def get_unprocessed_transactions():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         transactions = (
             supabase.table("transactions").select("*").or_(
-                "ignored.is.null, ignored.neq.true, ignored.neq.split"
+                "is_ignored.is.null,is_ignored.eq.false"
             )  # ✅ Include NULL values explicitly
-            .is_("user_category_id", None).execute())
+            .is_("user_category_id", None).order("date").execute())
 
         return jsonify(transactions.data)
     except Exception as e:
@@ -502,7 +527,7 @@ def get_unprocessed_transactions():
 @app.route('/categories', methods=['POST'])
 def add_category():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         data = request.json
@@ -524,7 +549,7 @@ def add_category():
 @app.route('/categories/<int:id>', methods=['PUT'])
 def update_category(id):
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         data = request.json
@@ -546,7 +571,7 @@ def update_category(id):
 @app.route('/categories/<int:id>', methods=['DELETE'])
 def delete_category(id):
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         response = supabase.table('categories').delete().eq('id', id).execute()
@@ -559,7 +584,7 @@ def delete_category(id):
 @app.route('/confirm-duplicate', methods=['POST'])
 def confirm_duplicate():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         data = request.json
@@ -585,7 +610,7 @@ def confirm_duplicate():
 @app.route('/update-transactions', methods=['POST'])
 def update_transactions():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         data = request.json
@@ -596,56 +621,78 @@ def update_transactions():
 
         if isinstance(data, dict):
             data = [data]  # Ensure list format
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a transaction object or a list of them"}), 400
 
+        # ✅ Validate the whole batch before touching the database
+        updates = []
         results = []
+        seen_ids = set()
         for transaction_data in data:
+            if not isinstance(transaction_data, dict):
+                results.append({"transaction_id": None, "success": False,
+                                "error": "Each transaction must be an object"})
+                continue
+            transaction_id = str(
+                transaction_data.get("transaction_id") or "")  # ✅ Ensure string
+            result = {"transaction_id": transaction_id, "success": False, "error": None}
+            results.append(result)
+
+            if not transaction_id:
+                result["error"] = "Missing transaction_id"
+                continue
+            if transaction_id in seen_ids:
+                result["error"] = "Duplicate transaction_id in batch"
+                continue
+
             try:
-                transaction_id = str(
-                    transaction_data.get("transaction_id"))  # ✅ Ensure string
                 category_id = transaction_data.get("user_category_id")
                 subcategory_id = transaction_data.get("user_subcategory_id")
-                ignored = transaction_data.get(
-                    "ignored")  # ✅ Directly use ignored value
-
-                print(
-                    f"🛠 Updating: transaction_id={transaction_id}, category_id={category_id}, subcategory_id={subcategory_id}, ignored={ignored}"
-                )
-
-                # ✅ Use .update() instead of .insert()
-                transaction_update = {
+                update = {
+                    "transaction_id":
+                    transaction_id,
                     "user_category_id":
                     int(category_id) if category_id is not None else None,
                     "user_subcategory_id":
                     int(subcategory_id)
                     if subcategory_id is not None else None,
-                    "ignored":
-                    ignored  # ✅ Update ignored field
                 }
-
-                print("📤 Sending update to Supabase:",
-                      transaction_update)  # ✅ Log before update
-
-                transaction = (
-                    supabase.table(
-                        "transactions").update(transaction_update).eq(
-                            "transaction_id",
-                            transaction_id)  # ✅ Find transaction by ID
-                    .execute())
-
-                print("✅ Update response:", transaction.data)  # ✅ Log success
-
-                results.append(transaction.data)
-
-            except Exception as e:
-                print("❌ ERROR updating transaction:",
-                      str(e))  # 🔥 Log exact error
-                return jsonify(
-                    {"error": f"Failed to update transaction: {str(e)}"}), 500
+                # ✅ Update is_ignored only when sent ("ignored" is the old field name)
+                for field in ("ignored", "is_ignored"):
+                    if transaction_data.get(field) is not None:
+                        update["is_ignored"] = bool(transaction_data[field])
+                updates.append(update)
+                seen_ids.add(transaction_id)
+            except (TypeError, ValueError) as e:
+                result["error"] = f"Invalid category id: {str(e)}"
+
+        # ✅ One RPC call updates every valid row
+        updated_ids = set()
+        if updates:
+            print(f"📤 Sending {len(updates)} updates to Supabase")
+            response = supabase.rpc("bulk_update_transactions", {
+                "updates": updates
+            }).execute()
+            updated_ids = {row["transaction_id"] for row in response.data or []}
+
+        for result in results:
+            if result["error"] is None:
+                if result["transaction_id"] in updated_ids:
+                    result["success"] = True
+                else:
+                    result["error"] = "Transaction not found"
+
+        failed = sum(1 for result in results if not result["success"])
+        print(f"✅ Updated {len(updated_ids)} transactions, {failed} failed")
 
         return jsonify({
-            "message": "Transactions updated successfully",
+            "message":
+            "Transactions updated successfully"
+            if not failed else "Some transactions could not be updated",
+            "updated": len(updated_ids),
+            "failed": failed,
             "results": results
-        }), 200
+        }), 200 if not failed else 207
 
     except Exception as e:
         print("❌ GENERAL API ERROR:", str(e))
@@ -656,7 +703,7 @@ def update_transactions():
 @app.route('/duplicate-pairs', methods=['GET'])
 def get_duplicate_pairs():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         # Get transactions flagged as potential duplicates
@@ -692,7 +739,7 @@ def get_duplicate_pairs():
 @app.route('/duplicate-transactions', methods=['GET'])
 def get_duplicate_transactions():
     try:
-        if supabase is None:
+        if get_supabase() is None:
             return jsonify({"error": "Supabase client not initialized"}), 500
 
         duplicates = supabase.table('transactions').select('*').eq(
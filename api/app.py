@@ -1,25 +1,67 @@
 import os
 from flask import Flask, jsonify
 from flask_cors import CORS
-from supabase_client import supabase  # ✅ Import shared Supabase client
+from storage.backends import create_repository
+from utils.compression import install_compression
+from utils.health import WARM_UP, ReadinessCheck, warm_up
+from utils.json_provider import FastJSONProvider
+from utils.logger import set_log_sink
+from utils.metrics import install_metrics
+from utils.tracing import install_query_tracing
 
-def create_app():
+def create_app(backend=None, repository=None):
+    """Builds the API. `backend` is "supabase" or "sqlite" (default: STORAGE_BACKEND)."""
     app = Flask(__name__)
     CORS(app, resources={r"/*": {"origins": "*"}},
          supports_credentials=True, 
          allow_headers=["Content-Type", "Authorization"],
          methods=["GET", "POST", "OPTIONS", "PATCH", "DELETE"])
 
-    if supabase is None:
-        print("❌ ERROR: Supabase client not initialized!")
+    # ✅ Pick the storage backend once; routes reach it through get_repository()
+    if repository is None:
+        repository = create_repository(backend)
+    app.extensions["repository"] = repository
+    set_log_sink(repository.insert_logs)
+    print(f"✅ Using {repository.name} storage backend.")
 
-    # ✅ Import blueprints AFTER Supabase is set
+    # ✅ Clients are created on first use; WARM_UP=1 creates them in the background now
+    app.extensions["readiness"] = ReadinessCheck(repository)
+    if WARM_UP:
+        warm_up(repository)
+
+    # ✅ Encode JSON with orjson
+    app.json = FastJSONProvider(app)
+
+    # ✅ Record latency, status and size of every request for /metrics
+    install_metrics(app)
+
+    # ✅ Gzip large responses (registered after metrics so /metrics sees bytes on the wire)
+    install_compression(app)
+
+    # ✅ Count backend queries per request and warn about N+1 patterns
+    install_query_tracing(app)
+
+    # ✅ Serve reads from the local SQLite replica when REPLICA_DB is set
+    replica = getattr(repository, "replica", None)
+    if replica is not None:
+        replica.start()
+
+    # ✅ Import blueprints AFTER the repository is set
     from routes.accounts import accounts_blueprint
     from routes.categories import categories_blueprint
     from routes.transactions import transactions_blueprint
     from routes.logs import logs_blueprint
     from routes.budgets import budgets_blueprint  # ✅ Add Budgets Route
     from routes.summary import summary_blueprint  # ✅ Add Summary Route
+    from routes.dashboard import dashboard_blueprint  # ✅ Add Dashboard Route
+    from routes.analytics import analytics_blueprint  # ✅ Add Analytics Route
+    from routes.rules import rules_blueprint  # ✅ Add Rules Route
+    from routes.suggestions import suggestions_blueprint  # ✅ Add Suggestions Route
+    from routes.work_queue import work_queue_blueprint  # ✅ Add Work Queue Route
+    from routes.sync import sync_blueprint  # ✅ Add Sync Route
+    from routes.webhooks import webhooks_blueprint  # ✅ Add Webhooks Route
+    from routes.metrics import metrics_blueprint  # ✅ Add Metrics Route
+    from routes.health import health_blueprint  # ✅ Add Health Route
 
     # ✅ Register Blueprints
     app.register_blueprint(accounts_blueprint)
@@ -28,6 +70,15 @@ def create_app():
     app.register_blueprint(logs_blueprint)
     app.register_blueprint(budgets_blueprint)  # ✅ Register Budgets
     app.register_blueprint(summary_blueprint)  # ✅ Register Summary
+    app.register_blueprint(dashboard_blueprint)  # ✅ Register Dashboard
+    app.register_blueprint(analytics_blueprint)  # ✅ Register Analytics
+    app.register_blueprint(rules_blueprint)  # ✅ Register Rules
+    app.register_blueprint(suggestions_blueprint)  # ✅ Register Suggestions
+    app.register_blueprint(work_queue_blueprint)  # ✅ Register Work Queue
+    app.register_blueprint(sync_blueprint)  # ✅ Register Sync
+    app.register_blueprint(webhooks_blueprint)  # ✅ Register Webhooks
+    app.register_blueprint(metrics_blueprint)  # ✅ Register Metrics
+    app.register_blueprint(health_blueprint)  # ✅ Register Health
 
     @app.route("/test-connection", methods=["GET"])
     def test_connection():
@@ -0,0 +1,200 @@
+"""Async serving mode for the API.
+
+    cd api && python asgi.py
+    cd api && uvicorn asgi:create_asgi_app --factory --host 0.0.0.0 --port 10000
+
+The read routes that wait on Supabase (accounts, categories, transactions,
+budgets, summaries and the dashboard) run on the event loop with the async
+PostgREST client, so one process can keep hundreds of them in flight. They
+run the same route bodies as the Flask blueprints (utils/read_routes.py) and
+get the same metrics, query tracing headers, gzip and CORS headers. Every
+other route, and every method other than GET, is handed to the Flask app
+from app.py on a thread pool, so the route surface is identical to the
+Flask server's. benchmarks/bench_asgi.py compares the two under load.
+"""
+import asyncio
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from app import create_app
+from storage.async_repository import create_async_repository
+from utils.compression import compress_body
+from utils.metrics import request_metrics
+from utils.read_routes import ASYNC, READ_ROUTES
+from utils.tracing import QUERY_BUDGET, begin_trace, end_trace, report_trace, trace_headers
+
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 16))  # threads for routes served by Flask
+
+
+def _path_regex(pattern):
+    """Regex for a Flask rule; <int:name> segments become named groups (passed to the body as ints)."""
+    return re.compile("^" + re.sub(r"<int:(\w+)>", r"(?P<\1>\\d+)", pattern) + "$")
+
+
+# (compiled regex, path pattern, body): the same bodies as the Flask routes (utils/read_routes.py)
+_routes = [(_path_regex(pattern), pattern, body) for pattern, body in READ_ROUTES.items()]
+
+
+# -------------------------------------------
+# ✅ ASGI application
+# -------------------------------------------
+class AsyncAPI:
+    """ASGI app: native async GET routes, everything else served by the Flask app."""
+
+    def __init__(self, flask_app, async_repository=None, wsgi_threads=ASGI_WSGI_THREADS):
+        self.flask_app = flask_app
+        self.repository = async_repository
+        self._executor = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix="wsgi")
+
+    async def startup(self):
+        if self.repository is None:
+            self.repository = await create_async_repository(self.flask_app.extensions["repository"])
+        print(f"✅ Async API serving reads through {type(self.repository).__name__}.")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        pattern, body, params = self._match(scope)
+        if body is None:
+            return await self._call_flask(scope, receive, send)  # recorded by the Flask app's own metrics
+
+        # Labelled like the Flask rule of the same route, so both modes share series and trace names
+        status, size, started = 500, None, request_metrics.start(scope["method"], pattern)
+        trace, token = begin_trace(f"{scope['method']} {pattern}", QUERY_BUDGET)
+        try:
+            if self.repository is None:  # servers that skip lifespan
+                await self.startup()
+            args = MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+            data, status = await ASYNC.run(body(self.repository, args, ASYNC, **params))
+            content = self.flask_app.json.encode(data) + b"\n"
+            size = len(content)
+            await self._respond(scope, send, status, content, trace_headers(trace))
+        finally:
+            end_trace(token)
+            report_trace(trace)
+            request_metrics.finish(scope["method"], pattern, status, size, started)
+
+    def _match(self, scope):
+        if scope["method"] not in ("GET", "HEAD"):
+            return None, None, None
+        for regex, pattern, body in _routes:
+            match = regex.match(scope["path"])
+            if match:
+                return pattern, body, {name: int(value) for name, value in match.groupdict().items()}
+        return None, None, None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _respond(self, scope, send, status, body, extra_headers):
+        request_headers = dict(scope.get("headers") or [])
+        # Same gzip negotiation as utils/compression.py applies to the Flask routes
+        body, encoding = compress_body(body, request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        headers += [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in extra_headers.items()]
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+        vary = [b"Accept-Encoding"]
+        # Same CORS answer Flask-CORS gives in app.py (any origin, with credentials)
+        origin = request_headers.get(b"origin")
+        if origin:
+            headers += [(b"access-control-allow-origin", origin), (b"access-control-allow-credentials", b"true")]
+            vary.append(b"Origin")
+        headers.append((b"vary", b", ".join(vary)))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+    # -------------------------------------------
+    # ✅ Fallback: run the Flask app for this request on the thread pool
+    # -------------------------------------------
+    async def _call_flask(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            self._executor, self._run_wsgi, self._environ(scope, body)
+        )
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+    @staticmethod
+    def _environ(scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+            "PATH_INFO": scope["path"].encode().decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope.get("headers") or []:
+            name, value = name.decode("latin-1").upper().replace("-", "_"), value.decode("latin-1")
+            key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    def _run_wsgi(self, environ):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+        result = self.flask_app(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return response["status"], response["headers"], content
+
+
+def create_asgi_app(backend=None, repository=None, async_repository=None):
+    """Builds the ASGI app around create_app(); uvicorn calls this with --factory."""
+    return AsyncAPI(create_app(backend=backend, repository=repository), async_repository)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "asgi:create_asgi_app", factory=True, host="0.0.0.0", port=int(os.getenv("PORT", 10000)),
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+    )
@@ -1,32 +1,24 @@
 from flask import Blueprint, jsonify, request
-from supabase_client import supabase  # ✅ Import shared Supabase client
+from storage.backends import get_repository  # ✅ Shared storage backend
 from utils.logger import log_message  # ✅ Import the logger utility
+from utils import read_routes  # ✅ Read route bodies shared with the ASGI app
+from utils.read_routes import respond
 
 accounts_blueprint = Blueprint("accounts", __name__)
 
 @accounts_blueprint.route("/accounts", methods=["GET"])
 def get_accounts():
     """Fetch all accounts."""
-    if supabase is None:
-        log_message("Supabase client not initialized", "ERROR", "Backend", "Accounts Route")
-        return jsonify({"error": "Supabase not initialized"}), 500
-
-    try:
-        response = supabase.table("accounts").select("*").execute()
-        log_message("Fetched all accounts successfully", "INFO", "Backend", "Accounts Route")
-        return jsonify(response.data), 200
-    except Exception as e:
-        log_message(f"Error fetching accounts: {str(e)}", "ERROR", "Backend", "Accounts Route")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.accounts)
 
 @accounts_blueprint.route("/accounts", methods=["POST"])
 def add_account():
     """Add a new account."""
     try:
         data = request.json
-        response = supabase.table("accounts").insert(data).execute()
+        accounts = get_repository().add_account(data)
         log_message(f"Added new account: {data}", "INFO", "Backend", "Accounts Route")
-        return jsonify(response.data), 201
+        return jsonify(accounts), 201
     except Exception as e:
         log_message(f"Error adding account: {str(e)}", "ERROR", "Backend", "Accounts Route")
         return jsonify({"error": str(e)}), 500
@@ -36,9 +28,9 @@ def update_account(id):
     """Update an account."""
     try:
         data = request.json
-        response = supabase.table("accounts").update(data).eq("id", id).execute()
+        accounts = get_repository().update_account(id, data)
         log_message(f"Updated account {id}: {data}", "INFO", "Backend", "Accounts Route")
-        return jsonify(response.data), 200
+        return jsonify(accounts), 200
     except Exception as e:
         log_message(f"Error updating account {id}: {str(e)}", "ERROR", "Backend", "Accounts Route")
         return jsonify({"error": str(e)}), 500
@@ -47,7 +39,7 @@ def update_account(id):
 def delete_account(id):
     """Delete an account."""
     try:
-        response = supabase.table("accounts").delete().eq("id", id).execute()
+        get_repository().delete_account(id)
         log_message(f"Deleted account {id}", "INFO", "Backend", "Accounts Route")
         return jsonify({"message": "Account deleted successfully"}), 200
     except Exception as e:
@@ -0,0 +1,86 @@
+from flask import Blueprint, jsonify, request
+from storage.backends import get_repository
+from utils.logger import log_message
+from utils.analytics import (
+    ANALYTICS_MAX_MONTHS, budget_variance, get_frame, month_label, parse_month, trends,
+)
+
+analytics_blueprint = Blueprint("analytics", __name__)
+
+
+def _month_range():
+    """Reads ?start=YYYY-MM&end=YYYY-MM, returning (first, last) or an error message."""
+    try:
+        first = parse_month(request.args["start"])
+        last = parse_month(request.args["end"])
+    except (KeyError, ValueError):
+        return None, "start and end are required as YYYY-MM"
+    if last < first:
+        return None, "end must not be before start"
+    if last - first + 1 > ANALYTICS_MAX_MONTHS:
+        return None, f"At most {ANALYTICS_MAX_MONTHS} months can be requested at once"
+    return (first, last), None
+
+
+def _add_names(series, repository):
+    names = {category["id"]: category["name"] for category in repository.list_categories()}
+    for item in series:
+        item["category_name"] = names.get(item["category_id"])
+
+
+# ✅ Monthly totals, rolling averages and year-over-year change per category
+@analytics_blueprint.route("/analytics/trends", methods=["GET"])
+def get_trends():
+    """Spending per category (or subcategory) for every month in a range."""
+    try:
+        months, error = _month_range()
+        if error:
+            return jsonify({"error": error}), 400
+
+        by = request.args.get("by", "category")
+        window = request.args.get("window", 3, type=int)
+        if by not in ("category", "subcategory"):
+            return jsonify({"error": "by must be category or subcategory"}), 400
+        if not window or not 1 <= window <= 24:
+            return jsonify({"error": "window must be between 1 and 24 months"}), 400
+
+        repository = get_repository()
+        result = trends(get_frame(repository), *months, by=by, window=window)
+        _add_names(result["series"], repository)
+
+        log_message(
+            f"Fetched trends for {month_label(months[0])} to {month_label(months[1])}",
+            "INFO", "Backend", "Analytics Route",
+        )
+        return jsonify(result), 200
+
+    except Exception as e:
+        log_message(f"Error computing trends: {str(e)}", "ERROR", "Backend", "Analytics Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Budgeted vs actual spending per budgeted category
+@analytics_blueprint.route("/analytics/budget-variance", methods=["GET"])
+def get_budget_variance():
+    """Budget minus actual spending for each budgeted category and month."""
+    try:
+        months, error = _month_range()
+        if error:
+            return jsonify({"error": error}), 400
+
+        repository = get_repository()
+        first_year = int(month_label(months[0])[:4])
+        last_year = int(month_label(months[1])[:4])
+        budgets = repository.list_budgets_for_years(first_year, last_year)
+        result = budget_variance(get_frame(repository), budgets, *months)
+        _add_names(result["series"], repository)
+
+        log_message(
+            f"Fetched budget variance for {month_label(months[0])} to {month_label(months[1])}",
+            "INFO", "Backend", "Analytics Route",
+        )
+        return jsonify(result), 200
+
+    except Exception as e:
+        log_message(f"Error computing budget variance: {str(e)}", "ERROR", "Backend", "Analytics Route")
+        return jsonify({"error": str(e)}), 500
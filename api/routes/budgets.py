@@ -1,116 +1,35 @@
 from flask import Blueprint, jsonify, request
-from supabase_client import supabase
+from storage.backends import get_repository
 from utils.logger import log_message
+from utils.cache import rpc_cache
+from utils import read_routes  # ✅ Read route bodies shared with the ASGI app
+from utils.read_routes import respond
 
 budgets_blueprint = Blueprint("budgets", __name__)
 
-# ✅ Fetch Regular Budgets 
+# ✅ Fetch Regular Budgets
 @budgets_blueprint.route("/budgets/regular", methods=["GET"])
 def get_regular_budgets():
-    """Fetch regular budgets using the /categories/regular endpoint dynamically."""
-    try:
-        month = request.args.get("month", type=int)
-        year = request.args.get("year", type=int)
-
-        # Fetch regular category IDs dynamically
-        category_response = supabase.table("categories").select("id").neq("id", 9).execute()
-        regular_category_ids = [cat["id"] for cat in category_response.data]
-
-        response = (
-            supabase.table("budgets")
-            .select("*")
-            .eq("month", month)
-            .eq("year", year)
-            .in_("category_id", regular_category_ids)  # Fetch budgets for regular categories
-            .execute()
-        )
-
-        log_message(f"Fetched {len(response.data)} regular budgets", "INFO", "/budgets/regular")
-        return jsonify(response.data), 200
-
-    except Exception as e:
-        log_message(f"Error fetching regular budgets: {str(e)}", "ERROR", "/budgets/regular")
-        return jsonify({"error": str(e)}), 500
+    """Fetch budgets outside the reserve (id 9) hierarchy, with category and parent names, in one query."""
+    return respond(read_routes.regular_budgets)
 
 # ✅ Fetch Reserve Budgets
 
 @budgets_blueprint.route("/budgets/reserve", methods=["GET"])
 def get_reserve_budgets():
-    """Fetch reserve budgets by joining with categories on parent_id = 9."""
-    try:
-        month = request.args.get("month", type=int)
-        year = request.args.get("year", type=int)
-
-        if not month or not year:
-            return jsonify({"error": "Missing month or year parameters"}), 400
-
-        response = supabase.rpc("fetch_reserve_budgets", {"p_month": month, "p_year": year}).execute()
-
-        # Check if response contains an error key before accessing it
-        if hasattr(response, "error") and response.error:
-            log_message(f"Error fetching reserve budgets: {response.error}", "ERROR", "/budgets/reserve")
-            return jsonify({"error": response.error}), 500
-
-        # Debug log to inspect response format
-        log_message(f"Reserve Budgets Response: {response}", "DEBUG", "/budgets/reserve")
-
-        # Extract the actual data
-        reserve_budgets = response.data if hasattr(response, "data") else []
-
-        log_message(f"Fetched {len(reserve_budgets)} reserve budgets", "INFO", "/budgets/reserve")
-        return jsonify(reserve_budgets), 200
-
-    except Exception as e:
-        log_message(f"Unexpected error fetching reserve budgets: {str(e)}", "ERROR", "/budgets/reserve")
-        return jsonify({"error": str(e)}), 500
+    """Fetch budgets on the reserve category (id 9) and its children."""
+    return respond(read_routes.reserve_budgets)
 
 @budgets_blueprint.route("/budgets/all", methods=["GET"])
 def get_all_budgets():
     """Fetch all budgets (regular and reserve) using unified SQL function."""
-    try:
-        month = request.args.get("month", type=int)
-        year = request.args.get("year", type=int)
-
-        if not month or not year:
-            return jsonify({"error": "Missing month or year parameters"}), 400
-
-        response = supabase.rpc("fetch_all_budgets", {"p_month": month, "p_year": year}).execute()
-
-        if hasattr(response, "error") and response.error:
-            log_message(f"Error fetching all budgets: {response.error}", "ERROR", "/budgets/all")
-            return jsonify({"error": str(response.error)}), 500
-
-        return jsonify(response.data), 200
-
-    except Exception as e:
-        log_message(f"Unexpected error fetching all budgets: {str(e)}", "ERROR", "/budgets/all")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.all_budgets)
 
 # ✅ Get budgets for a given month & year
 @budgets_blueprint.route("/budgets", methods=["GET"])
 def get_budgets():
     """Fetch budgets for a given month and year."""
-    try:
-        month = request.args.get("month", type=int)
-        year = request.args.get("year", type=int)
-
-        if not month or not year:
-            return jsonify({"error": "Missing month or year parameters"}), 400
-
-        response = (
-            supabase.table("budgets")
-            .select("*")
-            .eq("month", month)
-            .eq("year", year)
-            .execute()
-        )
-
-        log_message("Fetched budgets successfully", "INFO", "/budgets")
-        return jsonify(response.data), 200
-
-    except Exception as e:
-        log_message(f"Error fetching budgets: {str(e)}", "ERROR", "/budgets")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.budgets)
 
 
 # ✅ Set or Update a budget item
@@ -125,49 +44,62 @@ def set_budget():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        # Check if a budget entry exists for the given month, year, and category
-        existing_budget = (
-            supabase.table("budgets")
-            .select("id")
-            .eq("month", data["month"])
-            .eq("year", data["year"])
-            .eq("category_id", data["category_id"])
-            .execute()
-        )
+        # One upsert on (month, year, category_id): updates the existing entry or inserts a new one
+        budgets = get_repository().set_budget(data)
+        log_message(f"Saved budget for category {data['category_id']}", "INFO", "/budgets")
 
-        if existing_budget.data:
-            # Update existing budget entry
-            budget_id = existing_budget.data[0]["id"]
-            response = (
-                supabase.table("budgets")
-                .update({"budgeted_amount": data["budgeted_amount"]})
-                .eq("id", budget_id)
-                .execute()
-            )
-            log_message(f"Updated budget ID {budget_id}", "INFO", "/budgets")
-        else:
-            # Insert new budget entry
-            response = supabase.table("budgets").insert(data).execute()
-            log_message(f"Inserted new budget for category {data['category_id']}", "INFO", "/budgets")
-
-        return jsonify(response.data), 200
+        rpc_cache.invalidate_month(int(data["month"]), int(data["year"]))
+        return jsonify(budgets), 200
 
     except Exception as e:
         log_message(f"Error setting budget: {str(e)}", "ERROR", "/budgets")
         return jsonify({"error": str(e)}), 500
 
 
+# ✅ Copy (or scale) one month's budgets into another month
+@budgets_blueprint.route("/budgets/copy", methods=["POST"])
+def copy_budgets():
+    """Copy every budget of from_month/from_year into to_month/to_year in one database call.
+
+    Optional: scale (multiplies each amount, default 1) and overwrite (replace
+    budgets already set in the target month, default false).
+    """
+    try:
+        data = request.json or {}
+        required_fields = ["from_month", "from_year", "to_month", "to_year"]
+
+        if not all(isinstance(data.get(field), int) for field in required_fields):
+            return jsonify({"error": "from_month, from_year, to_month and to_year must be integers"}), 400
+        if (data["from_month"], data["from_year"]) == (data["to_month"], data["to_year"]):
+            return jsonify({"error": "Source and target month are the same"}), 400
+        scale = data.get("scale", 1)
+        if isinstance(scale, bool) or not isinstance(scale, (int, float)) or scale < 0:
+            return jsonify({"error": "scale must be a non-negative number"}), 400
+
+        budgets = get_repository().copy_budgets(
+            data["from_month"], data["from_year"], data["to_month"], data["to_year"],
+            scale=scale, overwrite=bool(data.get("overwrite", False)),
+        )
+        log_message(f"Copied {len(budgets)} budgets from {data['from_month']}/{data['from_year']} "
+                    f"to {data['to_month']}/{data['to_year']}", "INFO", "/budgets/copy")
+
+        rpc_cache.invalidate_month(data["to_month"], data["to_year"])
+        return jsonify({"copied": len(budgets), "budgets": budgets}), 200
+
+    except Exception as e:
+        log_message(f"Error copying budgets: {str(e)}", "ERROR", "/budgets/copy")
+        return jsonify({"error": str(e)}), 500
+
+
 # ✅ Delete a budget item
 @budgets_blueprint.route("/budgets/<int:budget_id>", methods=["DELETE"])
 def delete_budget(budget_id):
     """Delete a budget entry by ID."""
     try:
-        response = (
-            supabase.table("budgets")
-            .delete()
-            .eq("id", budget_id)
-            .execute()
-        )
+        deleted = get_repository().delete_budget(budget_id)
+
+        for budget in deleted or []:
+            rpc_cache.invalidate_month(budget["month"], budget["year"])
 
         log_message(f"Deleted budget ID {budget_id}", "INFO", "/budgets")
         return jsonify({"message": "Budget deleted successfully"}), 200
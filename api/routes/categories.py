@@ -1,28 +1,26 @@
 from flask import Blueprint, jsonify, request
-from supabase_client import supabase
+from storage.backends import get_repository
 from utils.logger import log_message  # ✅ Import the logger utility
+from utils.cache import rpc_cache
+from utils import read_routes  # ✅ Read route bodies shared with the ASGI app
+from utils.read_routes import respond
 
 categories_blueprint = Blueprint("categories", __name__)
 
 @categories_blueprint.route("/categories", methods=["GET"])
 def get_categories():
     """Fetch all categories."""
-    try:
-        response = supabase.table("categories").select("*").execute()
-        log_message("Fetched all categories successfully", "INFO", "Backend", "Categories Route")
-        return jsonify(response.data), 200
-    except Exception as e:
-        log_message(f"Error fetching categories: {str(e)}", "ERROR", "Backend", "Categories Route")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.categories)
 
 @categories_blueprint.route("/categories", methods=["POST"])
 def add_category():
     """Add a new category."""
     try:
         data = request.json
-        response = supabase.table("categories").insert(data).execute()
+        categories = get_repository().add_category(data)
+        rpc_cache.clear()  # category names/parents appear in every summary
         log_message(f"Added new category: {data}", "INFO", "Backend", "Categories Route")
-        return jsonify(response.data), 201
+        return jsonify(categories), 201
     except Exception as e:
         log_message(f"Error adding category: {str(e)}", "ERROR", "Backend", "Categories Route")
         return jsonify({"error": str(e)}), 500
@@ -32,9 +30,10 @@ def update_category(id):
     """Update a category."""
     try:
         data = request.json
-        response = supabase.table("categories").update(data).eq("id", id).execute()
+        categories = get_repository().update_category(id, data)
+        rpc_cache.clear()
         log_message(f"Updated category {id}: {data}", "INFO", "Backend", "Categories Route")
-        return jsonify(response.data), 200
+        return jsonify(categories), 200
     except Exception as e:
         log_message(f"Error updating category {id}: {str(e)}", "ERROR", "Backend", "Categories Route")
         return jsonify({"error": str(e)}), 500
@@ -43,7 +42,8 @@ def update_category(id):
 def delete_category(id):
     """Delete a category."""
     try:
-        response = supabase.table("categories").delete().eq("id", id).execute()
+        get_repository().delete_category(id)
+        rpc_cache.clear()
         log_message(f"Deleted category {id}", "INFO", "Backend", "Categories Route")
         return jsonify({"message": "Category deleted successfully"}), 200
     except Exception as e:
@@ -53,21 +53,9 @@ def delete_category(id):
 @categories_blueprint.route("/categories/main", methods=["GET"])
 def get_main_categories():
     """Fetch only main categories (categories without a parent_id)."""
-    try:
-        response = supabase.table("categories").select("*").is_("parent_id", None).execute()
-        log_message("Fetched main categories successfully", "INFO", "Backend", "Categories Route")
-        return jsonify(response.data), 200
-    except Exception as e:
-        log_message(f"Error fetching main categories: {str(e)}", "ERROR", "Backend", "Categories Route")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.main_categories)
 
 @categories_blueprint.route("/categories/sub/<int:main_category_id>", methods=["GET"])
 def get_subcategories(main_category_id):
     """Fetch subcategories for a given main category."""
-    try:
-        response = supabase.table("categories").select("*").eq("parent_id", main_category_id).execute()
-        log_message(f"Fetched subcategories for main category {main_category_id}", "INFO", "Backend", "Categories Route")
-        return jsonify(response.data), 200
-    except Exception as e:
-        log_message(f"Error fetching subcategories for main category {main_category_id}: {str(e)}", "ERROR", "Backend", "Categories Route")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+    return respond(read_routes.subcategories, main_category_id=main_category_id)
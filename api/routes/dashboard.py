@@ -0,0 +1,12 @@
+from flask import Blueprint
+from utils import read_routes  # ✅ Route body shared with the ASGI app
+from utils.read_routes import respond
+
+dashboard_blueprint = Blueprint("dashboard", __name__)
+
+
+# ✅ Fetch everything the budget dashboard needs in one round trip
+@dashboard_blueprint.route("/dashboard", methods=["GET"])
+def get_dashboard():
+    """Fetch budgets, summaries, categories and accounts concurrently."""
+    return respond(read_routes.dashboard)
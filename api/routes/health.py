@@ -0,0 +1,20 @@
+import time
+
+from flask import Blueprint, current_app, jsonify
+
+from utils.health import STARTED_AT
+
+health_blueprint = Blueprint("health", __name__)
+
+
+# ✅ Liveness: the process is up and serving; never touches the database
+@health_blueprint.route("/healthz", methods=["GET"])
+def liveness():
+    return jsonify({"status": "ok", "uptime_s": round(time.monotonic() - STARTED_AT, 1)}), 200
+
+
+# ✅ Readiness: the storage backend answers (cached for READINESS_CACHE_SECONDS)
+@health_blueprint.route("/readyz", methods=["GET"])
+def readiness():
+    result, cached = current_app.extensions["readiness"].result()
+    return jsonify({**result, "cached": cached}), 200 if result["status"] == "ready" else 503
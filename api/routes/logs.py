@@ -1,16 +1,67 @@
 from flask import Blueprint, jsonify, request
-from supabase_client import supabase
+from storage.backends import get_repository
+from utils.jobs import job_runner
+from utils.helpers import parse_log_cursor
+from utils.log_retention import LOG_RETENTION_JOB, run_log_retention
 import uuid
 from datetime import datetime
 
+LOGS_MAX_LIMIT = 500
+
 logs_blueprint = Blueprint("logs", __name__)
 
+
+def _log_filters():
+    """severity (comma-separated), service, route, start (inclusive) and end (exclusive) query params."""
+    return {
+        "severities": [s for s in request.args.get("severity", "").split(",") if s] or None,
+        "service": request.args.get("service"),
+        "route": request.args.get("route"),
+        "start": request.args.get("start"),
+        "end": request.args.get("end"),
+    }
+
+
+def _limit(default):
+    return max(1, min(request.args.get("limit", default, type=int), LOGS_MAX_LIMIT))
+
+
 @logs_blueprint.route("/logs", methods=["GET"])
 def get_logs():
-    """Fetch logs."""
+    """Fetch logs, newest first: filters plus ?cursor= from the previous page's next_cursor."""
+    try:
+        cursor = request.args.get("cursor")
+        try:
+            after = parse_log_cursor(cursor) if cursor else None
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        limit = _limit(50)
+
+        items = get_repository().list_logs(**_log_filters(), after=after, limit=limit)
+        next_cursor = f"{items[-1]['created_at']}|{items[-1]['id']}" if len(items) == limit else None
+        return jsonify({"items": items, "next_cursor": next_cursor}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@logs_blueprint.route("/logs/rollups", methods=["GET"])
+def get_log_rollups():
+    """Hourly counts of compacted logs, same filters as /logs (start/end apply to the hour)."""
+    try:
+        return jsonify(get_repository().list_log_rollups(**_log_filters(), limit=_limit(LOGS_MAX_LIMIT))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@logs_blueprint.route("/logs/compact", methods=["POST"])
+def compact_logs():
+    """Queues the retention job: old INFO/DEBUG logs become hourly rollups."""
     try:
-        response = supabase.table("logs").select("*").order("created_at", desc=True).limit(50).execute()
-        return jsonify(response.data), 200
+        job, created = job_runner.submit(LOG_RETENTION_JOB, run_log_retention, repository=get_repository())
+        return jsonify({
+            "job_id": job["id"],
+            "status": job["status"],
+            "deduplicated": not created,
+            "status_url": f"/jobs/{job['id']}",
+        }), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -23,9 +74,10 @@ def insert_log():
             "id": str(uuid.uuid4()),
             "message": data.get("message"),
             "severity": data.get("severity", "INFO"),
+            "service": data.get("service"),
+            "route": data.get("route"),
             "created_at": datetime.utcnow().isoformat()
         }
-        response = supabase.table("logs").insert(new_log).execute()
-        return jsonify(response.data), 201
+        return jsonify(get_repository().insert_logs([new_log])), 201
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
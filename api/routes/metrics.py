@@ -0,0 +1,9 @@
+from flask import Blueprint, Response
+from utils.metrics import request_metrics
+
+metrics_blueprint = Blueprint("metrics", __name__)
+
+@metrics_blueprint.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Per-route request metrics in the Prometheus text format."""
+    return Response(request_metrics.render(), mimetype="text/plain; version=0.0.4")
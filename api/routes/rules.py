@@ -0,0 +1,92 @@
+from flask import Blueprint, jsonify, request
+from storage.backends import get_repository
+from utils.jobs import job_runner
+from utils.logger import log_message
+from utils.rules import RULES_APPLY_JOB, run_rules_apply, validate_rule
+
+rules_blueprint = Blueprint("rules", __name__)
+
+RULE_FIELDS = (
+    "name", "priority", "merchant_contains", "plaid_category_id", "min_amount", "max_amount",
+    "account_id", "user_category_id", "user_subcategory_id", "is_enabled",
+)
+
+
+@rules_blueprint.route("/rules", methods=["GET"])
+def get_rules():
+    """Fetch all auto-categorization rules, best match first."""
+    try:
+        rules = get_repository().list_category_rules()
+        log_message(f"Fetched {len(rules)} rules", "INFO", "Backend", "Rules Route")
+        return jsonify(rules), 200
+    except Exception as e:
+        log_message(f"Error fetching rules: {str(e)}", "ERROR", "Backend", "Rules Route")
+        return jsonify({"error": str(e)}), 500
+
+
+@rules_blueprint.route("/rules", methods=["POST"])
+def add_rule():
+    """Add a rule. It applies to transactions synced from now on; POST /rules/apply for history."""
+    try:
+        data = {field: value for field, value in (request.json or {}).items() if field in RULE_FIELDS}
+        error = validate_rule(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        rules = get_repository().add_category_rule(data)
+        log_message(f"Added rule: {data}", "INFO", "Backend", "Rules Route")
+        return jsonify(rules), 201
+    except Exception as e:
+        log_message(f"Error adding rule: {str(e)}", "ERROR", "Backend", "Rules Route")
+        return jsonify({"error": str(e)}), 500
+
+
+@rules_blueprint.route("/rules/<int:id>", methods=["PUT"])
+def update_rule(id):
+    """Update a rule."""
+    try:
+        repository = get_repository()
+        data = {field: value for field, value in (request.json or {}).items() if field in RULE_FIELDS}
+        current = next((rule for rule in repository.list_category_rules() if rule["id"] == id), None)
+        if current is None:
+            return jsonify({"error": f"Rule {id} not found"}), 404
+        error = validate_rule({**current, **data})
+        if error:
+            return jsonify({"error": error}), 400
+
+        rules = repository.update_category_rule(id, data)
+        log_message(f"Updated rule {id}: {data}", "INFO", "Backend", "Rules Route")
+        return jsonify(rules), 200
+    except Exception as e:
+        log_message(f"Error updating rule {id}: {str(e)}", "ERROR", "Backend", "Rules Route")
+        return jsonify({"error": str(e)}), 500
+
+
+@rules_blueprint.route("/rules/<int:id>", methods=["DELETE"])
+def delete_rule(id):
+    """Delete a rule. Transactions it already categorized keep their category."""
+    try:
+        get_repository().delete_category_rule(id)
+        log_message(f"Deleted rule {id}", "INFO", "Backend", "Rules Route")
+        return jsonify({"message": "Rule deleted successfully"}), 200
+    except Exception as e:
+        log_message(f"Error deleting rule {id}: {str(e)}", "ERROR", "Backend", "Rules Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Re-apply every enabled rule to uncategorized history
+@rules_blueprint.route("/rules/apply", methods=["POST"])
+def apply_rules():
+    """Queues a job that categorizes past transactions matching a rule and having no category yet."""
+    try:
+        job, created = job_runner.submit(RULES_APPLY_JOB, run_rules_apply, repository=get_repository())
+        log_message(f"Queued rules job {job['id']}", "INFO", "Backend", "Rules Route")
+        return jsonify({
+            "job_id": job["id"],
+            "status": job["status"],
+            "deduplicated": not created,
+            "status_url": f"/jobs/{job['id']}",
+        }), 202
+    except Exception as e:
+        log_message(f"Error applying rules: {str(e)}", "ERROR", "Backend", "Rules Route")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,59 @@
+from flask import Blueprint, jsonify, request
+from storage.backends import get_repository
+from utils.helpers import normalize_merchant
+from utils.logger import log_message
+
+suggestions_blueprint = Blueprint("suggestions", __name__)
+
+MAX_SUGGESTION_BATCH = 1000
+
+
+def _suggest(repository, transactions, k):
+    """Top-k categories for each transaction, from how its merchant was categorized before."""
+    keys = {txn["transaction_id"]: normalize_merchant(txn.get("merchant_name"), txn.get("name"))
+            for txn in transactions}
+    rows = repository.suggest_categories({key for key in keys.values() if key}, k) if any(keys.values()) else []
+
+    names = {category["id"]: category["name"] for category in repository.list_categories()} if rows else {}
+    by_merchant = {}
+    for row in rows:
+        by_merchant.setdefault(row["merchant_key"], []).append({
+            "category_id": row["category_id"],
+            "category_name": names.get(row["category_id"]),
+            "subcategory_id": row["subcategory_id"],
+            "subcategory_name": names.get(row["subcategory_id"]),
+            "count": row["transaction_count"],
+            "confidence": round(row["transaction_count"] / row["merchant_total"], 3),
+        })
+    return {transaction_id: by_merchant.get(key, []) for transaction_id, key in keys.items()}
+
+
+# ✅ Category suggestions for a batch of transactions in one call
+@suggestions_blueprint.route("/suggestions", methods=["POST"])
+def get_suggestions():
+    """Suggest categories for up to MAX_SUGGESTION_BATCH transactions.
+
+    Body: {"transactions": [{transaction_id, name, merchant_name}], "k": 3}
+    """
+    try:
+        data = request.json or {}
+        transactions = data.get("transactions")
+        k = data.get("k", 3)
+
+        if not isinstance(transactions, list) or not transactions:
+            return jsonify({"error": "transactions must be a non-empty list"}), 400
+        if len(transactions) > MAX_SUGGESTION_BATCH:
+            return jsonify({"error": f"At most {MAX_SUGGESTION_BATCH} transactions per request"}), 400
+        if any(not isinstance(txn, dict) or not txn.get("transaction_id") for txn in transactions):
+            return jsonify({"error": "Every transaction needs a transaction_id"}), 400
+        if not isinstance(k, int) or not 1 <= k <= 10:
+            return jsonify({"error": "k must be between 1 and 10"}), 400
+
+        suggestions = _suggest(get_repository(), transactions, k)
+
+        log_message(f"Suggested categories for {len(transactions)} transactions", "INFO", "Backend", "Suggestions Route")
+        return jsonify({"suggestions": suggestions}), 200
+
+    except Exception as e:
+        log_message(f"Error suggesting categories: {str(e)}", "ERROR", "Backend", "Suggestions Route")
+        return jsonify({"error": str(e)}), 500
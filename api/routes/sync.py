@@ -0,0 +1,81 @@
+from flask import Blueprint, jsonify, request
+from storage.backends import get_repository
+from utils.cache import rpc_cache
+from utils.helpers import use_repo_root
+from utils.jobs import job_runner
+from utils.logger import log_message
+
+sync_blueprint = Blueprint("sync", __name__)
+
+SYNC_JOB = "plaid_sync"
+# Full and per-item syncs read then write the same rows, so they never overlap
+SYNC_LANE = "plaid"
+
+
+def run_plaid_sync(progress, repository=None):
+    """Job body: runs plaid_sync.sync() and refreshes what the API caches."""
+    # plaid_sync connects to Plaid and Supabase at import, so load it on first use
+    use_repo_root()
+    import plaid_sync
+
+    summary = plaid_sync.sync(progress=progress)
+    _refresh_after_sync(repository, progress)
+    return summary
+
+
+def run_item_sync(progress, item_id, repository=None):
+    """Job body: incremental sync of one Plaid item (queued by the webhook receiver)."""
+    use_repo_root()
+    import plaid_sync
+
+    summary = plaid_sync.sync_item(item_id, progress=progress)
+    _refresh_after_sync(repository, progress)
+    return summary
+
+
+def _refresh_after_sync(repository, progress):
+    # The sync wrote behind the API's back: drop cached summaries and re-copy the replica
+    rpc_cache.clear()
+    replica = getattr(repository, "replica", None)
+    if replica is not None:
+        progress("refreshing_replica")
+        replica.refresh()
+
+
+# ✅ Start a Plaid sync in the background
+@sync_blueprint.route("/sync-plaid", methods=["POST"])
+def start_plaid_sync():
+    """Queues a Plaid sync and returns its job id; joins the sync already running if any."""
+    try:
+        job, created = job_runner.submit(SYNC_JOB, run_plaid_sync, lane=SYNC_LANE, repository=get_repository())
+        if created:
+            log_message(f"Started Plaid sync job {job['id']}", "INFO", "Backend", "Sync Route")
+        return jsonify({
+            "job_id": job["id"],
+            "status": job["status"],
+            "deduplicated": not created,
+            "status_url": f"/jobs/{job['id']}",
+        }), 202
+
+    except Exception as e:
+        log_message(f"Error starting Plaid sync: {str(e)}", "ERROR", "Backend", "Sync Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Status, progress and timings of one job
+@sync_blueprint.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = job_runner.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+
+# ✅ Recent jobs plus runner counters
+@sync_blueprint.route("/jobs", methods=["GET"])
+def list_jobs():
+    """Recent jobs, newest first: ?kind=plaid_sync to filter."""
+    return jsonify({
+        "jobs": job_runner.list(request.args.get("kind")),
+        "stats": job_runner.stats(),
+    }), 200
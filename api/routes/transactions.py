@@ -1,65 +1,54 @@
 from flask import Blueprint, jsonify, request
-from supabase_client import supabase
+from storage.backends import get_repository
+from storage.errors import StorageError
 from utils.logger import log_message  # ✅ Import the logger utility
+from utils.cache import invalidate_transaction_months, rpc_cache
+from utils.helpers import search_terms
+from utils import read_routes  # ✅ Read route bodies shared with the ASGI app
+from utils.read_routes import respond
 
 transactions_blueprint = Blueprint("transactions", __name__)
 
+MAX_SEARCH_RESULTS = 200
+
 # ✅ Fetch ALL transactions
 @transactions_blueprint.route("/transactions", methods=["GET"])
 def get_transactions():
     """Fetch all transactions."""
+    return respond(read_routes.transactions)
+
+# ✅ Search transactions by name / merchant
+@transactions_blueprint.route("/transactions/search", methods=["GET"])
+def search_transactions():
+    """Full-text search with prefix matching: ?q=blue bot finds "Blue Bottle Coffee"."""
     try:
-        response = supabase.table("transactions").select("*").execute()
-        log_message("Fetched all transactions successfully", "INFO", "Backend", "Transactions Route")
-        return jsonify(response.data), 200
+        terms = search_terms(request.args.get("q"))
+        limit = request.args.get("limit", 50, type=int)
+
+        if not terms:
+            return jsonify({"error": "q must contain at least one word"}), 400
+        if not limit or not 1 <= limit <= MAX_SEARCH_RESULTS:
+            return jsonify({"error": f"limit must be between 1 and {MAX_SEARCH_RESULTS}"}), 400
+
+        transactions = get_repository().search_transactions(terms, limit)
+        log_message(f"Search for {terms} returned {len(transactions)} transactions", "INFO", "Backend", "Transactions Route")
+        return jsonify(transactions), 200
     except Exception as e:
-        log_message(f"Error fetching transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
+        log_message(f"Error searching transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Fetch UNPROCESSED Transactions
 @transactions_blueprint.route("/unprocessed-transactions", methods=["GET"])
 def get_unprocessed_transactions():
     """Fetch transactions that have NOT been categorized and are NOT ignored."""
-    try:
-        response = (
-            supabase.table("transactions")
-            .select("*")
-            .is_("user_category_id", None)  # No category assigned
-            .eq("is_ignored", False)  # Not ignored
-            .execute()
-        )
-        log_message("Fetched unprocessed transactions successfully", "INFO", "Backend", "Transactions Route")
-        return jsonify(response.data), 200
-    except Exception as e:
-        log_message(f"Error fetching unprocessed transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.unprocessed_transactions)
 
 # ✅ Fetch PROCESSED Transactions
 
 @transactions_blueprint.route("/processed-transactions", methods=["GET"])
 def get_processed_transactions():
     """Fetch transactions that have been categorized OR ignored."""
-    try:
-        # Query transactions that have either been categorized or ignored
-        response = (
-            supabase.table("transactions")
-            .select("*")
-            .or_("user_category_id.not.is.null,is_ignored.eq.true")
-            .execute()
-        )
-
-        # Check if the response contains data
-        if not response.data:
-            log_message("No processed transactions found.", "INFO", "Backend", "Transactions Route")
-            return jsonify({"message": "No processed transactions found"}), 200
-
-        # Log successful retrieval
-        log_message(f"Fetched {len(response.data)} processed transactions successfully", "INFO", "Backend", "Transactions Route")
-        return jsonify(response.data), 200
-
-    except Exception as e:
-        log_message(f"Exception occurred while fetching processed transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
-        return jsonify({"error": str(e)}), 500
+    return respond(read_routes.processed_transactions)
 
 # ✅ Add a NEW Transaction
 @transactions_blueprint.route("/transactions", methods=["POST"])
@@ -67,9 +56,10 @@ def add_transaction():
     """Add a new transaction."""
     try:
         data = request.json
-        response = supabase.table("transactions").insert(data).execute()
+        transactions = get_repository().add_transaction(data)
+        invalidate_transaction_months(transactions)
         log_message(f"Added new transaction: {data}", "INFO", "Backend", "Transactions Route")
-        return jsonify(response.data), 201
+        return jsonify(transactions), 201
     except Exception as e:
         log_message(f"Error adding transaction: {str(e)}", "ERROR", "Backend", "Transactions Route")
         return jsonify({"error": str(e)}), 500
@@ -80,14 +70,13 @@ def update_transaction(transaction_id):
     """Update an existing transaction."""
     try:
         data = request.json
-        response = (
-            supabase.table("transactions")
-            .update(data)
-            .eq("transaction_id", transaction_id)
-            .execute()
-        )
+        transactions = get_repository().update_transaction(transaction_id, data)
+        if "date" in data:
+            rpc_cache.clear()  # the row may have moved out of a month we can't see anymore
+        else:
+            invalidate_transaction_months(transactions)
         log_message(f"Updated transaction {transaction_id}: {data}", "INFO", "Backend", "Transactions Route")
-        return jsonify(response.data), 200
+        return jsonify(transactions), 200
     except Exception as e:
         log_message(f"Error updating transaction {transaction_id}: {str(e)}", "ERROR", "Backend", "Transactions Route")
         return jsonify({"error": str(e)}), 500
@@ -97,12 +86,8 @@ def update_transaction(transaction_id):
 def delete_transaction(transaction_id):
     """Delete a transaction."""
     try:
-        response = (
-            supabase.table("transactions")
-            .delete()
-            .eq("transaction_id", transaction_id)
-            .execute()
-        )
+        deleted = get_repository().delete_transaction(transaction_id)
+        invalidate_transaction_months(deleted)
         log_message(f"Deleted transaction {transaction_id}", "INFO", "Backend", "Transactions Route")
         return jsonify({"message": "Transaction deleted successfully"}), 200
     except Exception as e:
@@ -110,91 +95,121 @@ def delete_transaction(transaction_id):
         return jsonify({"error": str(e)}), 500
 
 # ✅ Update Multiple Transactions
+def _validate_bulk_update(txn, seen_ids):
+    """Builds the row sent to the bulk update for one transaction, or returns an error message."""
+    if not isinstance(txn, dict) or not txn.get("transaction_id"):
+        return None, "Missing transaction_id"
+
+    txn_id = str(txn["transaction_id"])
+    if txn_id in seen_ids:
+        return None, "Duplicate transaction_id in batch"
+
+    row = {"transaction_id": txn_id}
+    for field in ("user_category_id", "user_subcategory_id"):
+        value = txn.get(field)
+        try:
+            row[field] = int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None, f"{field} must be an integer"
+
+    if "is_ignored" in txn:
+        if not isinstance(txn["is_ignored"], bool):
+            return None, "is_ignored must be a boolean"
+        row["is_ignored"] = txn["is_ignored"]
+
+    seen_ids.add(txn_id)
+    return row, None
+
+
 @transactions_blueprint.route("/update-transactions", methods=["POST"])
 def update_transactions():
-    """Update multiple transactions at once."""
+    """Update multiple transactions in one round trip, reporting per-row results."""
     try:
-        data = request.json.get("transactions", [])
+        data = (request.json or {}).get("transactions", [])
 
         if not data:
             return jsonify({"error": "No transactions provided"}), 400
 
-        updates = []
+        # Validate the whole batch first so bad rows never reach the database
+        rows, results, seen_ids = [], [], set()
         for txn in data:
-            txn_id = txn["transaction_id"]
-            category_id = txn.get("user_category_id")
-            subcategory_id = txn.get("user_subcategory_id")
-
-            updates.append(
-                supabase.table("transactions")
-                .update({"user_category_id": category_id, "user_subcategory_id": subcategory_id})
-                .eq("transaction_id", txn_id)
-            )
-
-        # Execute all updates in bulk
-        for update in updates:
-            update.execute()
-
-        log_message(f"Updated {len(updates)} transactions", "INFO", "Backend", "Transactions Route")
-        return jsonify({"success": True, "updated": len(updates)}), 200
+            row, error = _validate_bulk_update(txn, seen_ids)
+            txn_id = txn.get("transaction_id") if isinstance(txn, dict) else None
+            results.append({"transaction_id": txn_id, "success": False, "error": error})
+            if row:
+                rows.append(row)
+
+        updated = {}
+        if rows:
+            updated = {row["transaction_id"]: row for row in get_repository().bulk_update_transactions(rows)}
+            invalidate_transaction_months(list(updated.values()))
+
+        for result in results:
+            if result["error"] is None:
+                if str(result["transaction_id"]) in updated:
+                    result["success"] = True
+                else:
+                    result["error"] = "Transaction not found"
+
+        failed = sum(1 for result in results if not result["success"])
+        log_message(f"Updated {len(updated)} transactions ({failed} failed)", "INFO" if not failed else "WARN", "Backend", "Transactions Route")
+        return jsonify({
+            "success": failed == 0,
+            "updated": len(updated),
+            "failed": failed,
+            "results": results
+        }), 200 if not failed else 207
     except Exception as e:
         log_message(f"Error updating transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Split Transaction
+def _validate_split_request(split_request):
+    """Checks one {transaction_id, splits} request before it is sent to the database."""
+    if not isinstance(split_request, dict) or not split_request.get("transaction_id"):
+        return "Missing transaction_id"
+
+    splits = split_request.get("splits")
+    if not splits or not isinstance(splits, list):
+        return f"No splits provided for transaction {split_request['transaction_id']}"
+
+    for split in splits:
+        amount = split.get("amount") if isinstance(split, dict) else None
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+            return f"Every split of transaction {split_request['transaction_id']} needs a numeric amount"
+    return None
+
+
 @transactions_blueprint.route("/split-transaction", methods=["POST"])
 def split_transaction():
-    """Splits a transaction into multiple sub-transactions, preserving account_id."""
+    """Splits one or many transactions atomically, preserving account_id.
+
+    Accepts either {"transaction_id": ..., "splits": [...]} or
+    {"transactions": [{"transaction_id": ..., "splits": [...]}, ...]}.
+    """
+    data = request.json or {}
+    split_requests = data.get("transactions") or [data]
+
     try:
-        data = request.json
-        original_transaction_id = data.get("transaction_id")
-        splits = data.get("splits", [])
-
-        # ✅ Step 1: Fetch the Original Transaction Data
-        original_transaction = (
-            supabase.table("transactions")
-            .select("amount, account_id")  # Fetch account_id
-            .eq("transaction_id", original_transaction_id)
-            .single()
-            .execute()
-        )
-
-        if not original_transaction.data:
-            return jsonify({"error": "Original transaction not found"}), 404
-
-        original_amount = original_transaction.data["amount"]
-        account_id = original_transaction.data["account_id"]
-
-        # ✅ Step 2: Validate Split Amounts
-        split_total = sum(s["amount"] for s in splits)
-        if round(split_total, 2) != round(original_amount, 2):
-            return jsonify({"error": "Split amounts must total the original amount"}), 400
-
-        # ✅ Step 3: Insert New Split Transactions
-        new_transactions = []
-        for i, split in enumerate(splits, start=1):
-            new_transactions.append({
-                "transaction_id": f"{original_transaction_id}-split-{i}",
-                "date": split.get("date"),
-                "name": split.get("name"),
-                "amount": split["amount"],
-                "account_id": account_id,  # ✅ Include account_id
-                "user_category_id": split.get("user_category_id"),
-                "user_subcategory_id": split.get("user_subcategory_id"),
-                "is_ignored": False,  # New splits are not ignored
-                "is_split": False  # These are not split transactions themselves
-            })
-
-        supabase.table("transactions").insert(new_transactions).execute()
-
-        # ✅ Step 4: Mark Original Transaction as BOTH `is_ignored = TRUE` and `is_split = TRUE`
-        supabase.table("transactions").update({
-            "is_ignored": True,
-            "is_split": True
-        }).eq("transaction_id", original_transaction_id).execute()
-
-        log_message(f"Split transaction {original_transaction_id} into {len(splits)} parts", "INFO", "Backend", "Transactions Route")
-        return jsonify({"message": "Transaction split successfully"}), 200
+        for split_request in split_requests:
+            error = _validate_split_request(split_request)
+            if error:
+                return jsonify({"error": error}), 400
+
+        # ✅ Validate totals, insert the splits and mark the parents in one database transaction
+        payload = [
+            {"transaction_id": str(r["transaction_id"]), "splits": r["splits"]} for r in split_requests
+        ]
+        results = get_repository().split_transactions(payload)
+
+        invalidate_transaction_months(results + [split for r in split_requests for split in r["splits"]])
+
+        log_message(f"Split {len(results)} transactions", "INFO", "Backend", "Transactions Route")
+        return jsonify({"message": "Transaction split successfully", "results": results}), 200
+    except StorageError as e:
+        # Missing parent (404) or splits that don't add up (400)
+        log_message(f"Error splitting transactions: {e.message}", "ERROR" if e.status == 500 else "WARN", "Backend", "Transactions Route")
+        return jsonify({"error": e.message}), e.status
     except Exception as e:
-        log_message(f"Error splitting transaction {original_transaction_id}: {str(e)}", "ERROR", "Backend", "Transactions Route")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        log_message(f"Error splitting transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,64 @@
+import os
+
+from flask import Blueprint, jsonify, request
+from routes import sync
+from storage.backends import get_repository
+from utils.jobs import Debouncer, job_runner
+from utils.logger import log_message
+from utils.webhooks import PlaidWebhookVerifier, VerificationKeyUnavailable, WebhookVerificationError
+
+webhooks_blueprint = Blueprint("webhooks", __name__)
+
+WEBHOOK_DEBOUNCE = float(os.getenv("PLAID_WEBHOOK_DEBOUNCE", 10))  # seconds of quiet before syncing
+WEBHOOK_MAX_WAIT = float(os.getenv("PLAID_WEBHOOK_MAX_WAIT", 60))  # longest a burst can hold a sync back
+
+# ✅ Transaction webhooks that mean Plaid has new or changed data for the item
+SYNC_WEBHOOK_CODES = {
+    "SYNC_UPDATES_AVAILABLE", "DEFAULT_UPDATE", "INITIAL_UPDATE", "HISTORICAL_UPDATE", "TRANSACTIONS_REMOVED",
+}
+
+webhook_verifier = PlaidWebhookVerifier()
+webhook_debouncer = Debouncer(job_runner, WEBHOOK_DEBOUNCE, WEBHOOK_MAX_WAIT)
+
+
+def item_job_kind(item_id):
+    return f"plaid_item:{item_id}"
+
+
+# ✅ Receive Plaid webhooks and queue an incremental sync of the affected item
+@webhooks_blueprint.route("/webhooks/plaid", methods=["POST"])
+def receive_plaid_webhook():
+    """Verifies a Plaid webhook and debounces a sync of its item; other webhooks are acknowledged."""
+    body = request.get_data()
+    try:
+        webhook_verifier.verify(body, request.headers.get("Plaid-Verification"))
+    except VerificationKeyUnavailable as e:
+        # Not the sender's fault: Plaid retries webhooks that don't get a 2xx
+        log_message(f"Could not verify Plaid webhook: {str(e)}", "WARN", "Backend", "Webhooks Route")
+        return jsonify({"error": str(e)}), 503
+    except WebhookVerificationError as e:
+        log_message(f"Rejected Plaid webhook: {str(e)}", "WARN", "Backend", "Webhooks Route")
+        return jsonify({"error": str(e)}), 401
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        webhook_type, webhook_code = payload.get("webhook_type"), payload.get("webhook_code")
+        item_id = payload.get("item_id")
+
+        if webhook_type != "TRANSACTIONS" or webhook_code not in SYNC_WEBHOOK_CODES or not item_id:
+            log_message(f"Ignored Plaid webhook {webhook_type}/{webhook_code}", "INFO", "Backend", "Webhooks Route")
+            return jsonify({"received": True, "queued": False}), 200
+
+        triggers = webhook_debouncer.trigger(
+            item_job_kind(item_id), sync.run_item_sync, lane=sync.SYNC_LANE, item_id=item_id,
+            repository=get_repository(),
+        )
+        log_message(
+            f"Queued sync for item {item_id} after {webhook_code} ({triggers} pending)",
+            "INFO", "Backend", "Webhooks Route",
+        )
+        return jsonify({"received": True, "queued": True, "item_id": item_id, "coalesced": triggers}), 200
+
+    except Exception as e:
+        log_message(f"Error handling Plaid webhook: {str(e)}", "ERROR", "Backend", "Webhooks Route")
+        return jsonify({"error": str(e)}), 500
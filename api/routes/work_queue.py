@@ -0,0 +1,132 @@
+import os
+import uuid
+
+from flask import Blueprint, jsonify, request
+from routes.transactions import _validate_bulk_update
+from storage.backends import get_repository
+from utils.cache import invalidate_transaction_months
+from utils.logger import log_message
+
+work_queue_blueprint = Blueprint("work_queue", __name__)
+
+WORK_QUEUE_LEASE = int(os.getenv("WORK_QUEUE_LEASE", 300))  # seconds a claim is held
+MAX_PAGE_SIZE = 200
+
+
+def _order():
+    """Reads ?order= / {"order": ...}: "oldest" (default) or "newest"; None if invalid."""
+    order = request.args.get("order") or (request.get_json(silent=True) or {}).get("order") or "oldest"
+    return {"oldest": False, "newest": True}.get(order)
+
+
+# ✅ How many transactions still need a category
+@work_queue_blueprint.route("/work-queue/count", methods=["GET"])
+def get_work_queue_count():
+    """Count unprocessed transactions (and how many are currently claimed)."""
+    try:
+        counts = get_repository().count_work_queue()
+        return jsonify(counts), 200
+    except Exception as e:
+        log_message(f"Error counting work queue: {str(e)}", "ERROR", "Backend", "Work Queue Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Page through the queue by cursor
+@work_queue_blueprint.route("/work-queue", methods=["GET"])
+def get_work_queue():
+    """Fetch a page of unprocessed transactions: ?order=oldest|newest&limit=50&cursor=<next_cursor>."""
+    try:
+        newest = _order()
+        limit = request.args.get("limit", 50, type=int)
+        if newest is None:
+            return jsonify({"error": "order must be oldest or newest"}), 400
+        if not limit or not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+        items = get_repository().list_work_queue(newest=newest, after=request.args.get("cursor"), limit=limit)
+        next_cursor = items[-1]["transaction_id"] if len(items) == limit else None
+        return jsonify({"items": items, "next_cursor": next_cursor}), 200
+    except Exception as e:
+        log_message(f"Error fetching work queue: {str(e)}", "ERROR", "Backend", "Work Queue Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Claim a batch so two reviewers never work on the same items
+@work_queue_blueprint.route("/work-queue/claim", methods=["POST"])
+def claim_work_queue():
+    """Claim up to `limit` items for WORK_QUEUE_LEASE seconds. Body: {"worker", "limit", "order"}."""
+    try:
+        data = request.get_json(silent=True) or {}
+        newest = _order()
+        limit = data.get("limit", 20)
+        if newest is None:
+            return jsonify({"error": "order must be oldest or newest"}), 400
+        if not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+        claim_id = str(uuid.uuid4())
+        items = get_repository().claim_work_queue(
+            claim_id, data.get("worker"), limit=limit, newest=newest, lease_seconds=WORK_QUEUE_LEASE
+        )
+        log_message(f"Claimed {len(items)} work queue items for {data.get('worker')}", "INFO", "Backend", "Work Queue Route")
+        return jsonify({"claim_id": claim_id, "lease_seconds": WORK_QUEUE_LEASE, "items": items}), 200
+    except Exception as e:
+        log_message(f"Error claiming work queue items: {str(e)}", "ERROR", "Backend", "Work Queue Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Save the categorizations for claimed items and release them
+@work_queue_blueprint.route("/work-queue/complete", methods=["POST"])
+def complete_work_queue():
+    """Body: {"claim_id", "transactions": [{transaction_id, user_category_id, user_subcategory_id, is_ignored}]}."""
+    try:
+        data = request.get_json(silent=True) or {}
+        claim_id = data.get("claim_id")
+        transactions = data.get("transactions") or []
+        if not claim_id:
+            return jsonify({"error": "claim_id is required"}), 400
+        if not transactions:
+            return jsonify({"error": "No transactions provided"}), 400
+
+        rows, results, seen_ids = [], [], set()
+        for txn in transactions:
+            row, error = _validate_bulk_update(txn, seen_ids)
+            txn_id = txn.get("transaction_id") if isinstance(txn, dict) else None
+            results.append({"transaction_id": txn_id, "success": False, "error": error})
+            if row:
+                rows.append(row)
+
+        updated = {}
+        if rows:
+            updated = {row["transaction_id"]: row for row in get_repository().complete_work_queue(claim_id, rows)}
+            invalidate_transaction_months(list(updated.values()))
+
+        for result in results:
+            if result["error"] is None:
+                if str(result["transaction_id"]) in updated:
+                    result["success"] = True
+                else:
+                    result["error"] = "Not held by this claim (expired, released or claimed elsewhere)"
+
+        failed = sum(1 for result in results if not result["success"])
+        log_message(f"Completed {len(updated)} work queue items ({failed} failed)", "INFO" if not failed else "WARN", "Backend", "Work Queue Route")
+        return jsonify({"success": failed == 0, "updated": len(updated), "failed": failed, "results": results}), \
+            200 if not failed else 207
+    except Exception as e:
+        log_message(f"Error completing work queue items: {str(e)}", "ERROR", "Backend", "Work Queue Route")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Give claimed items back without changing them
+@work_queue_blueprint.route("/work-queue/release", methods=["POST"])
+def release_work_queue():
+    """Body: {"claim_id"}."""
+    try:
+        claim_id = (request.get_json(silent=True) or {}).get("claim_id")
+        if not claim_id:
+            return jsonify({"error": "claim_id is required"}), 400
+        released = get_repository().release_work_queue(claim_id)
+        return jsonify({"released": released}), 200
+    except Exception as e:
+        log_message(f"Error releasing work queue claim: {str(e)}", "ERROR", "Backend", "Work Queue Route")
+        return jsonify({"error": str(e)}), 500
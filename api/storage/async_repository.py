@@ -0,0 +1,145 @@
+import asyncio
+import os
+
+from postgrest.exceptions import APIError
+
+from storage.errors import StorageError
+from storage.supabase_repository import _RPC_ERROR_STATUS
+from utils.helpers import use_repo_root
+
+# query_tracer.py lives at the repo root so plaid_sync.py can share it
+use_repo_root()
+
+from query_tracer import traced_client  # noqa: E402
+
+# Requests allowed in flight at once. httpx's pool (100 connections) rescans
+# every waiting request whenever a connection frees up, which gets quadratic
+# with hundreds queued; waiting on a semaphore instead stays cheap.
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", 100))
+
+
+class AsyncSupabaseRepository:
+    """Read operations of SupabaseRepository on the async PostgREST client.
+
+    Used by the ASGI app (asgi.py) so a request waiting on Supabase yields the
+    event loop instead of holding a thread. Writes still go through the Flask
+    routes and SupabaseRepository.
+    """
+
+    name = "supabase"
+
+    def __init__(self, client, max_concurrency=SUPABASE_MAX_CONCURRENCY):
+        self.client = client  # supabase.AsyncClient
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    async def connect(cls):
+        """Creates the async client from the same credentials as supabase_client.py."""
+        from supabase import acreate_client
+
+        url, key = os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE")
+        if not url or not key:
+            raise ValueError("Supabase credentials not found. Set in environment variables.")
+        return cls(traced_client(await acreate_client(url, key)))
+
+    async def _execute(self, query):
+        async with self._slots:
+            return (await query.execute()).data
+
+    async def _rpc(self, name, params):
+        try:
+            return await self._execute(self.client.rpc(name, params))
+        except APIError as e:
+            raise StorageError(e.message, _RPC_ERROR_STATUS.get(e.code, 500)) from e
+
+    # -------------------------------------------
+    # ✅ Accounts & categories
+    # -------------------------------------------
+    async def list_accounts(self):
+        return await self._execute(self.client.table("accounts").select("*"))
+
+    async def list_categories(self):
+        return await self._execute(self.client.table("categories").select("*"))
+
+    async def list_main_categories(self):
+        return await self._execute(self.client.table("categories").select("*").is_("parent_id", None))
+
+    async def list_subcategories(self, parent_id):
+        return await self._execute(self.client.table("categories").select("*").eq("parent_id", parent_id))
+
+    # -------------------------------------------
+    # ✅ Transactions
+    # -------------------------------------------
+    async def list_transactions(self):
+        return await self._execute(self.client.table("transactions").select("*"))
+
+    async def list_unprocessed_transactions(self):
+        return await self._execute(
+            self.client.table("transactions")
+            .select("*")
+            .is_("user_category_id", None)
+            .or_("is_ignored.is.null,is_ignored.eq.false")
+            .order("date")
+            .order("transaction_id")
+        )
+
+    async def list_processed_transactions(self):
+        return await self._execute(
+            self.client.table("transactions")
+            .select("*")
+            .or_("user_category_id.not.is.null,is_ignored.eq.true")
+        )
+
+    # -------------------------------------------
+    # ✅ Budgets & summaries
+    # -------------------------------------------
+    async def list_budgets(self, month, year):
+        return await self._execute(self.client.table("budgets").select("*").eq("month", month).eq("year", year))
+
+    async def fetch_all_budgets(self, month, year):
+        return await self._rpc("fetch_all_budgets", {"p_month": month, "p_year": year})
+
+    async def fetch_regular_budgets(self, month, year):
+        return await self._rpc("fetch_regular_budgets", {"p_month": month, "p_year": year})
+
+    async def fetch_reserve_budgets(self, month, year):
+        return await self._rpc("fetch_reserve_budgets", {"p_month": month, "p_year": year})
+
+    async def fetch_summary(self, month, year):
+        return await self._rpc("fetch_summary", {"month": month, "year": year})
+
+    async def fetch_regular_summary(self, month, year):
+        return await self._rpc("fetch_regular_summary", {"month": month, "year": year})
+
+    async def fetch_reserve_summary(self, month, year):
+        return await self._rpc("fetch_reserve_summary", {"month": month, "year": year})
+
+    async def fetch_summary_rollup(self, month, year, reserve=None):
+        return await self._rpc("fetch_summary_rollup", {"month": month, "year": year, "reserve": reserve})
+
+
+class ThreadedAsyncRepository:
+    """Async view of a blocking repository, running each call in a worker thread.
+
+    Used for the SQLite backend and the local replica, whose reads are local
+    disk I/O with no async driver.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.name = repository.name
+
+    def __getattr__(self, name):
+        method = getattr(self.repository, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+
+async def create_async_repository(repository):
+    """Async counterpart of the repository the Flask app uses."""
+    if repository.name == "supabase":  # "supabase+replica" reads the local replica instead
+        return await AsyncSupabaseRepository.connect()
+    return ThreadedAsyncRepository(repository)
@@ -0,0 +1,36 @@
+import os
+
+from flask import current_app
+
+# STORAGE_BACKEND picks where the API keeps its data:
+#   supabase (default) - the hosted database, optionally with a REPLICA_DB read copy
+#   sqlite             - a local file at SQLITE_DB, no network access needed
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+SQLITE_DB = os.getenv("SQLITE_DB", "plaidsync.db")
+
+
+def create_repository(backend=None):
+    """Builds the repository for a backend name ("supabase" or "sqlite")."""
+    backend = (backend or STORAGE_BACKEND).lower()
+
+    if backend == "sqlite":
+        from storage.sqlite_repository import SQLiteRepository
+        return SQLiteRepository(SQLITE_DB)
+
+    if backend == "supabase":
+        from supabase_client import supabase  # only needs credentials for this backend
+        from storage.supabase_repository import SupabaseRepository
+        repository = SupabaseRepository(supabase)
+
+        replica_db = os.getenv("REPLICA_DB")
+        if replica_db:
+            from storage.replica import LocalReplica, ReplicatedRepository
+            repository = ReplicatedRepository(repository, LocalReplica(replica_db, repository))
+        return repository
+
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_repository():
+    """Returns the repository of the app handling the current request."""
+    return current_app.extensions["repository"]
@@ -0,0 +1,7 @@
+class StorageError(Exception):
+    """A storage operation was rejected; `status` is the HTTP status to report."""
+
+    def __init__(self, message, status=500):
+        super().__init__(message)
+        self.message = message
+        self.status = status
@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from storage.sqlite_repository import SQLiteRepository, TABLE_KEYS
+
+# Set REPLICA_DB to a file path to serve API reads from a local SQLite copy.
+REPLICA_DB = os.getenv("REPLICA_DB")
+REPLICA_REFRESH_INTERVAL = float(os.getenv("REPLICA_REFRESH_INTERVAL", 300))  # seconds
+REPLICA_PAGE_SIZE = 1000  # PostgREST's default max rows per request
+
+REPLICATED_TABLES = ("accounts", "categories", "budgets", "transactions")
+
+
+class LocalReplica:
+    """Read replica of the Supabase tables, kept in a local SQLite file.
+
+    Writes still go to Supabase; the API applies the rows it writes to the
+    replica straight away (write-through), and a full refresh pulls anything
+    written elsewhere, such as by plaid_sync.py.
+    """
+
+    def __init__(self, path, primary, refresh_interval=REPLICA_REFRESH_INTERVAL):
+        self.path = path
+        self.primary = primary
+        self.refresh_interval = refresh_interval
+        self.store = SQLiteRepository(path)
+        self._ready = False
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._pending = []  # write-throughs that land while a refresh is copying
+        self._thread = None
+
+    def is_ready(self):
+        """True once every table has been copied at least once."""
+        if not self._ready:
+            self._ready = set(REPLICATED_TABLES) <= set(self.store.refreshed_tables())
+        return self._ready
+
+    # -------------------------------------------
+    # ✅ Full refresh from Supabase
+    # -------------------------------------------
+    def refresh(self):
+        """Copies every replicated table from Supabase and swaps it in atomically."""
+        with self._lock:
+            self._refreshing = True
+            self._pending = []
+        try:
+            started = time.perf_counter()
+            tables = {table: self._fetch_all(table) for table in REPLICATED_TABLES}
+            with self._lock:
+                self.store.replace_tables(tables, datetime.utcnow().isoformat())
+                # Re-apply writes that happened after the copy started
+                for apply, args in self._pending:
+                    apply(*args)
+                self._pending = []
+                self._refreshing = False
+            self._ready = True
+            counts = {table: len(rows) for table, rows in tables.items()}
+            print(f"✅ Replica refreshed in {time.perf_counter() - started:.2f}s: {counts}")
+            return counts
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _fetch_all(self, table):
+        rows, start = [], 0
+        while True:
+            page = (
+                self.primary.client.table(table)
+                .select("*")
+                .order(TABLE_KEYS[table])
+                .range(start, start + REPLICA_PAGE_SIZE - 1)
+                .execute()
+                .data
+            )
+            rows.extend(page)
+            if len(page) < REPLICA_PAGE_SIZE:
+                return rows
+            start += REPLICA_PAGE_SIZE
+
+    def start(self):
+        """Starts the background thread that refreshes the replica periodically."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="replica-refresh", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Replica refresh failed: {e}")
+            time.sleep(self.refresh_interval)
+
+    # -------------------------------------------
+    # ✅ Write-through of rows the API wrote to Supabase
+    # -------------------------------------------
+    def _write(self, apply, *args):
+        try:
+            with self._lock:
+                if self._refreshing:
+                    self._pending.append((apply, args))
+                apply(*args)
+        except Exception as e:
+            print(f"⚠️ Replica write-through failed, next refresh will catch up: {e}")
+
+    def apply_rows(self, table, rows):
+        """Stores complete rows returned by a Supabase insert/update."""
+        self._write(self.store.upsert_rows, table, rows)
+
+    def remove_rows(self, table, rows):
+        """Deletes rows returned by a Supabase delete."""
+        key = TABLE_KEYS[table]
+        self._write(self.store.delete_rows, table, [row[key] for row in rows or [] if key in row])
+
+    def patch_rows(self, table, rows):
+        """Applies partial updates whose full rows Supabase didn't return."""
+        self._write(self.store.patch_rows, table, rows)
+
+    def reload_transactions(self, transaction_ids):
+        """Re-reads transactions (and their split children) changed by an RPC."""
+        if not transaction_ids:
+            return
+        try:
+            rows = self.primary.list_transactions_with_splits(transaction_ids)
+            kept = {row["transaction_id"] for row in rows}
+            stale = [row for row in self.store.list_transactions_with_splits(transaction_ids)
+                     if row["transaction_id"] not in kept]  # e.g. children a split retry deleted
+            self.apply_rows("transactions", rows)
+            self.remove_rows("transactions", stale)
+        except Exception as e:
+            print(f"⚠️ Replica reload failed, next refresh will catch up: {e}")
+
+
+class ReplicatedRepository:
+    """Reads from the local replica once it is ready, writes to Supabase.
+
+    Operations not overridden here (RPCs, logs) go straight to Supabase.
+    """
+
+    def __init__(self, primary, replica):
+        self.primary = primary
+        self.replica = replica
+        self.name = f"{primary.name}+replica"
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+    def _reader(self):
+        return self.replica.store if self.replica.is_ready() else self.primary
+
+    # ✅ Reads
+    def list_accounts(self):
+        return self._reader().list_accounts()
+
+    def list_categories(self):
+        return self._reader().list_categories()
+
+    def list_main_categories(self):
+        return self._reader().list_main_categories()
+
+    def list_subcategories(self, parent_id):
+        return self._reader().list_subcategories(parent_id)
+
+    def list_transactions(self):
+        return self._reader().list_transactions()
+
+    def list_unprocessed_transactions(self):
+        return self._reader().list_unprocessed_transactions()
+
+    def list_processed_transactions(self):
+        return self._reader().list_processed_transactions()
+
+    def list_budgets(self, month, year):
+        return self._reader().list_budgets(month, year)
+
+    def fetch_regular_budgets(self, month, year):
+        return self._reader().fetch_regular_budgets(month, year)
+
+    def list_budgets_for_years(self, first_year, last_year):
+        return self._reader().list_budgets_for_years(first_year, last_year)
+
+    def load_transaction_columns(self):
+        return self._reader().load_transaction_columns()
+
+    def suggest_categories(self, merchant_keys, k=3):
+        return self._reader().suggest_categories(merchant_keys, k)
+
+    def search_transactions(self, terms, limit=50):
+        return self._reader().search_transactions(terms, limit)
+
+    # ✅ Writes, applied to the replica after Supabase accepts them
+    def _write_through(self, table, rows):
+        self.replica.apply_rows(table, rows)
+        return rows
+
+    def _delete_through(self, table, rows):
+        self.replica.remove_rows(table, rows)
+        return rows
+
+    def add_account(self, data):
+        return self._write_through("accounts", self.primary.add_account(data))
+
+    def update_account(self, account_id, data):
+        return self._write_through("accounts", self.primary.update_account(account_id, data))
+
+    def delete_account(self, account_id):
+        return self._delete_through("accounts", self.primary.delete_account(account_id))
+
+    def add_category(self, data):
+        return self._write_through("categories", self.primary.add_category(data))
+
+    def update_category(self, category_id, data):
+        return self._write_through("categories", self.primary.update_category(category_id, data))
+
+    def delete_category(self, category_id):
+        return self._delete_through("categories", self.primary.delete_category(category_id))
+
+    def add_transaction(self, data):
+        return self._write_through("transactions", self.primary.add_transaction(data))
+
+    def update_transaction(self, transaction_id, data):
+        return self._write_through("transactions", self.primary.update_transaction(transaction_id, data))
+
+    def delete_transaction(self, transaction_id):
+        return self._delete_through("transactions", self.primary.delete_transaction(transaction_id))
+
+    def bulk_update_transactions(self, rows):
+        updated = self.primary.bulk_update_transactions(rows)
+        updated_ids = {row["transaction_id"] for row in updated}
+        self.replica.patch_rows("transactions", [row for row in rows if row["transaction_id"] in updated_ids])
+        return updated
+
+    def complete_work_queue(self, claim_id, rows):
+        updated = self.primary.complete_work_queue(claim_id, rows)
+        updated_ids = {row["transaction_id"] for row in updated}
+        self.replica.patch_rows("transactions", [row for row in rows if row["transaction_id"] in updated_ids])
+        return updated
+
+    def split_transactions(self, requests):
+        results = self.primary.split_transactions(requests)
+        self.replica.reload_transactions([result["transaction_id"] for result in results])
+        return results
+
+    def set_budget(self, data):
+        return self._write_through("budgets", self.primary.set_budget(data))
+
+    def copy_budgets(self, from_month, from_year, to_month, to_year, scale=1, overwrite=False):
+        return self._write_through(
+            "budgets", self.primary.copy_budgets(from_month, from_year, to_month, to_year, scale, overwrite)
+        )
+
+    def delete_budget(self, budget_id):
+        return self._delete_through("budgets", self.primary.delete_budget(budget_id))
+
+
+# Run after plaid_sync.py (cd api && python -m storage.replica) to refresh the copy
+if __name__ == "__main__":
+    if not REPLICA_DB:
+        print("⚠️ REPLICA_DB is not set, nothing to refresh.")
+    else:
+        from supabase_client import supabase
+        from storage.supabase_repository import SupabaseRepository
+
+        LocalReplica(REPLICA_DB, SupabaseRepository(supabase)).refresh()
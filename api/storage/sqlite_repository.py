@@ -0,0 +1,771 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from storage.errors import StorageError
+from utils.helpers import normalize_merchant, use_repo_root
+
+use_repo_root()
+
+from query_tracer import SQLITE_CONNECTION_FACTORY  # noqa: E402
+
+_KEY_CHUNK = 500  # keys per IN (...) list, well under SQLite's bound-parameter limit
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql")
+
+# Primary key of each table, used for upserts and deletes
+TABLE_KEYS = {
+    "accounts": "account_id",
+    "categories": "id",
+    "budgets": "id",
+    "transactions": "transaction_id",
+    "logs": "id",
+    "category_rules": "id",
+}
+
+# A transaction still needs a category. This must match the WHERE clause of the
+# idx_transactions_work_queue partial index; INDEXED BY makes SQLite use it (and
+# fail loudly if the two drift apart) rather than the user_category_id index.
+_UNPROCESSED = "user_category_id IS NULL AND is_ignored IS NOT 1"
+_WORK_QUEUE = "transactions INDEXED BY idx_transactions_work_queue"
+
+BOOLEAN_COLUMNS = {
+    "pending", "is_ignored", "is_split", "potential_duplicate", "confirmed_duplicate", "is_reserve", "is_enabled",
+}
+
+# Transaction columns the category rules match on
+RULE_MATCH_COLUMNS = ("transaction_id", "date", "name", "merchant_name", "plaid_category_id", "amount", "account_id")
+
+RESERVE_CATEGORY_ID = 9
+
+_SUMMARY_SQL = """
+    SELECT r.category_id,
+           c.name AS category_name,
+           NULLIF(r.subcategory_id, 0) AS subcategory_id,
+           s.name AS subcategory_name,
+           ROUND(r.total_amount, 2) AS total_amount,
+           r.transaction_count
+    FROM category_rollups r
+    LEFT JOIN categories c ON c.id = r.category_id
+    LEFT JOIN categories s ON s.id = r.subcategory_id
+    WHERE r.year = ? AND r.month = ?
+      {extra}
+    ORDER BY category_name, subcategory_name
+"""
+
+# Tables maintained by triggers in sqlite_schema.sql, and how to recompute each from scratch
+_REBUILD_SQL = {
+    "category_rollups": """
+        INSERT INTO category_rollups (year, month, category_id, subcategory_id, total_amount, transaction_count)
+        SELECT CAST(substr(date, 1, 4) AS INTEGER), CAST(substr(date, 6, 2) AS INTEGER),
+               user_category_id, COALESCE(user_subcategory_id, 0), SUM(COALESCE(amount, 0)), COUNT(*)
+        FROM transactions
+        WHERE user_category_id IS NOT NULL AND COALESCE(is_ignored, 0) = 0 AND date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """,
+    "merchant_category_counts": """
+        INSERT INTO merchant_category_counts (merchant_key, category_id, subcategory_id, transaction_count)
+        SELECT normalize_merchant(merchant_name, name), user_category_id, COALESCE(user_subcategory_id, 0), COUNT(*)
+        FROM transactions
+        WHERE user_category_id IS NOT NULL AND COALESCE(is_ignored, 0) = 0
+          AND normalize_merchant(merchant_name, name) IS NOT NULL
+        GROUP BY 1, 2, 3
+    """,
+}
+
+_SUGGESTIONS_SQL = """
+    SELECT merchant_key, category_id, NULLIF(subcategory_id, 0) AS subcategory_id,
+           transaction_count, merchant_total
+    FROM (
+        SELECT m.*,
+               SUM(transaction_count) OVER (PARTITION BY merchant_key) AS merchant_total,
+               ROW_NUMBER() OVER (
+                   PARTITION BY merchant_key ORDER BY transaction_count DESC, category_id
+               ) AS rank
+        FROM merchant_category_counts m
+        WHERE merchant_key IN ({placeholders})
+    )
+    WHERE rank <= ?
+    ORDER BY merchant_key, rank
+"""
+
+_BUDGETS_SQL = """
+    SELECT b.*,
+           c.name AS category_name,
+           c.parent_id AS parent_id,
+           p.name AS parent_name,
+           (b.category_id = 9 OR c.parent_id = 9) AS is_reserve
+    FROM budgets b
+    LEFT JOIN categories c ON c.id = b.category_id
+    LEFT JOIN categories p ON p.id = c.parent_id
+    WHERE b.month = ? AND b.year = ?
+      {extra}
+    ORDER BY is_reserve, parent_name, category_name
+"""
+
+
+class SQLiteRepository:
+    """Storage operations used by the API routes, backed by a local SQLite file.
+
+    Mirrors SupabaseRepository so the API can run without network access. The
+    summary and budget RPCs are reimplemented here in SQL; their rows use the
+    column names in _SUMMARY_SQL and _BUDGETS_SQL.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.columns = {}
+
+        with self._write_lock:
+            conn = self.connection()
+            had_search_index = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts')"
+            ).fetchone()[0]
+            # Budgets became unique per (year, month, category_id); keep the row set_budget used to update
+            if conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'budgets')"
+                " AND NOT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'idx_budgets_month_category')"
+            ).fetchone()[0]:
+                conn.execute("DELETE FROM budgets WHERE id NOT IN "
+                             "(SELECT MIN(id) FROM budgets GROUP BY year, month, category_id)")
+            with open(SCHEMA_FILE) as f:
+                conn.executescript(f.read())
+            conn.commit()
+            # Files created before a derived table existed need a one-off backfill
+            if conn.execute("SELECT EXISTS (SELECT 1 FROM transactions)").fetchone()[0]:
+                for table in _REBUILD_SQL:
+                    if not conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]:
+                        self.rebuild_table(table, conn)
+                if not had_search_index:
+                    self.rebuild_search_index(conn)
+        for table in TABLE_KEYS:
+            self.columns[table] = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def connection(self):
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, factory=SQLITE_CONNECTION_FACTORY)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")  # readers never block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # INSERT OR REPLACE only fires DELETE triggers with this on; the
+            # rollup, merchant count and search triggers rely on it
+            conn.execute("PRAGMA recursive_triggers=ON")
+            # Used by the merchant_category_counts triggers
+            conn.create_function("normalize_merchant", 2, normalize_merchant, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=()):
+        """Runs a SELECT and returns rows as dicts shaped like Supabase responses."""
+        cursor = self.connection().execute(sql, params)
+        return [_to_dict(row) for row in cursor.fetchall()]
+
+    def ping(self):
+        """Cheapest round trip to the database, for the readiness check."""
+        self.connection().execute("SELECT 1").fetchone()
+
+    def _select_by_key(self, table, keys, conn=None):
+        key = TABLE_KEYS[table]
+        keys = list(keys)
+        if not keys:
+            return []
+        placeholders = ", ".join("?" for _ in keys)
+        cursor = (conn or self.connection()).execute(
+            f"SELECT * FROM {table} WHERE {key} IN ({placeholders})", keys
+        )
+        return [_to_dict(row) for row in cursor.fetchall()]
+
+    # -------------------------------------------
+    # ✅ Generic row helpers (also used by the replica)
+    # -------------------------------------------
+    def upsert_rows(self, table, rows, conn=None):
+        """Inserts or replaces complete rows, keeping only the columns the local table has."""
+        rows = [rows] if isinstance(rows, dict) else list(rows or [])
+        if not rows:
+            return 0
+        columns = [c for c in self.columns[table] if any(c in row for row in rows)]
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        values = [tuple(_to_sqlite(row.get(c)) for c in columns) for row in rows]
+
+        if conn is not None:
+            conn.executemany(sql, values)
+            return len(values)
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                conn.executemany(sql, values)
+        return len(values)
+
+    def delete_rows(self, table, keys):
+        keys = list(keys)
+        if not keys:
+            return 0
+        key = TABLE_KEYS[table]
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                conn.executemany(f"DELETE FROM {table} WHERE {key} = ?", [(k,) for k in keys])
+        return len(keys)
+
+    def patch_rows(self, table, rows, conn=None):
+        """Applies partial updates; each row has the key column plus the fields to change.
+
+        Returns the keys of the rows that existed.
+        """
+        if conn is None:
+            with self._write_lock:
+                conn = self.connection()
+                with conn:
+                    return self.patch_rows(table, rows, conn=conn)
+
+        key = TABLE_KEYS[table]
+        rows = list(rows)
+        existing = set()
+        keys = list({row[key] for row in rows})
+        for start in range(0, len(keys), _KEY_CHUNK):
+            chunk = keys[start:start + _KEY_CHUNK]
+            existing.update(str(found[0]) for found in conn.execute(
+                f"SELECT {key} FROM {table} WHERE {key} IN ({', '.join('?' for _ in chunk)})", chunk
+            ))
+
+        # One executemany per run of rows that change the same columns, in order
+        run_fields, run_values = None, []
+        for row in rows + [None]:
+            fields = None if row is None else tuple(c for c in row if c != key and c in self.columns[table])
+            if run_values and fields != run_fields:
+                assignments = ", ".join(f"{c} = ?" for c in run_fields)
+                conn.executemany(f"UPDATE {table} SET {assignments} WHERE {key} = ?", run_values)
+                run_values = []
+            if row is not None and fields:
+                run_fields = fields
+                run_values.append([_to_sqlite(row[c]) for c in fields] + [row[key]])
+        return [row[key] for row in rows if str(row[key]) in existing]
+
+    def replace_tables(self, tables, refreshed_at):
+        """Swaps in complete copies of tables in a single transaction."""
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                for table, rows in tables.items():
+                    conn.execute(f"DELETE FROM {table}")
+                    self.upsert_rows(table, rows, conn=conn)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO replica_meta (table_name, refreshed_at, row_count) VALUES (?, ?, ?)",
+                        (table, refreshed_at, len(rows)),
+                    )
+
+    def rebuild_table(self, table, conn=None):
+        """Recomputes a trigger-maintained table (see _REBUILD_SQL) from the transactions."""
+        conn = conn or self.connection()
+        with conn:
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(_REBUILD_SQL[table])
+
+    def rebuild_search_index(self, conn=None):
+        """Re-indexes every transaction for full-text search."""
+        conn = conn or self.connection()
+        with conn:
+            conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+
+    def vacuum(self):
+        """VACUUMs the file, then re-indexes search.
+
+        transactions has a TEXT primary key, so VACUUM may renumber the rowids
+        transactions_fts is keyed by; use this instead of a bare VACUUM.
+        """
+        with self._write_lock:
+            conn = self.connection()
+            conn.execute("VACUUM")
+            self.rebuild_search_index(conn)
+
+    def refreshed_tables(self):
+        return {row["table_name"]: row for row in self.query("SELECT * FROM replica_meta")}
+
+    def _insert(self, table, data):
+        """Inserts one or many rows and returns them as stored (like a Supabase insert)."""
+        rows = [data] if isinstance(data, dict) else list(data)
+        key = TABLE_KEYS[table]
+        keys = []
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                for row in rows:
+                    row = {c: row[c] for c in row if c in self.columns[table]}
+                    if table == "accounts" and row.get("id") is None:
+                        row["id"] = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM accounts").fetchone()[0]
+                    columns = list(row)
+                    try:
+                        cursor = conn.execute(
+                            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                            [_to_sqlite(row[c]) for c in columns],
+                        )
+                    except sqlite3.IntegrityError as e:
+                        raise StorageError(str(e), 409) from e
+                    keys.append(row[key] if row.get(key) is not None else cursor.lastrowid)
+                return self._select_by_key(table, keys, conn)
+
+    def _update(self, table, column, value, data):
+        data = {c: data[c] for c in data if c in self.columns[table]}
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                matched = conn.execute(f"SELECT {TABLE_KEYS[table]} FROM {table} WHERE {column} = ?", (value,))
+                keys = [row[0] for row in matched.fetchall()]
+                if data and keys:
+                    assignments = ", ".join(f"{c} = ?" for c in data)
+                    conn.execute(
+                        f"UPDATE {table} SET {assignments} WHERE {column} = ?",
+                        [_to_sqlite(v) for v in data.values()] + [value],
+                    )
+                # The key itself may have been updated
+                new_keys = [data.get(TABLE_KEYS[table], k) for k in keys]
+                return self._select_by_key(table, new_keys, conn)
+
+    def _delete(self, table, column, value):
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                rows = [_to_dict(r) for r in conn.execute(f"SELECT * FROM {table} WHERE {column} = ?", (value,))]
+                conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (value,))
+                return rows
+
+    # -------------------------------------------
+    # ✅ Accounts
+    # -------------------------------------------
+    def list_accounts(self):
+        return self.query("SELECT * FROM accounts")
+
+    def add_account(self, data):
+        return self._insert("accounts", data)
+
+    def update_account(self, account_id, data):
+        return self._update("accounts", "id", account_id, data)
+
+    def delete_account(self, account_id):
+        return self._delete("accounts", "id", account_id)
+
+    # -------------------------------------------
+    # ✅ Categories
+    # -------------------------------------------
+    def list_categories(self):
+        return self.query("SELECT * FROM categories")
+
+    def list_main_categories(self):
+        return self.query("SELECT * FROM categories WHERE parent_id IS NULL")
+
+    def list_subcategories(self, parent_id):
+        return self.query("SELECT * FROM categories WHERE parent_id = ?", (parent_id,))
+
+    def add_category(self, data):
+        return self._insert("categories", data)
+
+    def update_category(self, category_id, data):
+        return self._update("categories", "id", category_id, data)
+
+    def delete_category(self, category_id):
+        return self._delete("categories", "id", category_id)
+
+    # -------------------------------------------
+    # ✅ Transactions
+    # -------------------------------------------
+    def list_transactions(self, order_by_date=False):
+        order = " ORDER BY date DESC" if order_by_date else ""
+        return self.query(f"SELECT * FROM transactions{order}")
+
+    def list_unprocessed_transactions(self):
+        return self.query(f"SELECT * FROM {_WORK_QUEUE} WHERE {_UNPROCESSED} ORDER BY date, transaction_id")
+
+    def list_processed_transactions(self):
+        return self.query("SELECT * FROM transactions WHERE user_category_id IS NOT NULL OR is_ignored = 1")
+
+    def load_transaction_columns(self):
+        """Columns of categorized, non-ignored transactions, as lists keyed by column name."""
+        names = ("date", "amount", "user_category_id", "user_subcategory_id")
+        cursor = self.connection().execute(
+            f"SELECT {', '.join(names)} FROM transactions"
+            " WHERE user_category_id IS NOT NULL AND COALESCE(is_ignored, 0) = 0 AND date IS NOT NULL"
+        )
+        cursor.row_factory = None  # plain tuples, much cheaper than Row at millions of rows
+        columns = list(zip(*cursor.fetchall())) or [() for _ in names]
+        return {name: list(values) for name, values in zip(names, columns)}
+
+    def list_transactions_with_splits(self, transaction_ids):
+        ids = list(transaction_ids)
+        placeholders = ", ".join("?" for _ in ids)
+        return self.query(
+            f"SELECT * FROM transactions WHERE transaction_id IN ({placeholders})"
+            f" OR parent_transaction_id IN ({placeholders})",
+            ids + ids,
+        )
+
+    def add_transaction(self, data):
+        return self._insert("transactions", data)
+
+    def update_transaction(self, transaction_id, data):
+        return self._update("transactions", "transaction_id", transaction_id, data)
+
+    def delete_transaction(self, transaction_id):
+        return self._delete("transactions", "transaction_id", transaction_id)
+
+    def bulk_update_transactions(self, rows):
+        """Applies per-row updates in one transaction; returns [{transaction_id, date}] for rows found."""
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                found = self.patch_rows("transactions", rows, conn=conn)
+                return [
+                    {"transaction_id": row["transaction_id"], "date": row["date"]}
+                    for row in self._select_by_key("transactions", found, conn)
+                ]
+
+    def split_transactions(self, requests):
+        """Splits transactions atomically, with the same rules as the split_transactions RPC."""
+        results = []
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                for request in requests:
+                    parent_id = str(request["transaction_id"])
+                    parents = self._select_by_key("transactions", [parent_id], conn)
+                    if not parents:
+                        raise StorageError(f"Transaction {parent_id} not found", 404)
+                    parent = parents[0]
+
+                    if parent.get("is_split"):
+                        results.append({"transaction_id": parent_id, "date": parent["date"], "status": "already_split"})
+                        continue
+
+                    splits = request.get("splits") or []
+                    if not splits or any(split.get("amount") is None for split in splits):
+                        raise StorageError(f"Every split of transaction {parent_id} needs an amount", 400)
+                    if round(sum(split["amount"] for split in splits), 2) != round(parent["amount"], 2):
+                        raise StorageError(
+                            f"Split amounts for transaction {parent_id} must total {parent['amount']}", 400
+                        )
+
+                    children = [{
+                        "transaction_id": f"{parent_id}-split-{i}",
+                        "parent_transaction_id": parent_id,
+                        "date": split.get("date") or parent["date"],
+                        "name": split.get("name") or parent["name"],
+                        "amount": split["amount"],
+                        "account_id": parent["account_id"],
+                        "user_category_id": split.get("user_category_id"),
+                        "user_subcategory_id": split.get("user_subcategory_id"),
+                        "is_ignored": False,
+                        "is_split": False,
+                    } for i, split in enumerate(splits, start=1)]
+                    self.upsert_rows("transactions", children, conn=conn)
+                    # Children left by an earlier attempt with more splits would break the total
+                    prefix = f"{parent_id}-split-"
+                    conn.execute(
+                        "DELETE FROM transactions WHERE parent_transaction_id = ? AND substr(transaction_id, 1, ?) = ?"
+                        " AND substr(transaction_id, ?) NOT GLOB '*[^0-9]*'"
+                        " AND CAST(substr(transaction_id, ?) AS INTEGER) > ?",
+                        (parent_id, len(prefix), prefix, len(prefix) + 1, len(prefix) + 1, len(children)),
+                    )
+                    conn.execute(
+                        "UPDATE transactions SET is_ignored = 1, is_split = 1 WHERE transaction_id = ?", (parent_id,)
+                    )
+                    results.append({
+                        "transaction_id": parent_id, "date": parent["date"], "status": "split", "splits": len(children)
+                    })
+        return results
+
+    def search_transactions(self, terms, limit=50):
+        """Transactions whose name or merchant has words starting with every term, best match first."""
+        match = " ".join(f'"{term}"*' for term in terms)
+        return self.query(
+            "SELECT t.*, -bm25(transactions_fts) AS rank FROM transactions_fts"
+            " JOIN transactions t ON t.rowid = transactions_fts.rowid"
+            " WHERE transactions_fts MATCH ? ORDER BY bm25(transactions_fts), t.date DESC LIMIT ?",
+            (match, limit),
+        )
+
+    def list_uncategorized_transactions(self, after=None, limit=1000):
+        """One keyset page of uncategorized, non-ignored transactions, ordered by transaction_id."""
+        return self.query(
+            f"SELECT {', '.join(RULE_MATCH_COLUMNS)} FROM transactions"
+            " WHERE user_category_id IS NULL AND transaction_id > ? AND COALESCE(is_ignored, 0) = 0"
+            " ORDER BY transaction_id LIMIT ?",
+            (after or "", limit),
+        )
+
+    def suggest_categories(self, merchant_keys, k=3):
+        """Top-k categories per merchant key from merchant_category_counts."""
+        rows = []
+        keys = list(merchant_keys)
+        for start in range(0, len(keys), 500):  # stay under SQLite's bound-variable limit
+            chunk = keys[start:start + 500]
+            rows.extend(self.query(
+                _SUGGESTIONS_SQL.format(placeholders=", ".join("?" for _ in chunk)), chunk + [k]
+            ))
+        return rows
+
+    # -------------------------------------------
+    # ✅ Work queue of unprocessed transactions
+    # -------------------------------------------
+    def count_work_queue(self):
+        now = datetime.utcnow().isoformat()
+        return self.query(
+            f"SELECT (SELECT COUNT(*) FROM {_WORK_QUEUE} WHERE {_UNPROCESSED}) AS unprocessed,"
+            " (SELECT COUNT(*) FROM work_queue_claims c JOIN transactions t USING (transaction_id)"
+            "  WHERE c.expires_at > ? AND t.user_category_id IS NULL AND t.is_ignored IS NOT 1) AS claimed",
+            (now,),
+        )[0]
+
+    def list_work_queue(self, newest=False, after=None, limit=50):
+        """One page of unprocessed transactions by (date, transaction_id), after the item `after`."""
+        direction, compare = ("DESC", "<") if newest else ("ASC", ">")
+        cursor = ""
+        params = []
+        if after is not None:
+            cursor = (f" AND (date, transaction_id) {compare}"
+                      " (SELECT date, transaction_id FROM transactions WHERE transaction_id = ?)")
+            params.append(after)
+        return self.query(
+            f"SELECT * FROM {_WORK_QUEUE} WHERE {_UNPROCESSED}{cursor}"
+            f" ORDER BY date {direction}, transaction_id {direction} LIMIT ?",
+            params + [limit],
+        )
+
+    def claim_work_queue(self, claim_id, worker, limit=20, newest=False, lease_seconds=300):
+        """Claims up to `limit` unclaimed items; other claims skip them until the lease ends."""
+        now = datetime.utcnow()
+        direction = "DESC" if newest else "ASC"
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                conn.execute("DELETE FROM work_queue_claims WHERE expires_at <= ?", (now.isoformat(),))
+                conn.execute(
+                    "INSERT INTO work_queue_claims (transaction_id, claim_id, claimed_by, expires_at)"
+                    f" SELECT transaction_id, ?, ?, ? FROM {_WORK_QUEUE} WHERE {_UNPROCESSED}"
+                    " AND transaction_id NOT IN (SELECT transaction_id FROM work_queue_claims)"
+                    f" ORDER BY date {direction}, transaction_id {direction} LIMIT ?",
+                    (claim_id, worker, (now + timedelta(seconds=lease_seconds)).isoformat(), limit),
+                )
+        return self.query(
+            "SELECT t.* FROM transactions t JOIN work_queue_claims c USING (transaction_id)"
+            " WHERE c.claim_id = ? ORDER BY t.date, t.transaction_id",
+            (claim_id,),
+        )
+
+    def complete_work_queue(self, claim_id, rows):
+        """Applies updates to items the claim still holds and releases them; returns the rows updated."""
+        ids = [row["transaction_id"] for row in rows]
+        placeholders = ", ".join("?" for _ in ids)
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                held = {
+                    row[0] for row in conn.execute(
+                        f"SELECT transaction_id FROM work_queue_claims WHERE claim_id = ? AND expires_at > ?"
+                        f" AND transaction_id IN ({placeholders})",
+                        [claim_id, datetime.utcnow().isoformat()] + ids,
+                    )
+                }
+                conn.execute(
+                    f"DELETE FROM work_queue_claims WHERE claim_id = ? AND transaction_id IN ({placeholders})",
+                    [claim_id] + ids,
+                )
+                held_rows = [row for row in rows if row["transaction_id"] in held]
+                found = self.patch_rows("transactions", held_rows, conn=conn)
+                return [
+                    {"transaction_id": row["transaction_id"], "date": row["date"]}
+                    for row in self._select_by_key("transactions", found, conn)
+                ]
+
+    def release_work_queue(self, claim_id):
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                return conn.execute("DELETE FROM work_queue_claims WHERE claim_id = ?", (claim_id,)).rowcount
+
+    # -------------------------------------------
+    # ✅ Category rules
+    # -------------------------------------------
+    def list_category_rules(self):
+        return self.query("SELECT * FROM category_rules ORDER BY priority DESC, id")
+
+    def add_category_rule(self, data):
+        return self._insert("category_rules", {"created_at": datetime.utcnow().isoformat(), **data})
+
+    def update_category_rule(self, rule_id, data):
+        return self._update("category_rules", "id", rule_id, data)
+
+    def delete_category_rule(self, rule_id):
+        return self._delete("category_rules", "id", rule_id)
+
+    # -------------------------------------------
+    # ✅ Budgets
+    # -------------------------------------------
+    def list_budgets(self, month, year):
+        return self.query("SELECT * FROM budgets WHERE month = ? AND year = ?", (month, year))
+
+    def list_budgets_for_years(self, first_year, last_year):
+        return self.query("SELECT * FROM budgets WHERE year BETWEEN ? AND ?", (first_year, last_year))
+
+    def _upsert_budgets(self, sql, params):
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                return [_to_dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    def set_budget(self, data):
+        """Inserts or updates the budget for (month, year, category_id) in one statement."""
+        return self._upsert_budgets(
+            """
+            INSERT INTO budgets (month, year, category_id, budgeted_amount) VALUES (?, ?, ?, ?)
+            ON CONFLICT (year, month, category_id) DO UPDATE SET budgeted_amount = excluded.budgeted_amount
+            RETURNING *
+            """,
+            (data["month"], data["year"], data["category_id"], _to_sqlite(data["budgeted_amount"])),
+        )
+
+    def copy_budgets(self, from_month, from_year, to_month, to_year, scale=1, overwrite=False):
+        """Copies a month's budgets into another month, amounts times `scale`; returns the rows written.
+
+        Budgets already set in the target month are kept unless `overwrite`.
+        """
+        conflict = "DO UPDATE SET budgeted_amount = excluded.budgeted_amount" if overwrite else "DO NOTHING"
+        return self._upsert_budgets(
+            f"""
+            INSERT INTO budgets (month, year, category_id, budgeted_amount)
+            SELECT ?, ?, category_id, ROUND(budgeted_amount * ?, 2)
+            FROM budgets WHERE month = ? AND year = ?
+            ON CONFLICT (year, month, category_id) {conflict}
+            RETURNING *
+            """,
+            (to_month, to_year, scale, from_month, from_year),
+        )
+
+    def delete_budget(self, budget_id):
+        return self._delete("budgets", "id", budget_id)
+
+    def fetch_all_budgets(self, month, year):
+        return self.query(_BUDGETS_SQL.format(extra=""), (month, year))
+
+    def fetch_regular_budgets(self, month, year):
+        return self.query(
+            _BUDGETS_SQL.format(extra="AND b.category_id != ? AND c.parent_id IS NOT ?"),
+            (month, year, RESERVE_CATEGORY_ID, RESERVE_CATEGORY_ID),
+        )
+
+    def fetch_reserve_budgets(self, month, year):
+        # Same test as is_reserve in _BUDGETS_SQL, so regular + reserve = all
+        return self.query(
+            _BUDGETS_SQL.format(extra="AND (b.category_id = ? OR c.parent_id = ?)"),
+            (month, year, RESERVE_CATEGORY_ID, RESERVE_CATEGORY_ID),
+        )
+
+    # -------------------------------------------
+    # ✅ Summaries
+    # -------------------------------------------
+    def fetch_summary(self, month, year):
+        return self.fetch_summary_rollup(month, year)
+
+    def fetch_regular_summary(self, month, year):
+        return self.fetch_summary_rollup(month, year, reserve=False)
+
+    def fetch_reserve_summary(self, month, year):
+        return self.fetch_summary_rollup(month, year, reserve=True)
+
+    def fetch_summary_rollup(self, month, year, reserve=None):
+        extra = "" if reserve is None else f"AND r.category_id {'=' if reserve else '!='} {RESERVE_CATEGORY_ID}"
+        return self.query(_SUMMARY_SQL.format(extra=extra), (year, month))
+
+    # -------------------------------------------
+    # ✅ Logs
+    # -------------------------------------------
+    @staticmethod
+    def _log_filters(severities, service, route, start, end, time_column="created_at"):
+        clauses, params = [], []
+        if severities:
+            clauses.append(f"severity IN ({', '.join('?' for _ in severities)})")
+            params += list(severities)
+        for column, value in (("service", service), ("route", route)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start:
+            clauses.append(f"{time_column} >= ?")
+            params.append(start)
+        if end:
+            clauses.append(f"{time_column} < ?")
+            params.append(end)
+        return clauses, params
+
+    def list_logs(self, severities=None, service=None, route=None, start=None, end=None, after=None, limit=50):
+        """Newest-first page of logs matching the filters, after the (created_at, id) of `after`."""
+        clauses, params = self._log_filters(severities, service, route, start, end)
+        if after:
+            clauses.append("(created_at, id) < (?, ?)")
+            params += list(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.query(f"SELECT * FROM logs {where} ORDER BY created_at DESC, id DESC LIMIT ?", params + [limit])
+
+    def list_log_rollups(self, severities=None, service=None, route=None, start=None, end=None, limit=500):
+        """Hourly counts left by compact_logs, newest hour first."""
+        clauses, params = self._log_filters(severities, service, route, start, end, time_column="hour")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.query(
+            f"SELECT * FROM log_rollups {where} ORDER BY hour DESC, severity, service, route LIMIT ?", params + [limit]
+        )
+
+    def compact_logs(self, before, severities, limit):
+        """Folds up to `limit` logs older than `before` with these severities into hourly log_rollups
+        and deletes them; returns how many were removed."""
+        placeholders = ", ".join("?" for _ in severities)
+        with self._write_lock:
+            conn = self.connection()
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS temp.compacted_logs")
+                conn.execute(
+                    "CREATE TEMP TABLE compacted_logs AS SELECT rowid AS log_rowid FROM logs"
+                    f" WHERE created_at < ? AND severity IN ({placeholders}) ORDER BY created_at, id LIMIT ?",
+                    [before] + list(severities) + [limit],
+                )
+                conn.execute("""
+                    INSERT INTO log_rollups (hour, severity, service, route, count)
+                    SELECT substr(created_at, 1, 13) || ':00:00', severity, COALESCE(service, ''), COALESCE(route, ''),
+                           COUNT(*)
+                    FROM logs WHERE rowid IN (SELECT log_rowid FROM temp.compacted_logs)
+                    GROUP BY 1, 2, 3, 4
+                    ON CONFLICT (hour, severity, service, route) DO UPDATE SET count = count + excluded.count
+                """)
+                removed = conn.execute(
+                    "DELETE FROM logs WHERE rowid IN (SELECT log_rowid FROM temp.compacted_logs)"
+                ).rowcount
+                conn.execute("DROP TABLE temp.compacted_logs")
+                return removed
+
+    def insert_logs(self, rows):
+        rows = [{"id": str(uuid.uuid4()), "created_at": datetime.utcnow().isoformat(), **row} for row in rows]
+        self.upsert_rows("logs", rows)
+        return rows
+
+
+def _to_sqlite(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _to_dict(row):
+    data = dict(row)
+    for column in BOOLEAN_COLUMNS & data.keys():
+        if data[column] is not None:
+            data[column] = bool(data[column])
+    return data
@@ -0,0 +1,292 @@
+-- SQLite version of the Supabase tables the API uses, for the local storage
+-- backend (STORAGE_BACKEND=sqlite) and the read replica (REPLICA_DB).
+-- Booleans are stored as INTEGER 0/1 and converted back when rows are read.
+
+CREATE TABLE IF NOT EXISTS accounts (
+    account_id TEXT PRIMARY KEY,
+    id INTEGER,
+    name TEXT,
+    official_name TEXT,
+    type TEXT,
+    subtype TEXT,
+    balance_available REAL,
+    balance_current REAL,
+    iso_currency_code TEXT
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    parent_id INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_categories_parent ON categories (parent_id);
+
+CREATE TABLE IF NOT EXISTS budgets (
+    id INTEGER PRIMARY KEY,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    budgeted_amount REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_budgets_month ON budgets (year, month);
+
+-- One budget per category and month; set_budget and copy_budgets upsert on it
+CREATE UNIQUE INDEX IF NOT EXISTS idx_budgets_month_category ON budgets (year, month, category_id);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id TEXT PRIMARY KEY,
+    id INTEGER,
+    account_id TEXT,
+    amount REAL,
+    iso_currency_code TEXT,
+    merchant_name TEXT,
+    category TEXT,
+    plaid_category_id TEXT,
+    pending INTEGER,
+    date TEXT,
+    name TEXT,
+    location_address TEXT,
+    location_city TEXT,
+    location_region TEXT,
+    location_postal_code TEXT,
+    location_country TEXT,
+    user_category_id INTEGER,
+    user_subcategory_id INTEGER,
+    is_ignored INTEGER DEFAULT 0,
+    is_split INTEGER DEFAULT 0,
+    parent_transaction_id TEXT,
+    potential_duplicate INTEGER DEFAULT 0,
+    confirmed_duplicate INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (user_category_id);
+
+-- Per-month totals by category, maintained by the triggers below so summaries
+-- don't re-aggregate transactions. subcategory_id is 0 when a transaction has
+-- no subcategory, since NULLs never conflict in a primary key.
+CREATE TABLE IF NOT EXISTS category_rollups (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    subcategory_id INTEGER NOT NULL DEFAULT 0,
+    total_amount REAL NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (year, month, category_id, subcategory_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO category_rollups (year, month, category_id, subcategory_id, total_amount, transaction_count)
+    SELECT CAST(substr(NEW.date, 1, 4) AS INTEGER), CAST(substr(NEW.date, 6, 2) AS INTEGER),
+           NEW.user_category_id, COALESCE(NEW.user_subcategory_id, 0), COALESCE(NEW.amount, 0), 1
+    WHERE NEW.user_category_id IS NOT NULL AND COALESCE(NEW.is_ignored, 0) = 0 AND NEW.date IS NOT NULL
+    ON CONFLICT (year, month, category_id, subcategory_id) DO UPDATE
+    SET total_amount = total_amount + excluded.total_amount,
+        transaction_count = transaction_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_delete
+AFTER DELETE ON transactions
+WHEN OLD.user_category_id IS NOT NULL AND COALESCE(OLD.is_ignored, 0) = 0 AND OLD.date IS NOT NULL
+BEGIN
+    UPDATE category_rollups
+    SET total_amount = total_amount - COALESCE(OLD.amount, 0),
+        transaction_count = transaction_count - 1
+    WHERE year = CAST(substr(OLD.date, 1, 4) AS INTEGER) AND month = CAST(substr(OLD.date, 6, 2) AS INTEGER)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+    DELETE FROM category_rollups
+    WHERE transaction_count <= 0
+      AND year = CAST(substr(OLD.date, 1, 4) AS INTEGER) AND month = CAST(substr(OLD.date, 6, 2) AS INTEGER)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_update
+AFTER UPDATE OF date, amount, user_category_id, user_subcategory_id, is_ignored ON transactions
+BEGIN
+    UPDATE category_rollups
+    SET total_amount = total_amount - COALESCE(OLD.amount, 0),
+        transaction_count = transaction_count - 1
+    WHERE OLD.user_category_id IS NOT NULL AND COALESCE(OLD.is_ignored, 0) = 0 AND OLD.date IS NOT NULL
+      AND year = CAST(substr(OLD.date, 1, 4) AS INTEGER) AND month = CAST(substr(OLD.date, 6, 2) AS INTEGER)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+    DELETE FROM category_rollups
+    WHERE transaction_count <= 0
+      AND year = CAST(substr(OLD.date, 1, 4) AS INTEGER) AND month = CAST(substr(OLD.date, 6, 2) AS INTEGER)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+
+    INSERT INTO category_rollups (year, month, category_id, subcategory_id, total_amount, transaction_count)
+    SELECT CAST(substr(NEW.date, 1, 4) AS INTEGER), CAST(substr(NEW.date, 6, 2) AS INTEGER),
+           NEW.user_category_id, COALESCE(NEW.user_subcategory_id, 0), COALESCE(NEW.amount, 0), 1
+    WHERE NEW.user_category_id IS NOT NULL AND COALESCE(NEW.is_ignored, 0) = 0 AND NEW.date IS NOT NULL
+    ON CONFLICT (year, month, category_id, subcategory_id) DO UPDATE
+    SET total_amount = total_amount + excluded.total_amount,
+        transaction_count = transaction_count + 1;
+END;
+
+-- How often each merchant has been given each category, for suggestions.
+-- normalize_merchant() is registered on every connection by SQLiteRepository;
+-- subcategory_id is 0 when there is none, as in category_rollups.
+CREATE TABLE IF NOT EXISTS merchant_category_counts (
+    merchant_key TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
+    subcategory_id INTEGER NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (merchant_key, category_id, subcategory_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS transactions_merchant_count_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO merchant_category_counts (merchant_key, category_id, subcategory_id, transaction_count)
+    SELECT normalize_merchant(NEW.merchant_name, NEW.name), NEW.user_category_id,
+           COALESCE(NEW.user_subcategory_id, 0), 1
+    WHERE NEW.user_category_id IS NOT NULL AND COALESCE(NEW.is_ignored, 0) = 0
+      AND normalize_merchant(NEW.merchant_name, NEW.name) IS NOT NULL
+    ON CONFLICT (merchant_key, category_id, subcategory_id) DO UPDATE
+    SET transaction_count = transaction_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_merchant_count_delete
+AFTER DELETE ON transactions
+WHEN OLD.user_category_id IS NOT NULL AND COALESCE(OLD.is_ignored, 0) = 0
+BEGIN
+    UPDATE merchant_category_counts SET transaction_count = transaction_count - 1
+    WHERE merchant_key = normalize_merchant(OLD.merchant_name, OLD.name)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+    DELETE FROM merchant_category_counts
+    WHERE transaction_count <= 0 AND merchant_key = normalize_merchant(OLD.merchant_name, OLD.name)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_merchant_count_update
+AFTER UPDATE OF merchant_name, name, user_category_id, user_subcategory_id, is_ignored ON transactions
+BEGIN
+    UPDATE merchant_category_counts SET transaction_count = transaction_count - 1
+    WHERE OLD.user_category_id IS NOT NULL AND COALESCE(OLD.is_ignored, 0) = 0
+      AND merchant_key = normalize_merchant(OLD.merchant_name, OLD.name)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+    DELETE FROM merchant_category_counts
+    WHERE transaction_count <= 0 AND merchant_key = normalize_merchant(OLD.merchant_name, OLD.name)
+      AND category_id = OLD.user_category_id AND subcategory_id = COALESCE(OLD.user_subcategory_id, 0);
+
+    INSERT INTO merchant_category_counts (merchant_key, category_id, subcategory_id, transaction_count)
+    SELECT normalize_merchant(NEW.merchant_name, NEW.name), NEW.user_category_id,
+           COALESCE(NEW.user_subcategory_id, 0), 1
+    WHERE NEW.user_category_id IS NOT NULL AND COALESCE(NEW.is_ignored, 0) = 0
+      AND normalize_merchant(NEW.merchant_name, NEW.name) IS NOT NULL
+    ON CONFLICT (merchant_key, category_id, subcategory_id) DO UPDATE
+    SET transaction_count = transaction_count + 1;
+END;
+
+-- Full-text index over transaction names and merchants, for /transactions/search.
+-- External content: the text stays in transactions and the triggers below keep
+-- the index in step with it, keyed by the transactions rowid. That rowid is not
+-- an INTEGER PRIMARY KEY, so VACUUM may renumber it: vacuum through
+-- SQLiteRepository.vacuum(), which rebuilds this index afterwards.
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+    name,
+    merchant_name,
+    content='transactions',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO transactions_fts (rowid, name, merchant_name) VALUES (NEW.rowid, NEW.name, NEW.merchant_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_delete
+AFTER DELETE ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, name, merchant_name)
+    VALUES ('delete', OLD.rowid, OLD.name, OLD.merchant_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+AFTER UPDATE OF name, merchant_name ON transactions
+BEGIN
+    INSERT INTO transactions_fts (transactions_fts, rowid, name, merchant_name)
+    VALUES ('delete', OLD.rowid, OLD.name, OLD.merchant_name);
+    INSERT INTO transactions_fts (rowid, name, merchant_name) VALUES (NEW.rowid, NEW.name, NEW.merchant_name);
+END;
+
+-- Auto-categorization rules (see category_rules.py at the repo root)
+CREATE TABLE IF NOT EXISTS category_rules (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    merchant_contains TEXT,
+    plaid_category_id TEXT,
+    min_amount REAL,
+    max_amount REAL,
+    account_id TEXT,
+    user_category_id INTEGER NOT NULL,
+    user_subcategory_id INTEGER,
+    is_enabled INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_uncategorized ON transactions (transaction_id)
+    WHERE user_category_id IS NULL;
+
+-- Work queue of transactions still to be categorized. Queries must repeat this
+-- exact WHERE clause for SQLite to use the partial index.
+CREATE INDEX IF NOT EXISTS idx_transactions_work_queue ON transactions (date, transaction_id)
+    WHERE user_category_id IS NULL AND is_ignored IS NOT 1;
+
+-- Items handed to a reviewer; other claims skip them until expires_at (UTC ISO)
+CREATE TABLE IF NOT EXISTS work_queue_claims (
+    transaction_id TEXT PRIMARY KEY,
+    claim_id TEXT NOT NULL,
+    claimed_by TEXT,
+    expires_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_claims_claim ON work_queue_claims (claim_id);
+
+-- When each table was last copied from Supabase
+CREATE TABLE IF NOT EXISTS replica_meta (
+    table_name TEXT PRIMARY KEY,
+    refreshed_at TEXT NOT NULL,
+    row_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS logs (
+    id TEXT,
+    message TEXT,
+    severity TEXT,
+    service TEXT,
+    route TEXT,
+    page TEXT,
+    endpoint TEXT,
+    user_id TEXT,
+    ip_address TEXT,
+    request_data TEXT,
+    response_data TEXT,
+    stack_trace TEXT,
+    created_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_logs_created_at ON logs (created_at);
+
+-- Keyset pages of /logs: newest first by (created_at, id), optionally per severity or route
+CREATE INDEX IF NOT EXISTS idx_logs_created_id ON logs (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_logs_severity_created ON logs (severity, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_logs_route_created ON logs (route, created_at, id);
+
+-- Hourly counts of log rows removed by the retention job (utils/log_retention.py)
+CREATE TABLE IF NOT EXISTS log_rollups (
+    hour TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    service TEXT NOT NULL DEFAULT '',
+    route TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL,
+    PRIMARY KEY (hour, severity, service, route)
+);
@@ -0,0 +1,306 @@
+from postgrest.exceptions import APIError
+
+from storage.errors import StorageError
+
+# Errors raised by our Postgres functions: P0002 = row missing, 22023 = bad input
+_RPC_ERROR_STATUS = {"P0002": 404, "22023": 400}
+
+PAGE_SIZE = 1000  # PostgREST's default max rows per request
+
+# Transaction columns loaded for analytics
+ANALYTICS_COLUMNS = ("date", "amount", "user_category_id", "user_subcategory_id")
+
+# Transaction columns the category rules match on
+RULE_MATCH_COLUMNS = ("transaction_id", "date", "name", "merchant_name", "plaid_category_id", "amount", "account_id")
+
+
+def _quote_filter_value(value):
+    """Double-quotes a value for a PostgREST or=() filter, so commas and parentheses stay part of it."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class SupabaseRepository:
+    """Storage operations used by the API routes, backed by Supabase."""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        self.client = client
+
+    def _rpc(self, name, params):
+        try:
+            return self.client.rpc(name, params).execute().data
+        except APIError as e:
+            raise StorageError(e.message, _RPC_ERROR_STATUS.get(e.code, 500)) from e
+
+    def ping(self):
+        """Cheapest round trip to the database, for the readiness check."""
+        self.client.table("categories").select("id").limit(1).execute()
+
+    def warm_up(self):
+        """Creates the client (it is lazy) and opens its connection before the first request."""
+        self.ping()
+
+    # -------------------------------------------
+    # ✅ Accounts
+    # -------------------------------------------
+    def list_accounts(self):
+        return self.client.table("accounts").select("*").execute().data
+
+    def add_account(self, data):
+        return self.client.table("accounts").insert(data).execute().data
+
+    def update_account(self, account_id, data):
+        return self.client.table("accounts").update(data).eq("id", account_id).execute().data
+
+    def delete_account(self, account_id):
+        return self.client.table("accounts").delete().eq("id", account_id).execute().data
+
+    # -------------------------------------------
+    # ✅ Categories
+    # -------------------------------------------
+    def list_categories(self):
+        return self.client.table("categories").select("*").execute().data
+
+    def list_main_categories(self):
+        return self.client.table("categories").select("*").is_("parent_id", None).execute().data
+
+    def list_subcategories(self, parent_id):
+        return self.client.table("categories").select("*").eq("parent_id", parent_id).execute().data
+
+    def add_category(self, data):
+        return self.client.table("categories").insert(data).execute().data
+
+    def update_category(self, category_id, data):
+        return self.client.table("categories").update(data).eq("id", category_id).execute().data
+
+    def delete_category(self, category_id):
+        return self.client.table("categories").delete().eq("id", category_id).execute().data
+
+    # -------------------------------------------
+    # ✅ Transactions
+    # -------------------------------------------
+    def list_transactions(self):
+        return self.client.table("transactions").select("*").execute().data
+
+    def list_unprocessed_transactions(self):
+        return (
+            self.client.table("transactions")
+            .select("*")
+            .is_("user_category_id", None)  # No category assigned
+            .or_("is_ignored.is.null,is_ignored.eq.false")  # Not ignored
+            .order("date")
+            .order("transaction_id")
+            .execute()
+            .data
+        )
+
+    def load_transaction_columns(self):
+        """Columns of categorized, non-ignored transactions, as lists keyed by column name."""
+        columns = {name: [] for name in ANALYTICS_COLUMNS}
+        after = None
+        while True:
+            # Keyset pages on transaction_id: each one is an index range, where OFFSET rescans every earlier row
+            query = (
+                self.client.table("transactions")
+                .select(",".join(("transaction_id",) + ANALYTICS_COLUMNS))
+                .not_.is_("user_category_id", "null")
+                .or_("is_ignored.is.null,is_ignored.eq.false")
+            )
+            if after is not None:
+                query = query.gt("transaction_id", after)
+            page = query.order("transaction_id").limit(PAGE_SIZE).execute().data
+            for row in page:
+                for name, values in columns.items():
+                    values.append(row[name])
+            if len(page) < PAGE_SIZE:
+                return columns
+            after = page[-1]["transaction_id"]
+
+    def list_processed_transactions(self):
+        return (
+            self.client.table("transactions")
+            .select("*")
+            .or_("user_category_id.not.is.null,is_ignored.eq.true")
+            .execute()
+            .data
+        )
+
+    def list_transactions_with_splits(self, transaction_ids):
+        """Returns the given transactions plus any split children they have."""
+        ids = ",".join(f'"{tid}"' for tid in transaction_ids)
+        return (
+            self.client.table("transactions")
+            .select("*")
+            .or_(f"transaction_id.in.({ids}),parent_transaction_id.in.({ids})")
+            .execute()
+            .data
+        )
+
+    def add_transaction(self, data):
+        return self.client.table("transactions").insert(data).execute().data
+
+    def update_transaction(self, transaction_id, data):
+        return self.client.table("transactions").update(data).eq("transaction_id", transaction_id).execute().data
+
+    def delete_transaction(self, transaction_id):
+        return self.client.table("transactions").delete().eq("transaction_id", transaction_id).execute().data
+
+    def bulk_update_transactions(self, rows):
+        """Applies per-row updates in one call; returns [{transaction_id, date}] for rows found."""
+        return self._rpc("bulk_update_transactions", {"updates": rows}) or []
+
+    def split_transactions(self, requests):
+        """Splits transactions atomically; returns one result per parent."""
+        return self._rpc("split_transactions", {"requests": requests}) or []
+
+    def search_transactions(self, terms, limit=50):
+        """Transactions whose name or merchant has words starting with every term, best match first."""
+        return self._rpc("search_transactions", {"terms": list(terms), "max_results": limit})
+
+    def list_uncategorized_transactions(self, after=None, limit=PAGE_SIZE):
+        """One keyset page of uncategorized, non-ignored transactions, ordered by transaction_id."""
+        query = (
+            self.client.table("transactions")
+            .select(",".join(RULE_MATCH_COLUMNS))
+            .is_("user_category_id", "null")
+            .or_("is_ignored.is.null,is_ignored.eq.false")
+        )
+        if after is not None:
+            query = query.gt("transaction_id", after)
+        return query.order("transaction_id").limit(limit).execute().data
+
+    def suggest_categories(self, merchant_keys, k=3):
+        """Top-k categories per merchant key from merchant_category_counts."""
+        return self._rpc("suggest_categories", {"merchant_keys": list(merchant_keys), "k": k})
+
+    # -------------------------------------------
+    # ✅ Work queue of unprocessed transactions
+    # -------------------------------------------
+    def count_work_queue(self):
+        return self._rpc("work_queue_count", {})[0]
+
+    def list_work_queue(self, newest=False, after=None, limit=50):
+        """One page of unprocessed transactions by (date, transaction_id), after the item `after`."""
+        return self._rpc("work_queue_page", {"newest": newest, "after_id": after, "max_items": limit})
+
+    def claim_work_queue(self, claim_id, worker, limit=20, newest=False, lease_seconds=300):
+        """Claims up to `limit` unclaimed items; other claims skip them until the lease ends."""
+        return self._rpc("claim_work_queue", {
+            "p_claim_id": claim_id, "p_worker": worker, "max_items": limit,
+            "newest": newest, "lease_seconds": lease_seconds,
+        })
+
+    def complete_work_queue(self, claim_id, rows):
+        """Applies updates to items the claim still holds and releases them; returns the rows updated."""
+        return self._rpc("complete_work_queue", {"p_claim_id": claim_id, "updates": rows})
+
+    def release_work_queue(self, claim_id):
+        return self._rpc("release_work_queue", {"p_claim_id": claim_id})
+
+    # -------------------------------------------
+    # ✅ Category rules
+    # -------------------------------------------
+    def list_category_rules(self):
+        return (
+            self.client.table("category_rules")
+            .select("*")
+            .order("priority", desc=True)
+            .order("id")
+            .execute()
+            .data
+        )
+
+    def add_category_rule(self, data):
+        return self.client.table("category_rules").insert(data).execute().data
+
+    def update_category_rule(self, rule_id, data):
+        return self.client.table("category_rules").update(data).eq("id", rule_id).execute().data
+
+    def delete_category_rule(self, rule_id):
+        return self.client.table("category_rules").delete().eq("id", rule_id).execute().data
+
+    # -------------------------------------------
+    # ✅ Budgets
+    # -------------------------------------------
+    def list_budgets_for_years(self, first_year, last_year):
+        return self.client.table("budgets").select("*").gte("year", first_year).lte("year", last_year).execute().data
+
+    def list_budgets(self, month, year):
+        return self.client.table("budgets").select("*").eq("month", month).eq("year", year).execute().data
+
+    def set_budget(self, data):
+        """Inserts or updates the budget for (month, year, category_id) in one upsert."""
+        return self.client.table("budgets").upsert(data, on_conflict="month,year,category_id").execute().data
+
+    def copy_budgets(self, from_month, from_year, to_month, to_year, scale=1, overwrite=False):
+        """Copies a month's budgets into another month in one call; returns the rows written."""
+        return self._rpc("copy_budgets", {
+            "p_from_month": from_month, "p_from_year": from_year, "p_to_month": to_month, "p_to_year": to_year,
+            "p_scale": scale, "p_overwrite": overwrite,
+        }) or []
+
+    def delete_budget(self, budget_id):
+        return self.client.table("budgets").delete().eq("id", budget_id).execute().data
+
+    def fetch_all_budgets(self, month, year):
+        return self._rpc("fetch_all_budgets", {"p_month": month, "p_year": year})
+
+    def fetch_regular_budgets(self, month, year):
+        return self._rpc("fetch_regular_budgets", {"p_month": month, "p_year": year})
+
+    def fetch_reserve_budgets(self, month, year):
+        return self._rpc("fetch_reserve_budgets", {"p_month": month, "p_year": year})
+
+    # -------------------------------------------
+    # ✅ Summaries: the original RPCs, and fetch_summary_rollup over category_monthly_rollups
+    # -------------------------------------------
+    def fetch_summary(self, month, year):
+        return self._rpc("fetch_summary", {"month": month, "year": year})
+
+    def fetch_regular_summary(self, month, year):
+        return self._rpc("fetch_regular_summary", {"month": month, "year": year})
+
+    def fetch_reserve_summary(self, month, year):
+        return self._rpc("fetch_reserve_summary", {"month": month, "year": year})
+
+    def fetch_summary_rollup(self, month, year, reserve=None):
+        return self._rpc("fetch_summary_rollup", {"month": month, "year": year, "reserve": reserve})
+
+    # -------------------------------------------
+    # ✅ Logs
+    # -------------------------------------------
+    @staticmethod
+    def _filter_logs(query, severities, service, route, start, end, time_column="created_at"):
+        if severities:
+            query = query.in_("severity", list(severities))
+        if service is not None:
+            query = query.eq("service", service)
+        if route is not None:
+            query = query.eq("route", route)
+        if start:
+            query = query.gte(time_column, start)
+        if end:
+            query = query.lt(time_column, end)
+        return query
+
+    def list_logs(self, severities=None, service=None, route=None, start=None, end=None, after=None, limit=50):
+        """Newest-first page of logs matching the filters, after the (created_at, id) of `after`."""
+        query = self._filter_logs(self.client.table("logs").select("*"), severities, service, route, start, end)
+        if after:
+            created_at, log_id = (_quote_filter_value(value) for value in after)
+            query = query.or_(f"created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{log_id})")
+        return query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute().data
+
+    def list_log_rollups(self, severities=None, service=None, route=None, start=None, end=None, limit=500):
+        """Hourly counts left by compact_logs, newest hour first."""
+        query = self._filter_logs(self.client.table("log_rollups").select("*"), severities, service, route,
+                                  start, end, time_column="hour")
+        return query.order("hour", desc=True).order("severity").limit(limit).execute().data
+
+    def compact_logs(self, before, severities, limit):
+        """Folds up to `limit` old logs into hourly log_rollups in one database call; returns how many."""
+        return self._rpc("compact_logs", {"before": before, "severities": list(severities), "max_rows": limit}) or 0
+
+    def insert_logs(self, rows):
+        return self.client.table("logs").insert(rows).execute().data
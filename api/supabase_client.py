@@ -1,11 +1,54 @@
 import os
-from supabase import create_client
+import threading
+from utils.helpers import use_repo_root
+
+use_repo_root()
+
+from query_tracer import traced_client  # noqa: E402
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Supabase credentials not found. Set in environment variables.")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-print("✅ Supabase connected successfully.")
\ No newline at end of file
+def connect():
+    """Creates the shared client; raises ValueError when the credentials are missing."""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Supabase credentials not found. Set in environment variables.")
+    from supabase import create_client  # the SDK is slow to import, so only load it when needed
+
+    # ✅ Queries through the shared client are counted per request (see utils/tracing.py)
+    client = traced_client(create_client(SUPABASE_URL, SUPABASE_KEY))
+    print("✅ Supabase client created.")
+    return client
+
+
+class LazyClient:
+    """Stands in for the Supabase client and creates it on first use.
+
+    Importing the API no longer waits on (or fails because of) client setup;
+    call warm_up() to create it ahead of the first request instead.
+    """
+
+    def __init__(self, factory=connect):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self):
+        return self._client is not None
+
+    def get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    warm_up = get
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+supabase = LazyClient()
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.cache import rpc_cache
+
+ANALYTICS_TTL = float(os.getenv("ANALYTICS_TTL", 300))  # seconds before reloading writes made outside the API
+ANALYTICS_MAX_MONTHS = int(os.getenv("ANALYTICS_MAX_MONTHS", 120))
+
+
+# -------------------------------------------
+# ✅ Month axis: months since 1970-01
+# -------------------------------------------
+def month_index(year, month):
+    return (year - 1970) * 12 + month - 1
+
+
+def parse_month(value):
+    """Parses "YYYY-MM" into a month index, raising ValueError if it is malformed."""
+    year, month = (int(part) for part in str(value).split("-"))
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {value}")
+    return month_index(year, month)
+
+
+def month_label(index):
+    year, month = divmod(int(index), 12)
+    return f"{year + 1970:04d}-{month + 1:02d}"
+
+
+class SpendingFrame:
+    """Categorized, non-ignored transactions held as NumPy columns.
+
+    Every aggregate is a single bincount over the rows in range, so a request
+    costs one pass over the arrays no matter how many months it covers.
+    """
+
+    def __init__(self, month, amount, category_id, subcategory_id):
+        self.month = month
+        self.amount = amount
+        self.category_id = category_id
+        self.subcategory_id = subcategory_id  # 0 when the transaction has none
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Builds a frame from the column lists returned by load_transaction_columns()."""
+        month = np.array(columns["date"], dtype="datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        amount = np.nan_to_num(np.array(columns["amount"], dtype=np.float64))
+        category_id = np.nan_to_num(np.array(columns["user_category_id"], dtype=np.float64)).astype(np.int64)
+        subcategory_id = np.nan_to_num(np.array(columns["user_subcategory_id"], dtype=np.float64)).astype(np.int64)
+        return cls(month, amount, category_id, subcategory_id)
+
+    def __len__(self):
+        return len(self.amount)
+
+    def keys(self, by):
+        """Grouping key per row: the main category, or the subcategory when one is set."""
+        if by == "category":
+            return self.category_id
+        if by == "subcategory":
+            return np.where(self.subcategory_id > 0, self.subcategory_id, self.category_id)
+        raise ValueError(f"Unknown grouping: {by}")
+
+    def monthly_totals(self, first, last, by="category", keys=None):
+        """Returns (keys, totals) where totals[i, m] is what keys[i] spent in month first + m.
+
+        Pass `keys` to get rows for exactly those keys (zeros where nothing was spent).
+        """
+        n_months = last - first + 1
+        in_range = (self.month >= first) & (self.month <= last)
+        row_keys = self.keys(by)[in_range]
+
+        if keys is None:
+            keys = np.flatnonzero(np.bincount(row_keys)) if len(row_keys) else np.array([], dtype=np.int64)
+        keys = np.asarray(keys, dtype=np.int64)
+
+        # Dense row number per key; rows whose key wasn't asked for are dropped
+        size = int(max(keys.max(initial=-1), row_keys.max(initial=-1))) + 1
+        lookup = np.full(size, -1, dtype=np.int64)
+        lookup[keys] = np.arange(len(keys))
+        rows = lookup[row_keys]
+        wanted = rows >= 0
+
+        flat = rows[wanted] * n_months + (self.month[in_range][wanted] - first)
+        totals = np.bincount(flat, weights=self.amount[in_range][wanted], minlength=len(keys) * n_months)
+        return keys, totals.reshape(len(keys), n_months)
+
+
+def rolling_mean(totals, window):
+    """Trailing mean over `window` months along each row (shorter at the start)."""
+    sums = np.cumsum(totals, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts = np.minimum(np.arange(1, totals.shape[1] + 1), window)
+    return sums / counts
+
+
+def budget_matrix(budgets, keys, first, last):
+    """Budgeted amounts laid out like monthly_totals(keys=keys)."""
+    matrix = np.zeros((len(keys), last - first + 1))
+    row_of = {int(key): i for i, key in enumerate(keys)}
+    for budget in budgets:
+        month = month_index(budget["year"], budget["month"])
+        row = row_of.get(budget["category_id"])
+        if row is not None and first <= month <= last:
+            matrix[row, month - first] += budget.get("budgeted_amount") or 0
+    return matrix
+
+
+# -------------------------------------------
+# ✅ Views returned by the /analytics endpoints
+# -------------------------------------------
+def _rounded(values):
+    return np.round(values, 2).tolist()
+
+
+def trends(frame, first, last, by="category", window=3):
+    """Monthly totals with a trailing rolling mean and year-over-year change per key."""
+    # Load enough history before `first` for the rolling window and the prior year
+    lead = max(12, window - 1)
+    keys, totals = frame.monthly_totals(first - lead, last, by=by)
+    means = rolling_mean(totals, window)[:, lead:]
+    previous = totals[:, lead - 12:totals.shape[1] - 12]
+    current = totals[:, lead:]
+
+    return {
+        "months": [month_label(m) for m in range(first, last + 1)],
+        "by": by,
+        "window": window,
+        "series": [
+            {
+                "category_id": int(key),
+                "totals": _rounded(current[i]),
+                "rolling_mean": _rounded(means[i]),
+                "previous_year": _rounded(previous[i]),
+                "yoy_change": _rounded(current[i] - previous[i]),
+            }
+            for i, key in enumerate(keys)
+            if current[i].any() or previous[i].any()
+        ],
+    }
+
+
+def budget_variance(frame, budgets, first, last):
+    """Budgeted vs actual spending per budgeted category for each month.
+
+    Budgets are set on subcategories, so actuals are grouped by subcategory
+    (falling back to the main category for transactions without one).
+    """
+    keys = np.array(sorted({budget["category_id"] for budget in budgets}), dtype=np.int64)
+    _, actual = frame.monthly_totals(first, last, by="subcategory", keys=keys)
+    budgeted = budget_matrix(budgets, keys, first, last)
+    variance = budgeted - actual
+
+    return {
+        "months": [month_label(m) for m in range(first, last + 1)],
+        "series": [
+            {
+                "category_id": int(key),
+                "budgeted": _rounded(budgeted[i]),
+                "actual": _rounded(actual[i]),
+                "variance": _rounded(variance[i]),
+                "total_variance": round(float(variance[i].sum()), 2),
+            }
+            for i, key in enumerate(keys)
+        ],
+    }
+
+
+# -------------------------------------------
+# ✅ Cached frame, reloaded after API writes or once ANALYTICS_TTL passes
+# -------------------------------------------
+_frame_lock = threading.Lock()
+_cached = None  # (repository, cache version, loaded_at, frame)
+
+
+def get_frame(repository):
+    """Returns the transaction frame for a repository, loading it at most once per change."""
+    global _cached
+    with _frame_lock:
+        version = rpc_cache.version()
+        if _cached is not None:
+            cached_repository, cached_version, loaded_at, frame = _cached
+            if (
+                cached_repository is repository
+                and cached_version == version
+                and time.monotonic() - loaded_at < ANALYTICS_TTL
+            ):
+                return frame
+
+        started = time.perf_counter()
+        frame = SpendingFrame.from_columns(repository.load_transaction_columns())
+        _cached = (repository, version, time.monotonic(), frame)
+        print(f"✅ Loaded {len(frame)} transactions for analytics in {time.perf_counter() - started:.2f}s")
+        return frame
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+RPC_CACHE_MAX_ENTRIES = int(os.getenv("RPC_CACHE_MAX_ENTRIES", 256))
+RPC_CACHE_TTL = float(os.getenv("RPC_CACHE_TTL", 300))  # seconds
+
+
+class RPCCache:
+    """LRU + TTL cache for per-month RPC results, keyed by (rpc, month, year)."""
+
+    def __init__(self, max_entries=RPC_CACHE_MAX_ENTRIES, ttl=RPC_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}  # (month, year) -> bumped on every invalidation
+        self._version = 0  # bumped on any invalidation, for caches that span months
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (hit, value) for a key, evicting it if it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def generation(self, month, year):
+        with self._lock:
+            return self._generations.get((month, year), 0)
+
+    def version(self):
+        with self._lock:
+            return self._version
+
+    def set(self, key, value, generation=None, version=None):
+        """Stores a value unless its month was invalidated since `generation`, or anything since `version`.
+
+        clear() only bumps the generations of months it had entries for, so a
+        fetch for an uncached month is caught by `version` instead.
+        """
+        _, month, year = key
+        with self._lock:
+            if generation is not None and self._generations.get((month, year), 0) != generation:
+                return  # a write landed while the RPC was in flight
+            if version is not None and self._version != version:
+                return  # the cache was cleared or invalidated while the RPC was in flight
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_month(self, month, year):
+        """Drops every cached RPC result for a month."""
+        with self._lock:
+            self._generations[(month, year)] = self._generations.get((month, year), 0) + 1
+            self._version += 1
+            for key in [k for k in self._entries if k[1] == month and k[2] == year]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            for month_year in {(k[1], k[2]) for k in self._entries}:
+                self._generations[month_year] = self._generations.get(month_year, 0) + 1
+            self._version += 1
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+rpc_cache = RPCCache()
+
+
+def cached_rpc(rpc_name, month, year, fetch):
+    """Returns fetch() for a per-month RPC, serving repeat calls from the cache."""
+    key = (rpc_name, month, year)
+    hit, data = rpc_cache.get(key)
+    if hit:
+        return data
+
+    generation, version = rpc_cache.generation(month, year), rpc_cache.version()
+    data = fetch()
+    rpc_cache.set(key, data, generation, version)
+    return data
+
+
+async def cached_rpc_async(rpc_name, month, year, fetch):
+    """cached_rpc() for the ASGI app, where fetch() returns an awaitable."""
+    key = (rpc_name, month, year)
+    hit, data = rpc_cache.get(key)
+    if hit:
+        return data
+
+    generation, version = rpc_cache.generation(month, year), rpc_cache.version()
+    data = await fetch()
+    rpc_cache.set(key, data, generation, version)
+    return data
+
+
+def invalidate_transaction_months(rows):
+    """Invalidates cached results for the months touched by transaction rows."""
+    if isinstance(rows, dict):
+        rows = [rows]
+    for row in rows or []:
+        date = (row or {}).get("date")
+        if not date:
+            continue
+        try:
+            year, month = int(str(date)[:4]), int(str(date)[5:7])
+        except ValueError:
+            rpc_cache.clear()  # unparseable date: be safe
+            return
+        rpc_cache.invalidate_month(month, year)
@@ -0,0 +1,53 @@
+import gzip
+import os
+
+from flask import request
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))  # bytes; smaller bodies go out as-is
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 5))  # gzip level: 1 fastest .. 9 smallest
+
+_COMPRESSIBLE = {"application/json", "text/plain", "text/html", "text/csv"}
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip (explicitly or via *) with a non-zero q."""
+    allowed = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            allowed[coding.strip().lower()] = q
+    return allowed.get("gzip", allowed.get("*", 0.0)) > 0
+
+
+def compress_body(body, accept_encoding, min_size=COMPRESSION_MIN_SIZE, level=COMPRESSION_LEVEL):
+    """Returns (body, content encoding or None) for a response to a request with `accept_encoding`."""
+    if len(body) < min_size or not accepts_gzip(accept_encoding):
+        return body, None
+    return gzip.compress(body, compresslevel=level, mtime=0), "gzip"
+
+
+def install_compression(app, min_size=COMPRESSION_MIN_SIZE, level=COMPRESSION_LEVEL):
+    """Gzips text responses of at least `min_size` bytes for clients that accept it."""
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.mimetype not in _COMPRESSIBLE
+                or "Content-Encoding" in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)):
+            return response
+
+        response.vary.add("Accept-Encoding")  # caches must key on it whether or not this one is compressed
+        body, encoding = compress_body(response.get_data(), request.headers.get("Accept-Encoding"), min_size, level)
+        if encoding:
+            response.set_data(body)
+            response.headers["Content-Encoding"] = encoding
+        return response
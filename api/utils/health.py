@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", 10))
+WARM_UP = os.getenv("WARM_UP", "0") == "1"  # create backend clients in the background at startup
+
+STARTED_AT = time.monotonic()
+
+
+class ReadinessCheck:
+    """Pings the repository at most once per `ttl` seconds and remembers the answer.
+
+    Load balancers poll readiness every few seconds on every instance; the
+    cache keeps that from turning into steady database traffic.
+    """
+
+    def __init__(self, repository, ttl=READINESS_CACHE_SECONDS):
+        self.repository = repository
+        self.ttl = ttl
+        self._result = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def _check(self):
+        started = time.perf_counter()
+        try:
+            self.repository.ping()
+            database = {"ok": True}
+        except Exception as e:
+            database = {"ok": False, "error": str(e)}
+        database["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        checks = {"database": database}
+        replica = getattr(self.repository, "replica", None)
+        if replica is not None:
+            # Reads fall back to Supabase until the copy is loaded, so this never fails readiness
+            checks["replica"] = {"ok": True, "loaded": replica.is_ready()}
+
+        return {
+            "status": "ready" if all(check["ok"] for check in checks.values()) else "unavailable",
+            "checks": checks,
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+
+    def result(self):
+        """(result, cached): the last check if younger than ttl, else a fresh one."""
+        with self._lock:  # concurrent probes share one check
+            now = time.monotonic()
+            if self._result is not None and now - self._checked < self.ttl:
+                return self._result, True
+            self._result, self._checked = self._check(), now
+            return self._result, False
+
+
+def warm_up(repository):
+    """Creates clients and opens connections ahead of the first request, in the background."""
+    def run():
+        started = time.perf_counter()
+        try:
+            (getattr(repository, "warm_up", None) or repository.ping)()
+            print(f"✅ Warmed up {repository.name} storage backend in {time.perf_counter() - started:.2f}s.")
+        except Exception as e:
+            print(f"⚠️ Warm-up of {repository.name} storage backend failed: {e}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
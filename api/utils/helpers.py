@@ -0,0 +1,45 @@
+import os
+import re
+import sys
+from datetime import datetime
+
+# plaid_sync.py and category_rules.py live at the repo root, one level above api/
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_WORDS = re.compile(r"\w+")
+_LOG_ID = re.compile(r"[\w-]+")
+
+
+def normalize_merchant(merchant_name, name=None):
+    """Key for grouping transactions by merchant: "SQ *BLUE BOTTLE #12" -> "sq blue bottle".
+
+    Uses merchant_name, falling back to name. Must stay in step with the
+    normalize_merchant SQL function in the merchant_category_counts migration.
+    """
+    text = (merchant_name or "").strip() or name or ""
+    return _NON_LETTERS.sub(" ", text.lower()).strip() or None
+
+
+def search_terms(query, max_terms=8):
+    """Lowercase words of a search query, safe to use as prefix terms in FTS5 and tsquery."""
+    return _WORDS.findall((query or "").lower())[:max_terms]
+
+
+def parse_log_cursor(cursor):
+    """(created_at, id) from a /logs next_cursor "created_at|id"; ValueError if it isn't one.
+
+    Checked before the values reach a query filter, so a bad cursor is a 400
+    rather than a malformed PostgREST filter.
+    """
+    created_at, separator, log_id = (cursor or "").partition("|")
+    if not separator or not _LOG_ID.fullmatch(log_id):
+        raise ValueError("Invalid cursor")
+    datetime.fromisoformat(created_at)  # raises ValueError for anything but an ISO timestamp
+    return created_at, log_id
+
+
+def use_repo_root():
+    """Makes the modules at the repo root importable from the API."""
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Long-running work (e.g. a Plaid sync) runs on a small in-process pool so the
+# request that starts it returns straight away with a job id to poll.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_HISTORY = int(os.getenv("JOB_HISTORY", 50))  # finished jobs kept for /jobs
+JOB_EVENTS = 20  # progress events kept per job
+
+
+def _now():
+    return datetime.utcnow().isoformat()
+
+
+class JobRunner:
+    """Runs jobs in background threads, at most one active job per kind.
+
+    Submitting a kind that is already queued or running returns the existing
+    job instead of starting another, so a burst of sync requests costs a
+    single run. Jobs submitted with the same `lane` (e.g. every kind of sync,
+    which write the same tables) run one at a time: later ones stay queued
+    until the lane is free, without holding a worker.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, history=JOB_HISTORY):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # job id -> job dict, oldest first
+        self._active = {}  # kind -> id of its queued or running job
+        self._lanes = {}  # lane -> id of the job started in it
+        self._waiting = {}  # lane -> deque of (job, fn) queued behind it
+        self._stats = {"submitted": 0, "deduplicated": 0, "succeeded": 0, "failed": 0}
+
+    def submit(self, kind, fn, lane=None, **params):
+        """Starts `fn(progress, **params)` unless a `kind` job is active.
+
+        With a `lane`, the job waits for the lane's current job to finish.
+
+        Returns (job snapshot, created) where created is False when the call
+        was folded into the job already in flight.
+        """
+        with self._lock:
+            active_id = self._active.get(kind)
+            if active_id is not None:
+                job = self._jobs[active_id]
+                job["requests"] += 1
+                self._stats["deduplicated"] += 1
+                return self._snapshot(job), False
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "lane": lane,
+                "params": params,
+                "status": "queued",
+                "requests": 1,
+                "created_at": _now(),
+                "started_at": None,
+                "finished_at": None,
+                "duration_ms": None,
+                "stage": None,
+                "progress": {},
+                "events": deque(maxlen=JOB_EVENTS),
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            self._active[kind] = job["id"]
+            self._stats["submitted"] += 1
+            self._trim()
+            snapshot = self._snapshot(job)
+            start = lane is None or lane not in self._lanes
+            if start and lane is not None:
+                self._lanes[lane] = job["id"]
+            elif not start:
+                self._waiting.setdefault(lane, deque()).append((job, fn))
+
+        if start:
+            self._executor.submit(self._run, job, fn)
+        return snapshot, True
+
+    def _run(self, job, fn):
+        def progress(stage, **info):
+            with self._lock:
+                job["stage"] = stage
+                job["progress"].update(info)
+                job["events"].append({"at": _now(), "stage": stage, **info})
+
+        started = time.perf_counter()
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = _now()
+        try:
+            result = fn(progress, **job["params"])
+            status, error = "succeeded", None
+        except Exception as e:
+            result, status, error = None, "failed", str(e)
+            print(f"❌ Job {job['kind']} {job['id']} failed: {e}")
+
+        with self._lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = _now()
+            job["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._stats[status] += 1
+            if self._active.get(job["kind"]) == job["id"]:
+                del self._active[job["kind"]]
+            following = self._next_in_lane(job["lane"])
+
+        if following is not None:
+            self._executor.submit(self._run, *following)
+
+    def _next_in_lane(self, lane):
+        # Hands a finished job's lane to the next job queued in it (lock held)
+        if lane is None:
+            return None
+        waiting = self._waiting.get(lane)
+        if not waiting:
+            self._waiting.pop(lane, None)
+            del self._lanes[lane]
+            return None
+        following = waiting.popleft()
+        self._lanes[lane] = following[0]["id"]
+        return following
+
+    def _trim(self):
+        # Drop the oldest finished jobs beyond the history limit; active ones stay
+        active = set(self._active.values())
+        excess = len(self._jobs) - self._history
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if job_id not in active:
+                del self._jobs[job_id]
+                excess -= 1
+
+    @staticmethod
+    def _snapshot(job):
+        snapshot = {key: value for key, value in job.items() if key != "params"}
+        snapshot["progress"] = dict(job["progress"])
+        snapshot["events"] = list(job["events"])
+        return snapshot
+
+    def get(self, job_id):
+        """Returns a copy of a job, or None if it is unknown or has aged out."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def list(self, kind=None):
+        """Returns the retained jobs, newest first."""
+        with self._lock:
+            return [
+                self._snapshot(job) for job in reversed(self._jobs.values())
+                if kind is None or job["kind"] == kind
+            ]
+
+    def active(self, kind):
+        """Returns the queued or running job of a kind, or None."""
+        with self._lock:
+            job_id = self._active.get(kind)
+            return self._snapshot(self._jobs[job_id]) if job_id else None
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "active": len(self._active), "retained": len(self._jobs)}
+
+    def wait(self, job_id, timeout=None):
+        """Blocks until a job finishes (used by tests and the CLI); returns its snapshot."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in ("succeeded", "failed"):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(0.01)
+
+
+class Debouncer:
+    """Collapses bursts of triggers for the same kind into one job submission.
+
+    Each trigger pushes the run back by `delay` seconds, but never more than
+    `max_wait` after the first trigger of the burst. If that kind is still
+    running when the timer fires, the run is pushed back again so the changes
+    that arrived mid-run get their own pass once it finishes.
+    """
+
+    def __init__(self, runner, delay, max_wait):
+        self.runner = runner
+        self.delay = delay
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._pending = {}  # kind -> {"fn", "lane", "params", "first", "timer", "triggers"}
+
+    def trigger(self, kind, fn, lane=None, **params):
+        """Schedules `kind` (in `lane`, see JobRunner.submit); returns how many triggers the pending run now covers."""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._pending.get(kind)
+            if entry is None:
+                entry = {"first": now, "timer": None, "triggers": 0}
+                self._pending[kind] = entry
+            else:
+                entry["timer"].cancel()
+            entry.update(fn=fn, lane=lane, params=params)
+            entry["triggers"] += 1
+            wait = min(self.delay, max(0.0, entry["first"] + self.max_wait - now))
+            self._arm(kind, entry, wait)
+            return entry["triggers"]
+
+    def _arm(self, kind, entry, wait):
+        timer = threading.Timer(wait, self._fire, args=(kind, entry))
+        timer.daemon = True
+        entry["timer"] = timer
+        timer.start()
+
+    def _fire(self, kind, entry):
+        with self._lock:
+            if self._pending.get(kind) is not entry or entry["timer"] is not threading.current_thread():
+                return  # superseded by a later trigger
+            active = self.runner.active(kind)
+            if active is not None and active["status"] == "running":
+                self._arm(kind, entry, self.delay)
+                return
+            del self._pending[kind]
+        self.runner.submit(kind, entry["fn"], lane=entry["lane"], **entry["params"])
+
+    def pending(self):
+        """Kinds waiting for their timer, with the number of triggers each covers."""
+        with self._lock:
+            return {kind: entry["triggers"] for kind, entry in self._pending.items()}
+
+
+job_runner = JobRunner()
@@ -0,0 +1,40 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider, _default
+
+_OPTIONS = (
+    orjson.OPT_SORT_KEYS  # same key order as Flask's encoder
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY  # analytics results
+    | orjson.OPT_PASSTHROUGH_DATETIME  # dates keep Flask's HTTP-date format via _default
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with orjson doing the encoding.
+
+    Output parses to the same values as Flask's encoder (non-ASCII text is
+    sent as UTF-8 instead of \\u escapes). Anything orjson rejects, such as
+    integers over 64 bits, falls back to the standard encoder.
+    """
+
+    def encode(self, obj, indent=False):
+        """Serializes `obj` to UTF-8 bytes."""
+        try:
+            return orjson.dumps(obj, default=_default, option=_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            return (super().dumps(obj, indent=2) if indent else super().dumps(obj, separators=(",", ":"))).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:  # separators, cls etc. only the standard encoder understands
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return super().loads(s, **kwargs) if kwargs else orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        # Hand Flask bytes, skipping the str round trip of the default provider
+        return self._app.response_class(self.encode(obj, indent) + b"\n", mimetype=self.mimetype)
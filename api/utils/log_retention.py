@@ -0,0 +1,52 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", 7))
+LOG_COMPACT_SEVERITIES = [s for s in os.getenv("LOG_COMPACT_SEVERITIES", "INFO,DEBUG").split(",") if s]
+LOG_COMPACT_BATCH = int(os.getenv("LOG_COMPACT_BATCH", 10000))
+
+LOG_RETENTION_JOB = "log_retention"
+
+
+def compact_logs(repository, days=LOG_RETENTION_DAYS, severities=LOG_COMPACT_SEVERITIES, batch=LOG_COMPACT_BATCH,
+                 progress=None):
+    """Folds logs older than `days` with these severities into hourly log_rollups counts and deletes them.
+
+    Runs in batches of `batch` rows so no single transaction holds the logs
+    table for long. WARNING and ERROR rows are kept in full unless listed.
+    """
+    started = time.perf_counter()
+    before = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    compacted, batches = 0, 0
+
+    while True:
+        removed = repository.compact_logs(before, severities, batch)
+        compacted += removed
+        batches += 1
+        if progress:
+            progress("compacting", compacted=compacted, batches=batches)
+        if removed < batch:
+            break
+
+    return {
+        "before": before,
+        "severities": list(severities),
+        "compacted": compacted,
+        "batches": batches,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def run_log_retention(progress, repository, **options):
+    """Job function for job_runner.submit(LOG_RETENTION_JOB, ...)."""
+    return compact_logs(repository, progress=progress, **options)
+
+
+# Compact old logs from the command line (or cron): cd api && python -m utils.log_retention
+if __name__ == "__main__":
+    from storage.backends import create_repository
+
+    result = compact_logs(create_repository())
+    print(f"✅ Compacted {result['compacted']} {'/'.join(result['severities'])} logs from before "
+          f"{result['before']} in {result['elapsed_ms']} ms")
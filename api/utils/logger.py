@@ -1,16 +1,180 @@
-from supabase_client import supabase
+import atexit
+import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+# Log rows are queued in-process and written to the "logs" table in batches by
+# a background worker, so request latency never waits on the logs insert.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", 100))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", 2.0))  # seconds
+LOG_OVERFLOW_SAMPLE = int(os.getenv("LOG_OVERFLOW_SAMPLE", 100))  # keep 1 in N when full
+
+_URGENT_SEVERITIES = {"ERROR", "CRITICAL", "WARN", "WARNING"}
+
+_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+_overflow_seen = 0
+_STOP = object()
+_log_sink = None  # callable that bulk-inserts rows, set by create_app()
+
+
 def log_message(message, severity="INFO", service="Backend", route=None):
-    """Logs a message to the database."""
+    """Queues a log message for the background writer."""
+    log_entry = {
+        "message": message,
+        "severity": severity,
+        "service": service,
+        "route": route,  # ✅ Added this to match function calls
+        "created_at": datetime.utcnow().isoformat()
+    }
+    _ensure_worker()
+    _enqueue(log_entry)
+
+
+def set_log_sink(sink):
+    """Sets the function that stores a batch of log rows (e.g. repository.insert_logs)."""
+    global _log_sink
+    _log_sink = sink
+
+
+def flush_logs(timeout=5.0):
+    """Blocks until every queued log entry has been handed to the database."""
+    if _worker is None or not _worker.is_alive():
+        return False
+    done = threading.Event()
+    try:
+        _queue.put(done, timeout=timeout)
+    except queue.Full:
+        return False
+    return done.wait(timeout)
+
+
+def shutdown_logger(timeout=5.0):
+    """Flushes pending entries and stops the background writer."""
+    global _worker
+    worker = _worker
+    if worker is None or not worker.is_alive():
+        return
+    try:
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        print("Logging shutdown: queue still full, pending entries may be lost")
+        return
+    worker.join(timeout)
+    _worker = None
+
+
+def get_log_stats():
+    """Returns counters for the log pipeline (queued, written, dropped, failed)."""
+    with _stats_lock:
+        return {**_stats, "pending": _queue.qsize()}
+
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def _enqueue(log_entry):
+    """Adds an entry without blocking; sheds load when the queue is full."""
+    global _overflow_seen
     try:
-        log_entry = {
-            "message": message,
-            "severity": severity,
-            "service": service,
-            "route": route,  # ✅ Added this to match function calls
-            "created_at": datetime.utcnow().isoformat()
-        }
-        supabase.table("logs").insert(log_entry).execute()
+        _queue.put_nowait(log_entry)
+        _bump("queued")
+        return
+    except queue.Full:
+        pass
+
+    # Queue is full: errors and warnings always get in by evicting the oldest
+    # entry, everything else is sampled at 1 in LOG_OVERFLOW_SAMPLE.
+    with _stats_lock:
+        _overflow_seen += 1
+        keep = (log_entry["severity"] in _URGENT_SEVERITIES
+                or _overflow_seen % LOG_OVERFLOW_SAMPLE == 0)
+    if not keep:
+        _bump("dropped")
+        return
+
+    try:
+        evicted = _queue.get_nowait()
+        if isinstance(evicted, threading.Event) or evicted is _STOP:
+            _queue.put_nowait(evicted)  # never lose control markers
+        else:
+            _bump("dropped")
+        _queue.put_nowait(log_entry)
+        _bump("queued")
+    except (queue.Empty, queue.Full):
+        _bump("dropped")
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="log-writer", daemon=True)
+            _worker.start()
+
+
+def _run_worker():
+    batch = []
+    deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+    reported_drops = 0
+
+    while True:
+        try:
+            item = _queue.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            item = None
+
+        if isinstance(item, dict):
+            batch.append(item)
+            if len(batch) < LOG_BATCH_SIZE and time.monotonic() < deadline:
+                continue
+        elif item is None and time.monotonic() < deadline:
+            continue
+
+        # Size limit reached, interval elapsed, flush requested or stopping.
+        dropped = get_log_stats()["dropped"]
+        if dropped > reported_drops:
+            batch.append({
+                "message": f"Dropped {dropped - reported_drops} log entries: queue full",
+                "severity": "WARN",
+                "service": "Backend",
+                "route": None,
+                "created_at": datetime.utcnow().isoformat()
+            })
+            reported_drops = dropped
+        if batch:
+            _write_batch(batch)
+            batch = []
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+
+        if isinstance(item, threading.Event):
+            item.set()
+        elif item is _STOP:
+            return
+
+
+def _write_batch(batch):
+    """Bulk-inserts a batch of log rows in a single request."""
+    try:
+        if _log_sink is None:
+            raise RuntimeError("no log sink configured")
+        _log_sink(batch)
+        _bump("written", len(batch))
     except Exception as e:
-        print(f"Logging failed: {e}")  # Fallback to console logging
\ No newline at end of file
+        _bump("failed", len(batch))
+        print(f"Logging failed: {e}")  # Fallback to console logging
+        for entry in batch:
+            print(f"[{entry['severity']}] {entry['message']}")
+
+
+atexit.register(shutdown_logger)
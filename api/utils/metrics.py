@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+from flask import g, request
+
+# Histogram bucket upper bounds; override with comma-separated values
+METRICS_LATENCY_BUCKETS = [float(b) for b in os.getenv(
+    "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")]  # seconds
+METRICS_SIZE_BUCKETS = [float(b) for b in os.getenv(
+    "METRICS_SIZE_BUCKETS", "100,1000,10000,100000,1000000,10000000").split(",")]  # bytes
+
+UNMATCHED_ROUTE = "<unmatched>"  # 404s, so random paths can't create new label values
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class RequestMetrics:
+    """Per-route request counts, latency and response size histograms and in-flight gauges.
+
+    Routes are labelled by their URL rule ("/categories/sub/<int:parent_id>"),
+    not the concrete path, so the number of series stays bounded.
+    """
+
+    def __init__(self, latency_buckets=METRICS_LATENCY_BUCKETS, size_buckets=METRICS_SIZE_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self._lock = threading.Lock()
+        self.clear()
+
+    def start(self, method, route):
+        """Marks a request as in flight; pass the return value to finish()."""
+        with self._lock:
+            self._in_flight[(method, route)] = self._in_flight.get((method, route), 0) + 1
+        return time.perf_counter()
+
+    def finish(self, method, route, status, size, started):
+        elapsed = time.perf_counter() - started
+        key = (method, route)
+        with self._lock:
+            self._in_flight[key] -= 1
+            self._requests[(method, route, status)] = self._requests.get((method, route, status), 0) + 1
+            self._latency.setdefault(key, Histogram(self.latency_buckets)).observe(elapsed)
+            if size is not None:
+                self._sizes.setdefault(key, Histogram(self.size_buckets)).observe(size)
+
+    def clear(self):
+        with self._lock:
+            self._in_flight = {}
+            self._requests = {}
+            self._latency = {}
+            self._sizes = {}
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        def labels(method, route):
+            return f'method="{method}",route="{_escape(route)}"'
+
+        with self._lock:
+            lines = ["# HELP http_requests_total Requests handled, by route and status code.",
+                     "# TYPE http_requests_total counter"]
+            lines += [f'http_requests_total{{{labels(method, route)},status="{status}"}} {count}'
+                      for (method, route, status), count in sorted(self._requests.items())]
+
+            lines += ["# HELP http_request_duration_seconds Time from receiving a request to sending its response.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (method, route), histogram in sorted(self._latency.items()):
+                lines += histogram.lines("http_request_duration_seconds", labels(method, route))
+
+            lines += ["# HELP http_response_size_bytes Response body sizes.",
+                      "# TYPE http_response_size_bytes histogram"]
+            for (method, route), histogram in sorted(self._sizes.items()):
+                lines += histogram.lines("http_response_size_bytes", labels(method, route))
+
+            lines += ["# HELP http_requests_in_flight Requests currently being handled.",
+                      "# TYPE http_requests_in_flight gauge"]
+            lines += [f"http_requests_in_flight{{{labels(method, route)}}} {count}"
+                      for (method, route), count in sorted(self._in_flight.items())]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_metrics = RequestMetrics()
+
+
+def install_metrics(app, metrics=request_metrics):
+    """Records every request the Flask app handles in `metrics`."""
+
+    @app.before_request
+    def start_request_metrics():
+        route = request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+        g.metrics = {"route": route, "started": metrics.start(request.method, route)}
+
+    @app.after_request
+    def record_response(response):
+        if "metrics" in g:
+            # Streamed responses have no length up front; they are left out of the size histogram
+            g.metrics.update(status=response.status_code, size=response.calculate_content_length())
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc=None):
+        state = g.pop("metrics", None)
+        if state is not None:
+            # No status means the request died with an unhandled exception
+            metrics.finish(request.method, state["route"], state.get("status", 500), state.get("size"),
+                           state["started"])
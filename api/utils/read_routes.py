@@ -0,0 +1,414 @@
+"""Bodies of the read routes that both servers answer natively.
+
+The Flask blueprints (routes/) and the ASGI app (asgi.py) serve these GET
+routes with the same code: validation, logging and the response all live in
+the bodies below. A body is a generator that yields each repository call and
+gets the call's result back:
+
+    def accounts(repository, args, runner):
+        accounts = yield repository.list_accounts()
+        ...
+        return accounts, 200
+
+SYNC runs bodies for the Flask routes, where the repository blocks and the
+yielded value already is the result. ASYNC runs them in asgi.py, where the
+repository is async: it awaits each yielded awaitable and sends the result
+back in, or throws the exception back in so the body's own try/except
+handles it. `args` is the query string (request.args, or the same MultiDict
+in asgi.py). Bodies return (data, status).
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import jsonify, request
+from storage.backends import get_repository
+from utils.cache import cached_rpc, cached_rpc_async
+from utils.logger import log_message
+
+# Shared pool so concurrent dashboard loads don't each spin up their own threads
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", 8))
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+class SyncRunner:
+    """Runs bodies against a blocking repository (the Flask routes)."""
+
+    cached = staticmethod(cached_rpc)
+
+    def __init__(self, workers=DASHBOARD_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard")
+
+    @staticmethod
+    def _timed(fetch):
+        started = time.perf_counter()
+        try:
+            return {"data": fetch(), "error": None, "elapsed_ms": _elapsed_ms(started)}
+        except Exception as e:
+            return {"data": None, "error": str(e), "elapsed_ms": _elapsed_ms(started)}
+
+    def fetch_all(self, fetches):
+        """Runs every fetch on the pool; {name: {data, error, elapsed_ms}}."""
+        # Each in a copy of the request's context, so their queries count in its trace
+        futures = {
+            name: self._executor.submit(contextvars.copy_context().run, self._timed, fetch)
+            for name, fetch in fetches.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def run(body):
+        try:
+            value = next(body)
+            while True:
+                value = body.send(value)
+        except StopIteration as done:
+            return done.value
+
+
+class AsyncRunner:
+    """Runs bodies against an async repository, on the event loop (asgi.py)."""
+
+    cached = staticmethod(cached_rpc_async)
+
+    @staticmethod
+    async def _timed(fetch):
+        started = time.perf_counter()
+        try:
+            return {"data": await fetch(), "error": None, "elapsed_ms": _elapsed_ms(started)}
+        except Exception as e:
+            return {"data": None, "error": str(e), "elapsed_ms": _elapsed_ms(started)}
+
+    async def fetch_all(self, fetches):
+        """Awaits every fetch concurrently; {name: {data, error, elapsed_ms}}."""
+        results = await asyncio.gather(*(self._timed(fetch) for fetch in fetches.values()))
+        return dict(zip(fetches, results))
+
+    @staticmethod
+    async def run(body):
+        try:
+            pending = next(body)
+            while True:
+                try:
+                    value = await pending
+                except Exception as e:
+                    pending = body.throw(e)
+                else:
+                    pending = body.send(value)
+        except StopIteration as done:
+            return done.value
+
+
+SYNC = SyncRunner()
+ASYNC = AsyncRunner()
+
+
+def _month_year(args):
+    return args.get("month", type=int), args.get("year", type=int)
+
+
+# -------------------------------------------
+# ✅ Accounts & categories
+# -------------------------------------------
+def accounts(repository, args, runner):
+    """Fetch all accounts."""
+    try:
+        accounts = yield repository.list_accounts()
+        log_message("Fetched all accounts successfully", "INFO", "Backend", "Accounts Route")
+        return accounts, 200
+    except Exception as e:
+        log_message(f"Error fetching accounts: {str(e)}", "ERROR", "Backend", "Accounts Route")
+        return {"error": str(e)}, 500
+
+
+def categories(repository, args, runner):
+    """Fetch all categories."""
+    try:
+        categories = yield repository.list_categories()
+        log_message("Fetched all categories successfully", "INFO", "Backend", "Categories Route")
+        return categories, 200
+    except Exception as e:
+        log_message(f"Error fetching categories: {str(e)}", "ERROR", "Backend", "Categories Route")
+        return {"error": str(e)}, 500
+
+
+def main_categories(repository, args, runner):
+    """Fetch only main categories (categories without a parent_id)."""
+    try:
+        categories = yield repository.list_main_categories()
+        log_message("Fetched main categories successfully", "INFO", "Backend", "Categories Route")
+        return categories, 200
+    except Exception as e:
+        log_message(f"Error fetching main categories: {str(e)}", "ERROR", "Backend", "Categories Route")
+        return {"error": str(e)}, 500
+
+
+def subcategories(repository, args, runner, main_category_id):
+    """Fetch subcategories for a given main category."""
+    try:
+        categories = yield repository.list_subcategories(main_category_id)
+        log_message(f"Fetched subcategories for main category {main_category_id}", "INFO", "Backend", "Categories Route")
+        return categories, 200
+    except Exception as e:
+        log_message(f"Error fetching subcategories for main category {main_category_id}: {str(e)}", "ERROR", "Backend", "Categories Route")
+        return {"error": str(e)}, 500
+
+
+# -------------------------------------------
+# ✅ Transactions
+# -------------------------------------------
+def transactions(repository, args, runner):
+    """Fetch all transactions."""
+    try:
+        transactions = yield repository.list_transactions()
+        log_message("Fetched all transactions successfully", "INFO", "Backend", "Transactions Route")
+        return transactions, 200
+    except Exception as e:
+        log_message(f"Error fetching transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
+        return {"error": str(e)}, 500
+
+
+def unprocessed_transactions(repository, args, runner):
+    """Fetch transactions that have NOT been categorized and are NOT ignored."""
+    try:
+        transactions = yield repository.list_unprocessed_transactions()
+        log_message("Fetched unprocessed transactions successfully", "INFO", "Backend", "Transactions Route")
+        return transactions, 200
+    except Exception as e:
+        log_message(f"Error fetching unprocessed transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
+        return {"error": str(e)}, 500
+
+
+def processed_transactions(repository, args, runner):
+    """Fetch transactions that have been categorized OR ignored."""
+    try:
+        transactions = yield repository.list_processed_transactions()
+
+        if not transactions:
+            log_message("No processed transactions found.", "INFO", "Backend", "Transactions Route")
+            return {"message": "No processed transactions found"}, 200
+
+        log_message(f"Fetched {len(transactions)} processed transactions successfully", "INFO", "Backend", "Transactions Route")
+        return transactions, 200
+    except Exception as e:
+        log_message(f"Exception occurred while fetching processed transactions: {str(e)}", "ERROR", "Backend", "Transactions Route")
+        return {"error": str(e)}, 500
+
+
+# -------------------------------------------
+# ✅ Budgets & summaries (per-month RPCs are cached, see utils/cache.py)
+# -------------------------------------------
+def budgets(repository, args, runner):
+    """Fetch budgets for a given month and year."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        budgets = yield repository.list_budgets(month, year)
+        log_message("Fetched budgets successfully", "INFO", "/budgets")
+        return budgets, 200
+    except Exception as e:
+        log_message(f"Error fetching budgets: {str(e)}", "ERROR", "/budgets")
+        return {"error": str(e)}, 500
+
+
+def regular_budgets(repository, args, runner):
+    """Fetch budgets outside the reserve (id 9) hierarchy, with category and parent names, in one query."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        budgets = (yield runner.cached(
+            "fetch_regular_budgets", month, year, lambda: repository.fetch_regular_budgets(month, year)
+        )) or []
+        log_message(f"Fetched {len(budgets)} regular budgets", "INFO", "/budgets/regular")
+        return budgets, 200
+    except Exception as e:
+        log_message(f"Error fetching regular budgets: {str(e)}", "ERROR", "/budgets/regular")
+        return {"error": str(e)}, 500
+
+
+def reserve_budgets(repository, args, runner):
+    """Fetch budgets on the reserve category (id 9) and its children."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        budgets = (yield runner.cached(
+            "fetch_reserve_budgets", month, year, lambda: repository.fetch_reserve_budgets(month, year)
+        )) or []
+        log_message(f"Fetched {len(budgets)} reserve budgets", "INFO", "/budgets/reserve")
+        return budgets, 200
+    except Exception as e:
+        log_message(f"Unexpected error fetching reserve budgets: {str(e)}", "ERROR", "/budgets/reserve")
+        return {"error": str(e)}, 500
+
+
+def all_budgets(repository, args, runner):
+    """Fetch all budgets (regular and reserve) using unified SQL function."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        data = yield runner.cached("fetch_all_budgets", month, year, lambda: repository.fetch_all_budgets(month, year))
+        return data, 200
+    except Exception as e:
+        log_message(f"Unexpected error fetching all budgets: {str(e)}", "ERROR", "/budgets/all")
+        return {"error": str(e)}, 500
+
+
+def regular_summary(repository, args, runner):
+    """Fetch spending summary for regular budgets."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        data = yield runner.cached(
+            "fetch_regular_summary", month, year, lambda: repository.fetch_regular_summary(month, year)
+        )
+        log_message("Fetched regular summary successfully", "INFO", "/summary/regular")
+        return data, 200
+    except Exception as e:
+        log_message(f"Error fetching regular summary: {str(e)}", "ERROR", "/summary/regular")
+        return {"error": str(e)}, 500
+
+
+def reserve_summary(repository, args, runner):
+    """Fetch spending summary for reserve budgets."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+
+        data = yield runner.cached(
+            "fetch_reserve_summary", month, year, lambda: repository.fetch_reserve_summary(month, year)
+        )
+        log_message("Fetched reserve summary successfully", "INFO", "/summary/reserve")
+        return data, 200
+    except Exception as e:
+        log_message(f"Error fetching reserve summary: {str(e)}", "ERROR", "/summary/reserve")
+        return {"error": str(e)}, 500
+
+
+def summary(repository, args, runner):
+    """Fetch transaction summary for a given month and year."""
+    try:
+        month, year = _month_year(args)
+        if not month or not year:
+            log_message("Missing month or year in summary request", "WARN", "Backend", "Summary Route")
+            return {"error": "Month and year are required"}, 400
+
+        # ✅ Categorized transactions with main and subcategory names
+        data = yield runner.cached("fetch_summary", month, year, lambda: repository.fetch_summary(month, year))
+
+        if data is None:
+            log_message("No summary data found", "INFO", "Backend", "Summary Route")
+            return [], 200
+
+        log_message(f"Fetched summary for {month}/{year}", "INFO", "Backend", "Summary Route")
+        return data, 200
+    except Exception as e:
+        log_message(f"Error fetching summary: {str(e)}", "ERROR", "Backend", "Summary Route")
+        return {"error": str(e)}, 500
+
+
+# ✅ scope query param of /summary/rollup -> reserve argument of fetch_summary_rollup
+SUMMARY_ROLLUP_SCOPES = {"all": None, "regular": False, "reserve": True}
+
+
+def summary_rollup(repository, args, runner):
+    """Summary rows read from the monthly rollups: ?scope=all (default), regular or reserve."""
+    try:
+        month, year = _month_year(args)
+        scope = args.get("scope", "all")
+        if not month or not year:
+            return {"error": "Missing month or year parameters"}, 400
+        if scope not in SUMMARY_ROLLUP_SCOPES:
+            return {"error": f"scope must be one of {', '.join(SUMMARY_ROLLUP_SCOPES)}"}, 400
+
+        reserve = SUMMARY_ROLLUP_SCOPES[scope]
+        data = yield runner.cached(
+            f"fetch_summary_rollup:{scope}", month, year,
+            lambda: repository.fetch_summary_rollup(month, year, reserve=reserve),
+        )
+        log_message(f"Fetched {scope} summary rollup for {month}/{year}", "INFO", "Backend", "Summary Route")
+        return data, 200
+    except Exception as e:
+        log_message(f"Error fetching summary rollup: {str(e)}", "ERROR", "Backend", "Summary Route")
+        return {"error": str(e)}, 500
+
+
+# -------------------------------------------
+# ✅ Dashboard: every part fetched concurrently
+# -------------------------------------------
+def dashboard(repository, args, runner):
+    """Fetch budgets, summaries, categories and accounts concurrently; 207 if some of them failed, 502 if all did."""
+    month, year = _month_year(args)
+    if not month or not year:
+        return {"error": "Missing month or year parameters"}, 400
+
+    fetches = {
+        "budgets": lambda: runner.cached(
+            "fetch_all_budgets", month, year, lambda: repository.fetch_all_budgets(month, year)),
+        "regular_summary": lambda: runner.cached(
+            "fetch_regular_summary", month, year, lambda: repository.fetch_regular_summary(month, year)),
+        "reserve_summary": lambda: runner.cached(
+            "fetch_reserve_summary", month, year, lambda: repository.fetch_reserve_summary(month, year)),
+        "categories": repository.list_categories,
+        "accounts": repository.list_accounts,
+    }
+    started = time.perf_counter()
+    parts = yield runner.fetch_all(fetches)
+    elapsed_ms = _elapsed_ms(started)
+
+    errors = {name: part["error"] for name, part in parts.items() if part["error"]}
+    if errors:
+        log_message(f"Dashboard {month}/{year} partially failed: {errors}", "ERROR", "Backend", "Dashboard Route")
+    else:
+        log_message(f"Fetched dashboard for {month}/{year} in {elapsed_ms} ms", "INFO", "Backend", "Dashboard Route")
+
+    return {
+        "month": month,
+        "year": year,
+        **{name: part["data"] for name, part in parts.items()},
+        "timings_ms": {name: part["elapsed_ms"] for name, part in parts.items()},
+        "errors": errors,
+        "elapsed_ms": elapsed_ms,
+    }, 200 if not errors else 207 if len(errors) < len(parts) else 502
+
+
+# Path (Flask rule syntax) -> body, for the routes asgi.py serves natively
+READ_ROUTES = {
+    "/accounts": accounts,
+    "/categories": categories,
+    "/categories/main": main_categories,
+    "/categories/sub/<int:main_category_id>": subcategories,
+    "/transactions": transactions,
+    "/unprocessed-transactions": unprocessed_transactions,
+    "/processed-transactions": processed_transactions,
+    "/budgets": budgets,
+    "/budgets/regular": regular_budgets,
+    "/budgets/reserve": reserve_budgets,
+    "/budgets/all": all_budgets,
+    "/summary": summary,
+    "/summary/regular": regular_summary,
+    "/summary/reserve": reserve_summary,
+    "/summary/rollup": summary_rollup,
+    "/dashboard": dashboard,
+}
+
+
+def respond(body, **params):
+    """Runs a body for a Flask route on the current app's repository; returns a Flask response."""
+    data, status = SYNC.run(body(get_repository(), request.args, SYNC, **params))
+    return jsonify(data), status
@@ -0,0 +1,62 @@
+import os
+import time
+
+from utils.helpers import use_repo_root
+
+# category_rules.py lives at the repo root so plaid_sync.py can share it
+use_repo_root()
+
+from category_rules import compile_rules, validate_rule  # noqa: E402,F401
+from utils.cache import invalidate_transaction_months  # noqa: E402
+
+RULES_PAGE_SIZE = int(os.getenv("RULES_PAGE_SIZE", 1000))
+
+RULES_APPLY_JOB = "rules_apply"
+
+
+def reapply_rules(repository, page_size=RULES_PAGE_SIZE, progress=None):
+    """Runs the enabled rules over every uncategorized transaction in one keyset pass.
+
+    Each page of matches is written with a single bulk update. Transactions
+    that already have a category are never touched.
+    """
+    started = time.perf_counter()
+    engine = compile_rules(repository.list_category_rules())
+    scanned, categorized, after = 0, 0, None
+
+    while len(engine):
+        page = repository.list_uncategorized_transactions(after=after, limit=page_size)
+        scanned += len(page)
+        updates = engine.categorize(page)
+        if updates:
+            updated = repository.bulk_update_transactions(
+                [{"transaction_id": transaction_id, **update} for transaction_id, update in updates.items()]
+            )
+            invalidate_transaction_months(updated)
+            categorized += len(updated)
+        if progress:
+            progress("categorizing", scanned=scanned, categorized=categorized)
+        if len(page) < page_size:
+            break
+        after = page[-1]["transaction_id"]
+
+    return {
+        "rules": len(engine),
+        "scanned": scanned,
+        "categorized": categorized,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def run_rules_apply(progress, repository, **options):
+    """Job function for job_runner.submit(RULES_APPLY_JOB, ...)."""
+    return reapply_rules(repository, progress=progress, **options)
+
+
+# Re-apply the rules to history from the command line: cd api && python -m utils.rules
+if __name__ == "__main__":
+    from storage.backends import create_repository
+
+    result = reapply_rules(create_repository())
+    print(f"✅ Categorized {result['categorized']} of {result['scanned']} transactions "
+          f"with {result['rules']} rules in {result['elapsed_ms']} ms")
@@ -0,0 +1,54 @@
+from flask import g, request
+
+from utils.helpers import use_repo_root
+from utils.logger import log_message
+
+# query_tracer.py lives at the repo root so plaid_sync.py can share it
+use_repo_root()
+
+from query_tracer import QUERY_BUDGET, begin_trace, end_trace  # noqa: E402
+
+
+def trace_headers(trace):
+    """X-Query-Count and Server-Timing headers summing up a request's trace."""
+    totals = trace.totals()
+    return {
+        "X-Query-Count": str(totals["queries"]),
+        "Server-Timing": f'db;dur={totals["duration_ms"]};desc="{totals["queries"]} queries"',
+    }
+
+
+def report_trace(trace):
+    """Logs the trace's over-budget and N+1 warnings."""
+    for warning in trace.warnings():
+        print(f"⚠️ {warning}")
+        log_message(warning, "WARN", "Backend", "Query Tracer")
+
+
+def install_query_tracing(app, budget=QUERY_BUDGET):
+    """Traces the backend queries of every request and warns about heavy ones.
+
+    Responses carry X-Query-Count and a Server-Timing "db" entry. Requests
+    over `budget` queries, or repeating one query shape (N+1), are logged as
+    warnings.
+    """
+
+    @app.before_request
+    def start_query_trace():
+        route = request.url_rule.rule if request.url_rule else request.path
+        g.query_trace, g.query_trace_token = begin_trace(f"{request.method} {route}", budget)
+
+    @app.after_request
+    def add_query_headers(response):
+        trace = g.get("query_trace")
+        if trace is not None:
+            response.headers.update(trace_headers(trace))
+        return response
+
+    @app.teardown_request
+    def finish_query_trace(exc=None):
+        token = g.pop("query_trace_token", None)
+        if token is None:
+            return
+        end_trace(token)
+        report_trace(g.query_trace)
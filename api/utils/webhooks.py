@@ -0,0 +1,154 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+# Plaid signs every webhook with a JWT in the Plaid-Verification header; the
+# signing key is fetched from Plaid by key id and cached.
+# https://plaid.com/docs/api/webhooks/webhook-verification/
+PLAID_ENV = os.getenv("PLAID_ENV_URL", "https://sandbox.plaid.com")
+PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
+PLAID_SECRET = os.getenv("PLAID_SECRET")
+WEBHOOK_MAX_AGE = int(os.getenv("PLAID_WEBHOOK_MAX_AGE", 300))  # seconds, Plaid recommends 5 minutes
+UNKNOWN_KEY_TTL = int(os.getenv("PLAID_WEBHOOK_UNKNOWN_KEY_TTL", 300))  # seconds a rejected kid is remembered
+KEY_FETCHES_PER_MINUTE = int(os.getenv("PLAID_WEBHOOK_KEY_FETCHES_PER_MINUTE", 10))
+_UNKNOWN_KEYS_MAX = 1024
+
+
+class WebhookVerificationError(Exception):
+    """Raised when a webhook's signature, age or body hash does not check out."""
+
+
+class VerificationKeyUnavailable(WebhookVerificationError):
+    """Plaid could not be asked for the signing key right now (network error or lookup limit).
+
+    The webhook may well be genuine, so the route answers 503 and Plaid retries it.
+    """
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _public_key(jwk):
+    """EC P-256 public key from a JWK as returned by /webhook_verification_key/get."""
+    x = int.from_bytes(_b64decode(jwk["x"]), "big")
+    y = int.from_bytes(_b64decode(jwk["y"]), "big")
+    return ec.EllipticCurvePublicNumbers(x, y, ec.SECP256R1()).public_key()
+
+
+class PlaidWebhookVerifier:
+    """Checks the Plaid-Verification JWT of incoming webhooks."""
+
+    def __init__(self, plaid_url=PLAID_ENV, client_id=PLAID_CLIENT_ID, secret=PLAID_SECRET,
+                 max_age=WEBHOOK_MAX_AGE, unknown_key_ttl=UNKNOWN_KEY_TTL, fetches_per_minute=KEY_FETCHES_PER_MINUTE):
+        self.plaid_url = plaid_url
+        self.client_id = client_id
+        self.secret = secret
+        self.max_age = max_age
+        self.unknown_key_ttl = unknown_key_ttl
+        self.fetches_per_minute = fetches_per_minute
+        self._keys = {}  # kid -> public key
+        self._unknown = {}  # kid -> monotonic time until which it is rejected without asking Plaid
+        self._fetches = deque()  # monotonic times of recent key lookups
+        self._lock = threading.Lock()
+
+    def _fetch_key(self, kid):
+        try:
+            response = requests.post(
+                f"{self.plaid_url}/webhook_verification_key/get",
+                json={"client_id": self.client_id, "secret": self.secret, "key_id": kid},
+                timeout=10,
+            )
+        except requests.RequestException as e:
+            raise VerificationKeyUnavailable(f"Could not reach Plaid for verification key {kid}: {e}")
+        if response.status_code >= 500:
+            raise VerificationKeyUnavailable(f"Plaid returned {response.status_code} for verification key {kid}")
+        if response.status_code != 200:
+            return None
+        try:
+            jwk = response.json()["key"]
+            if jwk.get("expired_at"):
+                return None
+            return _public_key(jwk)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise VerificationKeyUnavailable(f"Unexpected response for verification key {kid}")
+
+    def _reserve_fetch(self, kid):
+        """Rejects kids Plaid recently refused, and caps lookups so random kids can't fan out to Plaid."""
+        now = time.monotonic()
+        with self._lock:
+            if self._unknown.get(kid, 0) > now:
+                raise WebhookVerificationError(f"Unknown or expired verification key {kid}")
+            while self._fetches and now - self._fetches[0] > 60:
+                self._fetches.popleft()
+            if len(self._fetches) >= self.fetches_per_minute:
+                raise VerificationKeyUnavailable("Too many verification key lookups, try again later")
+            self._fetches.append(now)
+
+    def _remember_unknown(self, kid):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._unknown) >= _UNKNOWN_KEYS_MAX:
+                self._unknown = {k: until for k, until in self._unknown.items() if until > now}
+            if len(self._unknown) < _UNKNOWN_KEYS_MAX:
+                self._unknown[kid] = now + self.unknown_key_ttl
+
+    def _key(self, kid):
+        with self._lock:
+            key = self._keys.get(kid)
+        if key is None:
+            self._reserve_fetch(kid)
+            key = self._fetch_key(kid)
+            if key is None:
+                self._remember_unknown(kid)
+                raise WebhookVerificationError(f"Unknown or expired verification key {kid}")
+            with self._lock:
+                self._keys[kid] = key
+        return key
+
+    def verify(self, body, token):
+        """Raises WebhookVerificationError unless `token` signs exactly this raw `body`."""
+        if not token:
+            raise WebhookVerificationError("Missing Plaid-Verification header")
+        try:
+            header_segment, claims_segment, signature_segment = token.split(".")
+            header = json.loads(_b64decode(header_segment))
+            claims = json.loads(_b64decode(claims_segment))
+            signature = _b64decode(signature_segment)
+        except ValueError:
+            raise WebhookVerificationError("Malformed Plaid-Verification token")
+
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise WebhookVerificationError("Malformed Plaid-Verification token")
+        if header.get("alg") != "ES256" or not header.get("kid") or not isinstance(header["kid"], str):
+            raise WebhookVerificationError("Unexpected token algorithm")
+        if len(signature) != 64:
+            raise WebhookVerificationError("Malformed token signature")
+
+        # JWS carries the raw r || s pair; cryptography expects DER
+        der = encode_dss_signature(int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big"))
+        try:
+            self._key(header["kid"]).verify(
+                der, f"{header_segment}.{claims_segment}".encode(), ec.ECDSA(hashes.SHA256())
+            )
+        except InvalidSignature:
+            raise WebhookVerificationError("Invalid webhook signature")
+
+        issued_at = claims.get("iat", 0)
+        if isinstance(issued_at, bool) or not isinstance(issued_at, (int, float)):
+            raise WebhookVerificationError("Malformed token issue time")
+        if time.time() - issued_at > self.max_age:
+            raise WebhookVerificationError("Webhook is too old")
+        if not hmac.compare_digest(hashlib.sha256(body).hexdigest(), str(claims.get("request_body_sha256"))):
+            raise WebhookVerificationError("Webhook body does not match its signature")
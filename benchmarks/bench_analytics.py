@@ -0,0 +1,109 @@
+"""Times the /analytics computations on synthetic transactions.
+
+    python benchmarks/bench_analytics.py --rows 3000000
+
+Prints one JSON object with timings in milliseconds. The baseline is the
+current approach of aggregating one month at a time in Python, as a client
+calling /summary for each month of the range would.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from utils.analytics import SpendingFrame, budget_variance, month_index, trends  # noqa: E402
+
+
+def synthetic_columns(rows, seed=0, years=5, categories=12, subcategories=60):
+    """Column lists shaped like load_transaction_columns(), drawn from a seeded generator."""
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, years * 365, rows)
+    dates = (np.datetime64("2021-01-01") + days).astype(str)
+    subcategory = rng.integers(categories + 1, categories + subcategories + 1, rows)
+    return {
+        "date": dates.tolist(),
+        "amount": np.round(rng.gamma(2.0, 30.0, rows), 2).tolist(),
+        "user_category_id": (subcategory % categories + 1).tolist(),
+        "user_subcategory_id": np.where(rng.random(rows) < 0.9, subcategory, None).tolist(),
+    }
+
+
+def synthetic_budgets(first, last, subcategories=range(13, 73)):
+    budgets = []
+    for month in range(first, last + 1):
+        year, month_of_year = divmod(month, 12)
+        for category_id in subcategories:
+            budgets.append({"year": year + 1970, "month": month_of_year + 1,
+                            "category_id": category_id, "budgeted_amount": 500})
+    return budgets
+
+
+def python_monthly_totals(columns, first, last):
+    """Baseline: one pass over every row per month, summing by category."""
+    totals = []
+    for month in range(first, last + 1):
+        year, month_of_year = divmod(month, 12)
+        prefix = f"{year + 1970:04d}-{month_of_year + 1:02d}"
+        sums = defaultdict(float)
+        for date, amount, category_id in zip(columns["date"], columns["amount"], columns["user_category_id"]):
+            if date.startswith(prefix):
+                sums[category_id] += amount
+        totals.append(sums)
+    return totals
+
+
+def timed(fn, repeat=3):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline-months", type=int, default=3,
+                        help="months timed for the Python baseline (it is slow), scaled up to --months")
+    args = parser.parse_args()
+
+    columns = synthetic_columns(args.rows, seed=args.seed)
+    last = month_index(2025, 12)
+    first = last - args.months + 1
+    budgets = synthetic_budgets(first, last)
+
+    load_ms, frame = timed(lambda: SpendingFrame.from_columns(columns), repeat=1)
+    trends_ms, _ = timed(lambda: trends(frame, first, last, window=3))
+    trends_sub_ms, _ = timed(lambda: trends(frame, first, last, by="subcategory", window=6))
+    variance_ms, _ = timed(lambda: budget_variance(frame, budgets, first, last))
+
+    baseline_ms, _ = timed(
+        lambda: python_monthly_totals(columns, last - args.baseline_months + 1, last), repeat=1
+    )
+    baseline_ms = round(baseline_ms * args.months / args.baseline_months, 2)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "months": args.months,
+        "seed": args.seed,
+        "load_ms": load_ms,
+        "trends_by_category_ms": trends_ms,
+        "trends_by_subcategory_ms": trends_sub_ms,
+        "budget_variance_ms": variance_ms,
+        "python_per_month_baseline_ms": baseline_ms,
+        "speedup_vs_baseline": round(baseline_ms / trends_ms, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
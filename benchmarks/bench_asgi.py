@@ -0,0 +1,156 @@
+"""Compares the Flask server with the ASGI app (api/asgi.py) under concurrent load.
+
+    python benchmarks/bench_asgi.py --requests 2000 --concurrency 200 --latency-ms 50
+
+Both servers talk to a local PostgREST stand-in that answers every query
+after --latency-ms, the way a remote Supabase project would. The Flask app
+runs on Werkzeug's threaded server (what `python app.py` uses) with the sync
+client; the ASGI app runs on uvicorn with the async client. The stand-in,
+the server under test and the load generator each get their own process.
+Prints one JSON object with throughput, latency percentiles and the server's
+peak thread count for each.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(BENCH_DIR), "api")
+sys.path.insert(0, API_DIR)
+
+import loadgen  # noqa: E402
+from postgrest_stand_in import SERVICE_KEY, serve  # noqa: E402
+
+ROUTES = ["/accounts", "/categories", "/transactions", "/unprocessed-transactions", "/budgets?month=3&year=2025"]
+
+
+def synthetic_tables(rows, rng):
+    return {
+        "accounts": [{"id": i, "account_id": f"acc-{i}", "name": f"Account {i}"} for i in range(5)],
+        "categories": [{"id": i, "name": f"Category {i}", "parent_id": None if i < 10 else i % 10}
+                       for i in range(1, 60)],
+        "transactions": [
+            {"transaction_id": f"tx-{i}", "date": f"2025-03-{i % 28 + 1:02d}", "name": f"Merchant {i % 300}",
+             "amount": round(rng.uniform(1, 300), 2), "user_category_id": None}
+            for i in range(rows)
+        ],
+        "budgets": [{"id": i, "month": 3, "year": 2025, "category_id": i, "budgeted_amount": 100}
+                    for i in range(1, 40)],
+    }
+
+
+# -------------------------------------------
+# ✅ Servers under test (each runs in a child process)
+# -------------------------------------------
+def serve_flask(backend_url, ready):
+    from supabase import create_client
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from storage.supabase_repository import SupabaseRepository
+
+    app = create_app(repository=SupabaseRepository(create_client(backend_url, SERVICE_KEY)))
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    ready.put(server.server_port)
+    server.serve_forever()
+
+
+def serve_asgi(backend_url, ready):
+    import uvicorn
+    from supabase import acreate_client, create_client
+
+    from app import create_app
+    from asgi import AsyncAPI
+    from storage.async_repository import AsyncSupabaseRepository
+    from storage.supabase_repository import SupabaseRepository
+
+    async def main():
+        api = AsyncAPI(
+            create_app(repository=SupabaseRepository(create_client(backend_url, SERVICE_KEY))),
+            AsyncSupabaseRepository(await acreate_client(backend_url, SERVICE_KEY)),
+        )
+        server = uvicorn.Server(uvicorn.Config(api, port=0, log_level="warning", backlog=2048))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        ready.put(server.servers[0].sockets[0].getsockname()[1])
+        await serving
+
+    asyncio.run(main())
+
+
+def start_process(target, *args):
+    """Starts `target(*args, ready)` in a child process and returns (process, value it put on ready)."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=target, args=(*args, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=60)
+
+
+def thread_count(pid):
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            return next(int(line.split()[1]) for line in status if line.startswith("Threads:"))
+    except (OSError, StopIteration):
+        return None  # not Linux
+
+
+def bench(serve_target, backend_url, args):
+    process, port = start_process(serve_target, backend_url)
+    peak, done = thread_count(process.pid), threading.Event()
+
+    def sample_threads():
+        nonlocal peak
+        while not done.wait(0.05):
+            count = thread_count(process.pid)
+            peak = max(peak, count) if count is not None else None
+
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+    rng = random.Random(args.seed)
+    requests = [(path, "GET", path, None) for path in (rng.choice(ROUTES) for _ in range(args.requests))]
+    try:
+        results, elapsed = asyncio.run(loadgen.run("127.0.0.1", port, requests, args.concurrency))
+    finally:
+        done.set()
+        sampler.join()
+        process.terminate()
+    return {**loadgen.summarize(results, elapsed), "server_peak_threads": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50, help="delay of every PostgREST stand-in response")
+    parser.add_argument("--rows", type=int, default=200, help="transactions served by the stand-in")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tables = synthetic_tables(args.rows, random.Random(args.seed))
+    stand_in, backend_url = start_process(serve, tables, {}, args.latency_ms / 1000)
+    try:
+        flask = bench(serve_flask, backend_url, args)
+        asgi = bench(serve_asgi, backend_url, args)
+    finally:
+        stand_in.terminate()
+
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "backend_latency_ms": args.latency_ms,
+        "rows": args.rows,
+        "seed": args.seed,
+        "flask_threaded": flask,
+        "asgi_uvicorn": asgi,
+        "throughput_ratio": round(asgi["throughput_rps"] / flask["throughput_rps"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Bytes on the wire and server CPU per request for JSON responses, before and after orjson + gzip.
+
+    python benchmarks/bench_json.py --rows 10000 --iterations 50
+
+Seeds a SQLite backend with --rows synthetic transactions and requests each
+route through Flask's test client in three configurations:
+
+- before: Flask's standard JSON encoder, no compression
+- orjson: FastJSONProvider (utils/json_provider.py), no compression
+- orjson_gzip: FastJSONProvider, client sends Accept-Encoding: gzip
+
+CPU is process time per request, so it covers routing, the SQLite read,
+encoding and compression, but not network transfer. Prints one JSON object.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "api"))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import create_app  # noqa: E402
+from load_test import YEAR, synthetic_tables  # noqa: E402
+from storage.sqlite_repository import SQLiteRepository  # noqa: E402
+from utils.json_provider import FastJSONProvider  # noqa: E402
+
+ROUTES = ["/transactions", "/categories", f"/budgets/all?month=1&year={YEAR}"]
+CONFIGURATIONS = {
+    "before": (DefaultJSONProvider, {}),
+    "orjson": (FastJSONProvider, {}),
+    "orjson_gzip": (FastJSONProvider, {"Accept-Encoding": "gzip"}),
+}
+
+
+def measure(client, path, headers, iterations):
+    client.get(path, headers=headers)  # warm caches
+    started = time.process_time()
+    for _ in range(iterations):
+        response = client.get(path, headers=headers)
+    cpu_ms = (time.process_time() - started) * 1000 / iterations
+    return {"bytes": len(response.get_data()), "cpu_ms_per_request": round(cpu_ms, 3),
+            "content_encoding": response.headers.get("Content-Encoding")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repository = SQLiteRepository(os.path.join(workdir, "bench.db"))
+        for table, rows in synthetic_tables(args.rows, random.Random(args.seed)).items():
+            repository.upsert_rows(table, rows)
+        app = create_app(repository=repository)
+        client = app.test_client()
+
+        results = {}
+        for name, (provider, headers) in CONFIGURATIONS.items():
+            app.json = provider(app)
+            results[name] = {path: measure(client, path, headers, args.iterations) for path in ROUTES}
+
+    before = results["before"]
+    print(json.dumps({
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "seed": args.seed,
+        "results": results,
+        "after_vs_before": {
+            path: {
+                "bytes_ratio": round(results["orjson_gzip"][path]["bytes"] / before[path]["bytes"], 3),
+                "cpu_ratio": round(results["orjson_gzip"][path]["cpu_ms_per_request"]
+                                   / before[path]["cpu_ms_per_request"], 3),
+            }
+            for path in ROUTES
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
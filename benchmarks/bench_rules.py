@@ -0,0 +1,87 @@
+"""Times compiling category rules and matching them against synthetic transactions.
+
+    python benchmarks/bench_rules.py --rows 1000000 --rules 500
+
+Prints one JSON object with timings in milliseconds, next to a baseline that
+checks every rule against every transaction with plain substring tests.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from category_rules import compile_rules  # noqa: E402
+
+
+def synthetic_rules(count, rng):
+    return [
+        {"id": i + 1, "merchant_contains": f"merchant {i:04d}", "user_category_id": rng.randint(1, 40),
+         "priority": rng.randint(0, 3)}
+        for i in range(count)
+    ]
+
+
+def synthetic_transactions(rows, merchants, rng):
+    return [
+        {"transaction_id": f"tx-{i}", "name": f"POS MERCHANT {rng.randrange(merchants * 2):04d} #{i % 97}",
+         "merchant_name": None, "amount": round(rng.uniform(1, 300), 2), "account_id": "acc"}
+        for i in range(rows)
+    ]
+
+
+def naive_categorize(rules, transactions):
+    rules = sorted(rules, key=lambda rule: (-rule["priority"], rule["id"]))
+    updates = {}
+    for transaction in transactions:
+        text = transaction["name"].lower()
+        for rule in rules:
+            if rule["merchant_contains"] in text:
+                updates[transaction["transaction_id"]] = rule["user_category_id"]
+                break
+    return updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline-rows", type=int, default=20_000,
+                        help="rows timed for the naive baseline (it is slow), scaled up to --rows")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = synthetic_rules(args.rules, rng)
+    transactions = synthetic_transactions(args.rows, args.rules, rng)
+
+    started = time.perf_counter()
+    engine = compile_rules(rules)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    updates = engine.categorize(transactions)
+    categorize_ms = (time.perf_counter() - started) * 1000
+
+    sample = transactions[:args.baseline_rows]
+    started = time.perf_counter()
+    naive_categorize(rules, sample)
+    baseline_ms = (time.perf_counter() - started) * 1000 * len(transactions) / max(len(sample), 1)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "rules": args.rules,
+        "seed": args.seed,
+        "matched": len(updates),
+        "compile_ms": round(compile_ms, 2),
+        "categorize_ms": round(categorize_ms, 2),
+        "rows_per_second": round(args.rows / (categorize_ms / 1000)),
+        "naive_baseline_ms": round(baseline_ms, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Times the Plaid sync and duplicate detection stages on seeded synthetic transactions.
+
+    python benchmarks/bench_sync.py --sizes 10000,100000,1000000,10000000 --store-rows 2000
+
+For every size, streams that many rows from synthetic.generate_transactions()
+in chunks and times:
+
+- transform: plaid_sync.transaction_row() on every row
+- store_transactions: plaid_sync.store_transactions() on the first
+  --store-rows rows, against the local PostgREST stand-in with --latency-ms
+  per call (it makes several calls per row, so it is not run at full size)
+- find_duplicates / flag_duplicates: get_transactions.find_duplicate_transactions()
+  and flag_duplicate_transactions() on a SQLite copy of all rows
+
+Prints one JSON object with seconds and rows per second for each stage.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+import synthetic  # noqa: E402
+from bench_asgi import start_process  # noqa: E402
+from postgrest_stand_in import SERVICE_KEY, serve  # noqa: E402
+
+CHUNK_ROWS = 100_000
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def rate(rows, seconds):
+    return round(rows / seconds) if seconds else None
+
+
+def bench_size(rows, args, plaid_sync, get_transactions, workdir):
+    generate_s = transform_s = load_s = 0.0
+    store_sample = []
+
+    path = os.path.join(workdir, f"transactions_{rows}.db")
+    conn = synthetic.create_sqlite(path)
+    generator = synthetic.generate_transactions(rows, seed=args.seed)
+    while True:
+        chunk, seconds = timed(lambda: list(itertools.islice(generator, CHUNK_ROWS)))
+        if not chunk:
+            break
+        generate_s += seconds
+        transform_s += timed(lambda: [plaid_sync.transaction_row(tx) for tx in chunk])[1]
+        load_s += timed(synthetic.insert_sqlite, conn, chunk)[1]
+        if len(store_sample) < args.store_rows:
+            store_sample += chunk[:args.store_rows - len(store_sample)]
+    conn.close()
+
+    # store_transactions prints a line per row; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        stored, store_s = timed(plaid_sync.store_transactions, store_sample, plaid_sync.compile_rules([]))
+
+    get_transactions.DATABASE_FILE = path
+    duplicates, find_s = timed(get_transactions.find_duplicate_transactions)
+    (pairs, flagged), flag_s = timed(get_transactions.flag_duplicate_transactions)
+
+    return {
+        "rows": rows,
+        "generate": {"seconds": round(generate_s, 3), "rows_per_s": rate(rows, generate_s)},
+        "transform": {"seconds": round(transform_s, 3), "rows_per_s": rate(rows, transform_s)},
+        "sqlite_load": {"seconds": round(load_s, 3), "rows_per_s": rate(rows, load_s)},
+        "store_transactions": {"rows": len(store_sample), "seconds": round(store_s, 3),
+                               "rows_per_s": rate(len(store_sample), store_s), **stored},
+        "find_duplicates": {"seconds": round(find_s, 3), "rows_per_s": rate(rows, find_s),
+                            "pairs": len(duplicates)},
+        "flag_duplicates": {"seconds": round(flag_s, 3), "rows_per_s": rate(rows, flag_s),
+                            "pairs": pairs, "flagged": flagged},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated row counts")
+    parser.add_argument("--store-rows", type=int, default=2000, help="rows passed to store_transactions")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay of every PostgREST stand-in response")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # plaid_sync creates its Supabase client at import, so point it at the stand-in first
+    stand_in, backend_url = start_process(serve, {}, {}, args.latency_ms / 1000)
+    os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"] = backend_url, SERVICE_KEY
+    import get_transactions
+    import plaid_sync
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = [bench_size(int(size), args, plaid_sync, get_transactions, workdir)
+                       for size in args.sizes.split(",")]
+    finally:
+        stand_in.terminate()
+
+    print(json.dumps({
+        "seed": args.seed,
+        "backend_latency_ms": args.latency_ms,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
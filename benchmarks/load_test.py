@@ -0,0 +1,292 @@
+"""Load test of the main API routes with a realistic request mix.
+
+    python benchmarks/load_test.py --rows 10000 --requests 5000 --concurrency 50 --output load.json
+    python benchmarks/load_test.py --baseline load.json
+
+Seeds --rows synthetic transactions (plus categories, accounts and a year of
+budgets) into a fresh backend, starts the API on it in a child process and
+drives a weighted mix of GET /transactions, GET /categories, GET /budgets/all
+and POST /update-transactions at --concurrency requests in flight.
+
+--backend sqlite (the default) serves the seeded data from a local SQLite
+file, so every request runs the real queries. --backend postgrest puts the
+same rows behind the PostgREST stand-in with --latency-ms per call, to see
+how the API behaves when it mostly waits on Supabase. --server picks the
+threaded Flask server or the ASGI app on uvicorn.
+
+Prints one JSON object with p50/p95/p99 latency, throughput, error rate and
+status codes per route and overall, tagged with the git commit. --output
+also writes it to a file; --baseline compares against such a file and lists
+every route whose p95 or throughput got worse than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(ROOT_DIR, "api")
+sys.path.insert(0, API_DIR)
+
+import loadgen  # noqa: E402
+from bench_asgi import start_process  # noqa: E402
+from postgrest_stand_in import SERVICE_KEY, serve  # noqa: E402
+
+YEAR = 2025
+RESERVE_CATEGORY = 9  # parent of the reserve subcategories, as in the app
+DEFAULT_MIX = "/transactions=2,/categories=3,/budgets/all=4,/update-transactions=1"
+
+
+# -------------------------------------------
+# ✅ Synthetic data
+# -------------------------------------------
+def synthetic_tables(rows, rng):
+    """Accounts, a two-level category tree, `rows` transactions over one year and monthly budgets."""
+    main_ids = list(range(1, 9)) + [RESERVE_CATEGORY]
+    categories = [{"id": i, "name": f"Category {i}", "parent_id": None} for i in main_ids]
+    subcategories = {}
+    next_id = 10
+    for parent in main_ids:
+        for _ in range(6):
+            categories.append({"id": next_id, "name": f"Subcategory {next_id}", "parent_id": parent})
+            subcategories[next_id] = parent
+            next_id += 1
+
+    accounts = [{"id": i, "account_id": f"acc-{i}", "name": f"Account {i}", "type": "depository"} for i in range(5)]
+    transactions = []
+    for i in range(rows):
+        subcategory = rng.choice(list(subcategories)) if rng.random() < 0.7 else None
+        transactions.append({
+            "transaction_id": f"tx-{i}",
+            "account_id": f"acc-{i % len(accounts)}",
+            "date": f"{YEAR}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "name": f"Merchant {rng.randint(0, 499)}",
+            "merchant_name": f"Merchant {rng.randint(0, 499)}",
+            "amount": round(rng.uniform(1, 400), 2),
+            "iso_currency_code": "USD",
+            "pending": False,
+            "user_category_id": subcategories[subcategory] if subcategory else None,
+            "user_subcategory_id": subcategory,
+        })
+
+    budgets = [
+        {"id": month * 1000 + category_id, "month": month, "year": YEAR, "category_id": category_id,
+         "budgeted_amount": rng.choice([50, 100, 150, 200, 400])}
+        for month in range(1, 13) for category_id in subcategories
+    ]
+    return {"accounts": accounts, "categories": categories, "transactions": transactions, "budgets": budgets}
+
+
+def request_mix(tables, mix, count, rng):
+    """`count` (route, method, path, body) requests drawn from the `mix` weights."""
+    transaction_ids = [row["transaction_id"] for row in tables["transactions"]]
+    subcategories = [row for row in tables["categories"] if row["parent_id"] is not None]
+    routes, weights = zip(*mix.items())
+
+    requests = []
+    for route in rng.choices(routes, weights, k=count):
+        if route == "/budgets/all":
+            requests.append((route, "GET", f"{route}?month={rng.randint(1, 12)}&year={YEAR}", None))
+        elif route == "/update-transactions":
+            body = {"transactions": [
+                {"transaction_id": transaction_id, "user_category_id": category["parent_id"],
+                 "user_subcategory_id": category["id"]}
+                for transaction_id, category in (
+                    (transaction_id, rng.choice(subcategories))
+                    for transaction_id in rng.sample(transaction_ids, min(len(transaction_ids), rng.randint(1, 10)))
+                )
+            ]}
+            requests.append((route, "POST", route, body))
+        else:
+            requests.append((route, "GET", route, None))
+    return requests
+
+
+def bulk_update_result(params):
+    """Stand-in answer to the bulk_update_transactions RPC: every row is found."""
+    return [{"transaction_id": row["transaction_id"], "date": f"{YEAR}-01-01"} for row in params["updates"]]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        mix[route.strip()] = float(weight or 1)
+    return mix
+
+
+# -------------------------------------------
+# ✅ Server under test (runs in a child process)
+# -------------------------------------------
+def build_repository(backend, target):
+    if backend == "sqlite":
+        from storage.sqlite_repository import SQLiteRepository
+        return SQLiteRepository(target)
+
+    from supabase import create_client
+    from storage.supabase_repository import SupabaseRepository
+    return SupabaseRepository(create_client(target, SERVICE_KEY))
+
+
+def serve_api(server, backend, target, ready):
+    from app import create_app
+
+    app = create_app(repository=build_repository(backend, target))
+    if server == "flask":
+        from werkzeug.serving import make_server
+
+        httpd = make_server("127.0.0.1", 0, app, threaded=True)
+        ready.put(httpd.server_port)
+        httpd.serve_forever()
+        return
+
+    import uvicorn
+    from asgi import AsyncAPI
+
+    async def main():
+        async_repository = None
+        if backend == "postgrest":
+            from supabase import acreate_client
+            from storage.async_repository import AsyncSupabaseRepository
+            async_repository = AsyncSupabaseRepository(await acreate_client(target, SERVICE_KEY))
+        uv_server = uvicorn.Server(uvicorn.Config(AsyncAPI(app, async_repository), port=0,
+                                                  log_level="warning", backlog=2048))
+        serving = asyncio.create_task(uv_server.serve())
+        while not uv_server.started:
+            await asyncio.sleep(0.01)
+        ready.put(uv_server.servers[0].sockets[0].getsockname()[1])
+        await serving
+
+    asyncio.run(main())
+
+
+# -------------------------------------------
+# ✅ Reporting
+# -------------------------------------------
+def summarize_routes(results, elapsed):
+    """loadgen.summarize() per route and overall, plus status code counts."""
+    def with_statuses(rows):
+        statuses = {}
+        for _, status, _, _ in rows:
+            key = str(status) if status is not None else "connection_error"
+            statuses[key] = statuses.get(key, 0) + 1
+        return {**loadgen.summarize(rows, elapsed), "statuses": dict(sorted(statuses.items()))}
+
+    routes = {}
+    for result in results:
+        routes.setdefault(result[0], []).append(result)
+    return {route: with_statuses(rows) for route, rows in sorted(routes.items())}, with_statuses(results)
+
+
+def compare(report, baseline, tolerance):
+    """Routes whose p95 latency or throughput is more than `tolerance` worse than in `baseline`."""
+    regressions = []
+    for route, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append({"route": route, "metric": "p95_ms", "baseline": previous["p95_ms"],
+                                "current": current["p95_ms"]})
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append({"route": route, "metric": "throughput_rps", "baseline": previous["throughput_rps"],
+                                "current": current["throughput_rps"]})
+        if current["error_rate"] > previous["error_rate"]:
+            regressions.append({"route": route, "metric": "error_rate", "baseline": previous["error_rate"],
+                                "current": current["error_rate"]})
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="transactions to seed")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=200, help="requests sent before measuring")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma-separated route=weight pairs")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask")
+    parser.add_argument("--backend", choices=["sqlite", "postgrest"], default="sqlite")
+    parser.add_argument("--latency-ms", type=float, default=20, help="PostgREST stand-in delay per call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown vs --baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    tables = synthetic_tables(args.rows, rng)
+
+    from storage.sqlite_repository import SQLiteRepository
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repository = SQLiteRepository(os.path.join(workdir, "load.db"))
+        for table, rows in tables.items():
+            repository.upsert_rows(table, rows)
+
+        stand_in = None
+        target = repository.path
+        if args.backend == "postgrest":
+            # The stand-in ignores filters, so it answers the budgets RPC with one month
+            rpcs = {"fetch_all_budgets": repository.fetch_all_budgets(1, YEAR),
+                    "bulk_update_transactions": bulk_update_result}
+            stand_in, target = start_process(serve, tables, rpcs, args.latency_ms / 1000)
+
+        server, port = start_process(serve_api, args.server, args.backend, target)
+        try:
+            if args.warmup:
+                asyncio.run(loadgen.run("127.0.0.1", port, request_mix(tables, mix, args.warmup, rng),
+                                        args.concurrency))
+            results, elapsed = asyncio.run(loadgen.run("127.0.0.1", port, request_mix(tables, mix, args.requests, rng),
+                                                       args.concurrency))
+        finally:
+            server.terminate()
+            if stand_in:
+                stand_in.terminate()
+
+    routes, overall = summarize_routes(results, elapsed)
+    report = {
+        "commit": git_commit(),
+        "config": {
+            "server": args.server,
+            "backend": args.backend,
+            "backend_latency_ms": args.latency_ms if args.backend == "postgrest" else None,
+            "rows": args.rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "routes": routes,
+        "overall": overall,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline_commit"] = baseline.get("commit")
+        report["regressions"] = compare(report, baseline, args.tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    sys.exit(1 if report.get("regressions") else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Minimal HTTP/1.1 load generator shared by the HTTP benchmarks.
+
+Each worker keeps one keep-alive connection and sends its requests back to
+back, so `concurrency` is exactly the number of requests in flight. It talks
+raw asyncio streams rather than httpx because httpx's connection pool costs
+more CPU than the servers under test once there are a hundred or more
+connections, which would make the load generator the bottleneck.
+"""
+import asyncio
+import json
+import time
+
+
+class Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Sends one request and returns (status, response headers, body bytes)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = b"" if body is None else json.dumps(body).encode()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            content = b""
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                content += chunk[:-2]
+        elif "content-length" in response_headers:
+            content = await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            content = await self.reader.read()
+            self.close()
+
+        if version == "HTTP/1.0" or response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return int(status), response_headers, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run(host, port, requests, concurrency):
+    """Sends every (route, method, path, body) in `requests` with `concurrency` in flight.
+
+    Returns (results, elapsed seconds) where each result is
+    (route, status or None on a connection error, latency ms, response bytes).
+    """
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+    results = []
+
+    async def worker():
+        connection = Connection(host, port)
+        while not queue.empty():
+            route, method, path, body = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                status, _, content = await connection.request(method, path, body)
+                results.append((route, status, (time.perf_counter() - started) * 1000, len(content)))
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection.close()
+                results.append((route, None, (time.perf_counter() - started) * 1000, 0))
+        connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2) if ordered else None
+
+
+def summarize(results, elapsed):
+    """Latency percentiles, throughput and error rate for a list of results."""
+    latencies = [latency for _, _, latency, _ in results]
+    errors = sum(1 for _, status, _, _ in results if status is None or status >= 500)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else None,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
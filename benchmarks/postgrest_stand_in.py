@@ -0,0 +1,93 @@
+"""Local stand-in for Supabase's PostgREST API, used by the HTTP benchmarks.
+
+Serves /rest/v1/<table> and /rest/v1/rpc/<function> from in-memory rows after
+a fixed delay, so the API can be load-tested against realistic network waits
+without a Supabase project. Filters are ignored: every GET returns the whole
+table, capped at PostgREST's 1000-row page size. An RPC returns its entry in
+`rpcs`, or calls it with the request parameters if it is a function. Writes
+are accepted and echoed back.
+
+It is a minimal HTTP/1.1 keep-alive server on asyncio, so thousands of
+delayed responses can be pending at once without one thread each. Run it
+with serve() in its own process so it doesn't compete with the server under
+test.
+"""
+import asyncio
+import json
+from urllib.parse import urlparse
+
+PAGE_SIZE = 1000
+SERVICE_KEY = "stand.in.key"  # any JWT-shaped string satisfies the Supabase client
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request"}
+
+
+class PostgRESTStandIn:
+    def __init__(self, tables=None, rpcs=None, latency=0.0):
+        self.tables = tables or {}
+        self.rpcs = rpcs or {}
+        self.latency = latency
+        self.requests = 0
+        self.port = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def respond(self, method, path, body):
+        """Returns (status, payload) for one request."""
+        path = urlparse(path).path
+        if method == "GET":
+            return 200, self.tables.get(path.rsplit("/", 1)[-1], [])[:PAGE_SIZE]
+        if method == "POST" and "/rpc/" in path:
+            result = self.rpcs.get(path.rsplit("/", 1)[-1], [])
+            return 200, result(json.loads(body or b"{}")) if callable(result) else result
+        if method == "DELETE":
+            return 200, []
+        rows = json.loads(body or b"null")
+        return (201 if method == "POST" else 200), rows if isinstance(rows, list) else [rows]
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                await asyncio.sleep(self.latency)
+                status, payload = self.respond(method, path, body)
+                self.requests += 1
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, port=0):
+        server = await asyncio.start_server(self._handle, "127.0.0.1", port, backlog=4096)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+
+def serve(tables, rpcs, latency, ready):
+    """Process target: serves the stand-in forever and puts its URL on `ready`."""
+    async def main():
+        stand_in = PostgRESTStandIn(tables, rpcs, latency)
+        server = await stand_in.start()
+        ready.put(stand_in.url)
+        await server.serve_forever()
+
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Seeded synthetic Plaid transactions for benchmarks and tests.
+
+generate_transactions() yields dicts shaped like Plaid's /transactions/get
+results: a few accounts, a pool of merchants with habitual amounts (so some
+same-day, same-amount purchases happen by chance), pending transactions
+followed by their posted version, and deliberate duplicates (the same
+purchase reported twice under a new transaction_id). The same arguments
+always produce the same rows, and rows are generated lazily so 10M-row runs
+don't need them all in memory.
+"""
+import random
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+
+START_DATE = date(2024, 1, 1)
+
+_MERCHANTS = [
+    ("Starbucks", ["Food and Drink", "Restaurants", "Coffee Shop"], "13005043"),
+    ("Whole Foods", ["Shops", "Supermarkets and Groceries"], "19047000"),
+    ("Shell", ["Travel", "Gas Stations"], "22009000"),
+    ("Uber", ["Travel", "Taxi"], "22016000"),
+    ("Amazon", ["Shops", "Digital Purchase"], "19019000"),
+    ("Netflix", ["Service", "Subscription"], "18061000"),
+    ("Target", ["Shops", "Department Stores"], "19018000"),
+    ("Chipotle", ["Food and Drink", "Restaurants"], "13005000"),
+    ("CVS Pharmacy", ["Shops", "Pharmacies"], "19043000"),
+    ("Delta Air Lines", ["Travel", "Airlines and Aviation Services"], "22001000"),
+]
+_CITIES = [("Seattle", "WA", "98101"), ("Austin", "TX", "73301"), ("Denver", "CO", "80202"), ("Boston", "MA", "02108")]
+
+
+def _merchant_pool(rng, merchants):
+    """(name, merchant_name, category, category_id, habitual amounts, city) for each merchant."""
+    pool = []
+    for i in range(merchants):
+        brand, category, category_id = _MERCHANTS[i % len(_MERCHANTS)]
+        store = f"{brand} #{i // len(_MERCHANTS) + 1}"
+        amounts = [round(rng.lognormvariate(3, 1), 2) for _ in range(rng.randint(1, 4))]
+        city = rng.choice(_CITIES)
+        pool.append((f"{store.upper()} {city[0].upper()}", store, category, category_id, amounts, city))
+    return pool
+
+
+def generate_transactions(rows, seed=0, accounts=8, merchants=2000, days=730,
+                          pending_rate=0.05, duplicate_rate=0.01):
+    """Yields `rows` Plaid transactions.
+
+    About `pending_rate` of purchases appear first as a pending transaction
+    and again, 0-3 days later, as the posted one (pending_transaction_id
+    links them). About `duplicate_rate` are reported twice with identical
+    date, amount and account.
+    """
+    rng = random.Random(seed)
+    pool = _merchant_pool(rng, merchants)
+    account_ids = [f"acc-{seed}-{i}" for i in range(accounts)]
+    emitted = 0
+
+    def transaction(kind, day, account_id, merchant, amount, pending, pending_transaction_id=None):
+        nonlocal emitted
+        name, merchant_name, category, category_id, _, (city, region, postal_code) = merchant
+        emitted += 1
+        return {
+            "transaction_id": f"{kind}-{seed}-{emitted:09d}",
+            "account_id": account_id,
+            "amount": amount,
+            "iso_currency_code": "USD",
+            "merchant_name": merchant_name,
+            "name": name,
+            "category": category,
+            "category_id": category_id,
+            "pending": pending,
+            "pending_transaction_id": pending_transaction_id,
+            "date": (START_DATE + timedelta(days=day)).isoformat(),
+            "location": {"address": None, "city": city, "region": region, "postal_code": postal_code,
+                         "country": "US"},
+        }
+
+    while emitted < rows:
+        merchant = rng.choice(pool)
+        account_id = rng.choice(account_ids)
+        day = rng.randrange(days)
+        amount = rng.choice(merchant[4]) if rng.random() < 0.6 else round(rng.lognormvariate(3, 1), 2)
+        roll = rng.random()
+
+        if roll < pending_rate and emitted + 2 <= rows:
+            pending = transaction("pend", day, account_id, merchant, amount, True)
+            yield pending
+            posted_day = min(days - 1, day + rng.randint(0, 3))
+            yield transaction("tx", posted_day, account_id, merchant, amount, False, pending["transaction_id"])
+        elif roll < pending_rate + duplicate_rate and emitted + 2 <= rows:
+            original = transaction("tx", day, account_id, merchant, amount, False)
+            yield original
+            yield {**transaction("dup", day, account_id, merchant, amount, False),
+                   "name": original["name"].title()}
+        else:
+            yield transaction("tx", day, account_id, merchant, amount, False)
+
+
+# -------------------------------------------
+# ✅ Local SQLite copies (the layout get_transactions.py expects)
+# -------------------------------------------
+def create_sqlite(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id TEXT PRIMARY KEY,
+            date TEXT,
+            name TEXT,
+            amount REAL,
+            iso_currency_code TEXT,
+            pending INTEGER,
+            user_category_id INTEGER,
+            ignored INTEGER DEFAULT 0,
+            account_id TEXT
+        )
+    """)
+    conn.commit()
+    return conn
+
+
+def insert_sqlite(conn, transactions):
+    conn.executemany(
+        "INSERT INTO transactions (transaction_id, date, name, amount, iso_currency_code, pending, account_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((tx["transaction_id"], tx["date"], tx["name"], tx["amount"], tx["iso_currency_code"], int(tx["pending"]),
+          tx["account_id"]) for tx in transactions),
+    )
+    conn.commit()
+
+
+def expected_duplicate_pairs(transactions):
+    """Pairs find_duplicate_transactions() should report: same date, amount and account."""
+    groups = Counter((tx["date"], tx["amount"], tx["account_id"]) for tx in transactions)
+    return sum(count * (count - 1) // 2 for count in groups.values())
@@ -1,5 +1,5 @@
 import sqlite3
-from plaid_sync import DATABASE_FILE  # Use the same database file
+from get_transactions import DATABASE_FILE  # Use the same database file
 
 # Function to add a category
 def add_category(category_name):
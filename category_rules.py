@@ -0,0 +1,161 @@
+"""Merchant rules that categorize transactions automatically.
+
+A rule sets user_category_id / user_subcategory_id on every transaction that
+meets all of its conditions:
+
+    merchant_contains   case-insensitive substring of merchant_name or name
+    plaid_category_id   exact Plaid category_id
+    min_amount          amount >= min_amount
+    max_amount          amount <= max_amount
+    account_id          exact account
+
+When several rules match, the highest priority wins, then the lowest id.
+Rules are compiled once into an Aho-Corasick automaton over the merchant
+substrings, so matching a transaction costs one scan of its name no matter
+how many rules there are.
+
+Used by plaid_sync.py when storing new transactions and by the API's
+/rules endpoints (cd api && python -m utils.rules re-applies them to history).
+"""
+from collections import deque
+
+RULE_CONDITIONS = ("merchant_contains", "plaid_category_id", "min_amount", "max_amount", "account_id")
+
+
+def validate_rule(rule):
+    """Returns an error message for an unusable rule, or None."""
+    if not rule.get("user_category_id"):
+        return "user_category_id is required"
+    if all(rule.get(field) in (None, "") for field in RULE_CONDITIONS):
+        return f"At least one of {', '.join(RULE_CONDITIONS)} is required"
+    for field in ("min_amount", "max_amount"):
+        value = rule.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return f"{field} must be a number"
+    if rule.get("min_amount") is not None and rule.get("max_amount") is not None \
+            and rule["min_amount"] > rule["max_amount"]:
+        return "min_amount must not be greater than max_amount"
+    return None
+
+
+class _Automaton:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # pattern ids ending at each state, including via fail links
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        # Breadth-first so every fail link points at an already finished state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """Returns the set of pattern ids found in text."""
+        found = set()
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class RuleEngine:
+    """Compiled set of rules; build one with compile_rules()."""
+
+    def __init__(self, rules):
+        # Best rule first, so the first match found is the winner
+        self.rules = sorted(
+            (rule for rule in rules if validate_rule(rule) is None),
+            key=lambda rule: (-(rule.get("priority") or 0), rule.get("id") or 0),
+        )
+
+        patterns, self._pattern_rules = {}, []
+        self._unanchored = []  # ranks of rules without a merchant condition
+        for rank, rule in enumerate(self.rules):
+            merchant = (rule.get("merchant_contains") or "").strip().lower()
+            if merchant:
+                if merchant not in patterns:
+                    patterns[merchant] = len(patterns)
+                    self._pattern_rules.append([])
+                self._pattern_rules[patterns[merchant]].append(rank)
+            else:
+                self._unanchored.append(rank)
+        self._automaton = _Automaton(list(patterns))
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _conditions_hold(self, rule, transaction):
+        if rule.get("plaid_category_id") and rule["plaid_category_id"] != transaction.get("plaid_category_id"):
+            return False
+        if rule.get("account_id") and rule["account_id"] != transaction.get("account_id"):
+            return False
+        amount = transaction.get("amount")
+        if rule.get("min_amount") is not None and (amount is None or amount < rule["min_amount"]):
+            return False
+        if rule.get("max_amount") is not None and (amount is None or amount > rule["max_amount"]):
+            return False
+        return True
+
+    def match(self, transaction):
+        """Returns the winning rule for a transaction, or None."""
+        if not self.rules:
+            return None
+        # Newline keeps a pattern from matching across merchant_name and name
+        text = f"{transaction.get('merchant_name') or ''}\n{transaction.get('name') or ''}".lower()
+        candidates = set(self._unanchored)
+        for pattern_id in self._automaton.search(text):
+            candidates.update(self._pattern_rules[pattern_id])
+        for rank in sorted(candidates):
+            if self._conditions_hold(self.rules[rank], transaction):
+                return self.rules[rank]
+        return None
+
+    def categorize(self, transactions):
+        """Returns {transaction_id: update} for the uncategorized transactions a rule matches.
+
+        Transactions that already have a user_category_id are left alone, so
+        rules never override a category chosen by hand.
+        """
+        updates = {}
+        for transaction in transactions:
+            if transaction.get("user_category_id") is not None:
+                continue
+            rule = self.match(transaction)
+            if rule is not None:
+                updates[transaction["transaction_id"]] = {
+                    "user_category_id": rule["user_category_id"],
+                    "user_subcategory_id": rule.get("user_subcategory_id"),
+                }
+        return updates
+
+
+def compile_rules(rules):
+    """Compiles rule rows (e.g. from the category_rules table) into a RuleEngine."""
+    return RuleEngine([rule for rule in rules if rule.get("is_enabled", True)])
@@ -0,0 +1,52 @@
+"""Shared test setup.
+
+Puts api/ on sys.path, so test modules import the API's modules (app,
+storage, utils, routes) directly. The fixtures build the usual test
+subjects:
+
+    repository        empty SQLite repository in tmp_path, RPC cache cleared
+    client            Flask test client on `repository`
+    postgrest_client  postgrest_client(handler): Supabase client whose HTTP calls go to handler(request)
+
+A test module seeds data by overriding `repository` with a fixture of the
+same name that takes the shared one, adds rows and returns it; `client`
+then serves the seeded repository.
+"""
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, "api"))
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app import create_app  # noqa: E402
+from storage.sqlite_repository import SQLiteRepository  # noqa: E402
+from utils.cache import rpc_cache  # noqa: E402
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Empty SQLite repository in tmp_path; the per-month RPC cache starts empty too."""
+    rpc_cache.clear()
+    return SQLiteRepository(str(tmp_path / "api.db"))
+
+
+@pytest.fixture
+def client(repository):
+    """API client running on the local SQLite backend, no network needed."""
+    return create_app(repository=repository).test_client()
+
+
+@pytest.fixture
+def postgrest_client():
+    """postgrest_client(handler) -> Supabase client whose requests are answered by handler(httpx.Request)."""
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+
+    def connect(handler):
+        options = SyncClientOptions(httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+        return create_client("http://postgrest.test", "a.b.c", options)
+
+    return connect
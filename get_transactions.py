@@ -1,26 +1,53 @@
+import os
 import sqlite3
-from plaid_sync import DATABASE_FILE
 
-def get_unprocessed_transactions():
-    """Retrieve transactions that are not categorized and not ignored."""
+# plaid_sync.py stores to Supabase now and no longer defines a database file
+DATABASE_FILE = os.getenv("DATABASE_FILE", "transactions_dev.db")
+
+def get_unprocessed_transactions(limit=None, before=None):
+    """Retrieve transactions that are not categorized and not ignored, newest first.
+
+    Returns every such row, or at most `limit` rows when given. Pass `before` = (date, transaction_id) of the
+    last row of the previous page to get the next one; the partial index makes
+    each page a short index range instead of a full table scan.
+    """
+    before_date, before_id = before or (None, None)
     conn = sqlite3.connect(DATABASE_FILE)
     cursor = conn.cursor()
 
+    # Make sure the ignore flag and the work queue index exist
+    try:
+        cursor.execute("SELECT is_ignored FROM transactions LIMIT 1")
+    except sqlite3.OperationalError:
+        cursor.execute("ALTER TABLE transactions ADD COLUMN is_ignored INTEGER DEFAULT 0")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_work_queue ON transactions (date, transaction_id)
+        WHERE user_category_id IS NULL AND is_ignored IS NOT 1
+    """)
+    conn.commit()
+
     cursor.execute("""
         SELECT transaction_id, date, name, amount, iso_currency_code, pending
         FROM transactions
-        WHERE user_category_id IS NULL 
-        ORDER BY date DESC;
-    """)
+        WHERE user_category_id IS NULL AND is_ignored IS NOT 1
+          AND (? IS NULL OR (date, transaction_id) < (?, ?))
+        ORDER BY date DESC, transaction_id DESC
+        LIMIT ?;
+    """, (before_date, before_date, before_id, -1 if limit is None else limit))  # -1: no limit
 
     transactions = cursor.fetchall()
     conn.close()
 
     return transactions
 
-def find_duplicate_transactions():
-    """Find potential duplicate transactions based on same date, amount, and account."""
-    conn = sqlite3.connect(DATABASE_FILE)
+def find_duplicate_transactions(conn=None):
+    """Find potential duplicate transactions based on same date, amount, and account.
+
+    Pass `conn` to run inside a caller's open transaction; a second
+    connection would wait on that transaction's write lock.
+    """
+    own_conn = conn is None
+    conn = conn or sqlite3.connect(DATABASE_FILE)
     cursor = conn.cursor()
 
     # First, check if account_id column exists, otherwise create it
@@ -44,7 +71,8 @@ def find_duplicate_transactions():
     """)
 
     duplicates = cursor.fetchall()
-    conn.close()
+    if own_conn:
+        conn.close()
     
     return duplicates
 
@@ -77,7 +105,7 @@ def flag_duplicate_transactions():
     """)
 
     # Find duplicates
-    duplicates = find_duplicate_transactions()
+    duplicates = find_duplicate_transactions(conn)
 
     # Flag each transaction in duplicate pairs
     flagged_count = 0
@@ -1,7 +1,11 @@
+import functools
+import json
 import os
 import requests
 from supabase import create_client
 from datetime import datetime, timedelta
+from category_rules import compile_rules
+from query_tracer import trace_queries, traced_client
 
 # ✅ Load Plaid & Supabase credentials from environment variables
 PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
@@ -11,11 +15,37 @@ PLAID_ENV = "https://sandbox.plaid.com"  # Change to production if needed
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = traced_client(create_client(SUPABASE_URL, SUPABASE_KEY))
 
 # ✅ Plaid API endpoints
 PLAID_TRANSACTIONS_URL = f"{PLAID_ENV}/transactions/get"
 PLAID_ACCOUNTS_URL = f"{PLAID_ENV}/accounts/get"
+PLAID_SYNC_URL = f"{PLAID_ENV}/transactions/sync"
+
+# ✅ Access tokens per Plaid item for webhook-driven syncs: '{"item_id": "access-..."}'
+PLAID_ACCESS_TOKENS = json.loads(os.getenv("PLAID_ACCESS_TOKENS") or "{}")
+
+# ✅ Removed transaction ids per delete request, so the in() filter stays well inside URL limits
+DELETE_CHUNK = 200
+
+
+# -------------------------------------------
+# ✅ Count the Supabase queries of each sync run
+# -------------------------------------------
+def traced_run(name):
+    """Runs the decorated sync inside a query trace and adds its totals to the returned summary."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with trace_queries(name) as trace:
+                summary = fn(*args, **kwargs)
+            summary["queries"] = trace.totals()
+            print(f"🔎 {name}: {trace.count} Supabase queries in {summary['queries']['duration_ms']} ms")
+            for warning in trace.warnings():
+                print(f"⚠️ {warning}")
+            return summary
+        return run
+    return decorate
 
 
 # -------------------------------------------
@@ -109,34 +139,78 @@ def store_account_balances(accounts):
             )
 
 
+# -------------------------------------------
+# ✅ Load the user's auto-categorization rules
+# -------------------------------------------
+def load_category_rules():
+    try:
+        rules = supabase.table("category_rules").select("*").eq("is_enabled", True).execute().data
+        print(f"✅ Loaded {len(rules)} category rules.")
+        return compile_rules(rules)
+    except Exception as e:
+        print(f"⚠️ Could not load category rules, new transactions stay uncategorized: {str(e)}")
+        return compile_rules([])
+
+
 # -------------------------------------------
 # ✅ Store Transactions in Supabase
 # -------------------------------------------
-def store_transactions(transactions):
-    inserted_count, updated_count, skipped_count = 0, 0, 0
+def transaction_row(tx):
+    """Maps one Plaid transaction to a row of the transactions table."""
+    location = tx["location"]
+    return {
+        "transaction_id": tx["transaction_id"],
+        "account_id": tx.get("account_id"),
+        "amount": tx["amount"],
+        "iso_currency_code": tx.get("iso_currency_code", "USD"),
+        "merchant_name": tx.get("merchant_name"),
+        "category": ", ".join(tx.get("category") or []),
+        "plaid_category_id": tx.get("category_id"),
+        "pending": tx["pending"],
+        "date": tx["date"],  # ✅ Ensure date is included
+        "name": tx["name"],  # ✅ Ensure name is included
+        "location_address": location.get("address"),
+        "location_city": location.get("city"),
+        "location_region": location.get("region"),
+        "location_postal_code": location.get("postal_code"),
+        "location_country": location.get("country"),
+    }
 
-    for tx in transactions:
-        try:
-            account_id = tx.get("account_id")  
 
-            # ✅ Prepare transaction data
-            tx_data = {
-                "transaction_id": tx["transaction_id"],
-                "account_id": account_id,
-                "amount": tx["amount"],
-                "iso_currency_code": tx.get("iso_currency_code", "USD"),
+def store_transactions(transactions, rules=None, modified=False):
+    """Inserts new transactions and refreshes pending ones; returns the counts.
+
+    `modified` batches come from /transactions/sync: Plaid changed those rows,
+    so they overwrite the stored row even once it has posted (the user's
+    categories are kept, transaction_row() has no category columns). Rows that
+    fail to store are listed in failed_ids rather than counted as skipped.
+    """
+    inserted_count, updated_count, skipped_count = 0, 0, 0
+    failed_ids = []
+
+    # ✅ Match the whole batch against the rules up front; only new inserts use the result
+    rules = rules if rules is not None else load_category_rules()
+    try:
+        rule_categories = rules.categorize([
+            {
+                "transaction_id": tx.get("transaction_id"),
+                "name": tx.get("name"),
                 "merchant_name": tx.get("merchant_name"),
-                "category": ", ".join(tx.get("category", [])),
                 "plaid_category_id": tx.get("category_id"),
-                "pending": tx["pending"],
-                "date": tx["date"],  # ✅ Ensure date is included
-                "name": tx["name"],  # ✅ Ensure name is included
-                "location_address": tx["location"].get("address"),
-                "location_city": tx["location"].get("city"),
-                "location_region": tx["location"].get("region"),
-                "location_postal_code": tx["location"].get("postal_code"),
-                "location_country": tx["location"].get("country"),
+                "amount": tx.get("amount"),
+                "account_id": tx.get("account_id"),
             }
+            for tx in transactions
+        ])
+    except Exception as e:
+        # A broken rule must not cost the batch; the rows are stored uncategorized
+        print(f"⚠️ Could not apply category rules, storing {len(transactions)} transactions uncategorized: {str(e)}")
+        rule_categories = {}
+
+    for tx in transactions:
+        try:
+            # ✅ Prepare transaction data
+            tx_data = transaction_row(tx)
 
             # ✅ Check if transaction exists
             existing_tx = (
@@ -167,46 +241,173 @@ def store_transactions(transactions):
                     updated_count += 1
                     print(f"✅ Final update for posted transaction: {tx['transaction_id']}")
 
+                elif modified:
+                    # ✅ Plaid changed a posted transaction, store its new details
+                    supabase.table("transactions").update(tx_data).eq(
+                        "transaction_id", tx["transaction_id"]
+                    ).execute()
+                    updated_count += 1
+                    print(f"🔄 Updated modified transaction: {tx['transaction_id']}")
+
                 else:
                     # 🚫 If already posted, skip update
                     print(f"🚫 Skipping update for already posted transaction: {tx['transaction_id']}")
                     skipped_count += 1
 
             else:
-                # ✅ Insert new transaction
+                # ✅ Insert new transaction, categorized if a rule matched
+                tx_data.update(rule_categories.get(tx["transaction_id"], {}))
                 supabase.table("transactions").insert(tx_data).execute()
                 inserted_count += 1
                 print(f"✅ Inserted new transaction: {tx['transaction_id']}")
 
         except Exception as e:
             print(f"❌ Error storing transaction {tx.get('transaction_id', 'Unknown')}: {str(e)}")
-            skipped_count += 1
+            failed_ids.append(tx.get("transaction_id"))
+
+    print(f"\n📊 Transaction sync summary: {inserted_count} inserted, {updated_count} updated, "
+          f"{skipped_count} skipped, {len(failed_ids)} failed")
+    return {"inserted": inserted_count, "updated": updated_count, "skipped": skipped_count,
+            "failed": len(failed_ids), "failed_ids": failed_ids}
+
+# -------------------------------------------
+# ✅ Incremental sync of one item via /transactions/sync
+# -------------------------------------------
+def access_token_for(item_id):
+    """Access token for a Plaid item, falling back to ACCESS_TOKEN for single-item setups."""
+    return PLAID_ACCESS_TOKENS.get(item_id) or ACCESS_TOKEN
+
+
+def load_sync_cursor(item_id):
+    rows = supabase.table("plaid_items").select("cursor").eq("item_id", item_id).execute().data
+    return rows[0]["cursor"] if rows else None
+
+
+def save_sync_cursor(item_id, cursor):
+    supabase.table("plaid_items").upsert({
+        "item_id": item_id,
+        "cursor": cursor,
+        "updated_at": datetime.utcnow().isoformat(),
+    }).execute()
+
+
+def fetch_transaction_changes(access_token, cursor=None):
+    """Pages /transactions/sync from `cursor`; returns (added, modified, removed_ids, next_cursor).
+
+    If Plaid reports the data changed mid-pagination, the whole pass restarts
+    from the original cursor, as the Plaid docs require.
+    """
+    headers = {"Content-Type": "application/json"}
+    for _ in range(3):
+        added, modified, removed, next_cursor = [], [], [], cursor
+        while True:
+            payload = {
+                "client_id": PLAID_CLIENT_ID,
+                "secret": PLAID_SECRET,
+                "access_token": access_token,
+                "count": 500,
+            }
+            if next_cursor:
+                payload["cursor"] = next_cursor
+            response = requests.post(PLAID_SYNC_URL, json=payload, headers=headers)
+            body = response.json()
+            if response.status_code != 200:
+                if body.get("error_code") == "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION":
+                    print("🔄 Plaid data changed during pagination, restarting sync pass...")
+                    break
+                raise RuntimeError(f"Plaid /transactions/sync failed: {body}")
+
+            added += body.get("added", [])
+            modified += body.get("modified", [])
+            removed += [tx["transaction_id"] for tx in body.get("removed", [])]
+            next_cursor = body["next_cursor"]
+            if not body.get("has_more"):
+                return added, modified, removed, next_cursor
+    raise RuntimeError("Plaid data kept changing during /transactions/sync pagination")
+
+
+@traced_run("Plaid item sync")
+def sync_item(item_id, progress=None):
+    """Applies the changes Plaid has for one item since its last cursor and returns the counts."""
+    report = progress or (lambda stage, **info: None)
+
+    print(f"🔄 Fetching transaction changes for item {item_id}...")
+    report("fetching_changes", item_id=item_id)
+    cursor = load_sync_cursor(item_id)
+    added, modified, removed, next_cursor = fetch_transaction_changes(access_token_for(item_id), cursor)
+    summary = {"item_id": item_id, "added": len(added), "modified": len(modified), "removed": len(removed)}
+    report("storing_transactions", **summary)
+
+    failed_ids = []
+    if added or modified:
+        rules = load_category_rules()
+        for batch, is_modified in ((added, False), (modified, True)):
+            stored = store_transactions(batch, rules, modified=is_modified) if batch else {}
+            for key in ("inserted", "updated", "skipped"):
+                summary[key] = summary.get(key, 0) + stored.get(key, 0)
+            failed_ids += stored.get("failed_ids", [])
+    if removed:
+        for start in range(0, len(removed), DELETE_CHUNK):
+            supabase.table("transactions").delete().in_("transaction_id", removed[start:start + DELETE_CHUNK]).execute()
+        print(f"🗑️ Removed {len(removed)} transactions Plaid no longer reports.")
+
+    # ✅ Only advance the cursor once everything above is stored; otherwise the
+    # next sync fetches the same changes again (storing them is idempotent)
+    summary["failed"] = len(failed_ids)
+    summary["cursor_advanced"] = not failed_ids
+    if failed_ids:
+        summary["failed_ids"] = failed_ids
+        print(f"⚠️ {len(failed_ids)} transactions failed to store, keeping the cursor for item {item_id}.")
+    else:
+        save_sync_cursor(item_id, next_cursor)
+    report("done", **summary)
+    print(f"🏁 Incremental sync for item {item_id} complete.")
+    return summary
 
-    print(f"\n📊 Transaction sync summary: {inserted_count} inserted, {updated_count} updated, {skipped_count} skipped")
 
 # -------------------------------------------
 # ✅ Main Function to Sync Plaid Data
 # -------------------------------------------
+@traced_run("Plaid sync")
+def sync(progress=None):
+    """Runs one full sync and returns its counts; errors propagate to the caller.
+
+    `progress(stage, **info)` is called as each step finishes (used by the
+    API's background job runner to report status).
+    """
+    report = progress or (lambda stage, **info: None)
+    summary = {"accounts": 0, "transactions_fetched": 0}
+
+    print("🔄 Fetching accounts from Plaid...")
+    report("fetching_accounts")
+    accounts = fetch_account_balances()
+    if accounts:
+        store_account_balances(accounts)
+        summary["accounts"] = len(accounts)
+        print("💾 Account synchronization complete.")
+    else:
+        print("⚠️ No accounts retrieved. Transactions may fail.")
+    report("accounts_stored", accounts=summary["accounts"])
+
+    print("\n🔄 Fetching transactions from Plaid...")
+    report("fetching_transactions")
+    transactions = fetch_transactions()
+    summary["transactions_fetched"] = len(transactions)
+    report("storing_transactions", transactions_fetched=len(transactions))
+    if transactions:
+        summary.update(store_transactions(transactions))
+        print("💾 Transaction synchronization complete.")
+    else:
+        print("⚠️ No transactions retrieved.")
+    report("done", **summary)
+
+    print("\n🏁 Plaid synchronization completed successfully!")
+    return summary
+
+
 def main():
     try:
-        print("🔄 Fetching accounts from Plaid...")
-        accounts = fetch_account_balances()
-        if accounts:
-            store_account_balances(accounts)
-            print("💾 Account synchronization complete.")
-        else:
-            print("⚠️ No accounts retrieved. Transactions may fail.")
-
-        print("\n🔄 Fetching transactions from Plaid...")
-        transactions = fetch_transactions()
-        if transactions:
-            store_transactions(transactions)
-            print("💾 Transaction synchronization complete.")
-        else:
-            print("⚠️ No transactions retrieved.")
-
-        print("\n🏁 Plaid synchronization completed successfully!")
-
+        return sync()
     except Exception as e:
         print(f"❌ Error in Plaid sync: {str(e)}")
         import traceback
@@ -0,0 +1,253 @@
+"""Counts the database calls made by one API request or sync run.
+
+    with trace_queries("plaid sync") as trace:
+        store_transactions(transactions)
+    trace.totals()      # {"queries": 120, "duration_ms": 85.2, "rows": 60, "by_operation": {...}}
+    trace.warnings()    # over budget / N+1 messages
+    trace.assert_within(3)
+
+Every query made through a TracedClient (Supabase) or a TracedConnection
+(SQLite) while a trace is active is recorded with its table, operation,
+duration and row count, in that trace and in every trace around it (so a
+test can wrap a whole request). A query shape repeated N_PLUS_ONE_THRESHOLD
+times or more in one trace, e.g. `select transactions eq(transaction_id)`
+once per row, is reported as an N+1 pattern.
+
+Used by plaid_sync.py for sync runs and by the API (api/utils/tracing.py)
+for every request.
+"""
+import contextvars
+import inspect
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+QUERY_TRACING = os.getenv("QUERY_TRACING", "1") != "0"
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", 25))  # queries per API request before warning
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))  # repeats of one query shape
+
+_current = contextvars.ContextVar("query_trace", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryTrace:
+    def __init__(self, name, budget=None, parent=None):
+        self.name = name
+        self.budget = budget  # None: no limit, only N+1 detection
+        self.parent = parent
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def totals(self):
+        return {
+            "queries": self.count,
+            "duration_ms": round(sum(query["duration_ms"] for query in self.queries), 2),
+            "rows": sum(query["rows"] or 0 for query in self.queries),
+            "by_operation": dict(Counter(f"{query['operation']} {query['table']}" for query in self.queries)),
+        }
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """[(shape, count)] of query shapes run at least `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in Counter(query["shape"] for query in self.queries).most_common()
+                if count >= threshold]
+
+    def warnings(self, threshold=N_PLUS_ONE_THRESHOLD):
+        messages = []
+        if self.budget is not None and self.count > self.budget:
+            messages.append(f"{self.name} made {self.count} queries (budget {self.budget})")
+        messages += [f"{self.name}: possible N+1, {count}x {shape}" for shape, count in self.repeated(threshold)]
+        return messages
+
+    def assert_within(self, budget=None):
+        """Raises QueryBudgetExceeded (an AssertionError) if the trace made more than `budget` queries."""
+        budget = self.budget if budget is None else budget
+        if self.count > budget:
+            listing = "\n".join(f"  {query['shape']} ({query['duration_ms']} ms)" for query in self.queries)
+            raise QueryBudgetExceeded(f"{self.name} made {self.count} queries, budget is {budget}:\n{listing}")
+
+
+def begin_trace(name, budget=None):
+    """Starts a trace nested in the current one; returns (trace, token for end_trace)."""
+    trace = QueryTrace(name, budget, _current.get())
+    return trace, _current.set(trace)
+
+
+def end_trace(token):
+    _current.reset(token)
+
+
+@contextmanager
+def trace_queries(name, budget=None):
+    trace, token = begin_trace(name, budget)
+    try:
+        yield trace
+    finally:
+        end_trace(token)
+
+
+def record_query(backend, table, operation, shape, duration, rows):
+    """Adds a query to the active trace and the traces around it; returns the record, or None."""
+    trace = _current.get()
+    if trace is None:
+        return None
+    query = {"backend": backend, "table": table, "operation": operation, "shape": shape,
+             "duration_ms": round(duration * 1000, 3), "rows": rows}
+    while trace is not None:
+        trace.queries.append(query)
+        trace = trace.parent
+    return query
+
+
+# -------------------------------------------
+# ✅ Supabase: wrap the client's query builders
+# -------------------------------------------
+_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+
+class _TracedQuery:
+    """A PostgREST query builder that records its execute() in the active trace."""
+
+    def __init__(self, query, table, operation, steps=()):
+        self._query = query
+        self._table = table
+        self._operation = operation
+        self._steps = steps  # filters and modifiers, without their values
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            if name in _OPERATIONS:
+                return _TracedQuery(result, self._table, name, self._steps)
+            step = f"{name}({args[0]})" if args and isinstance(args[0], str) else name
+            return _TracedQuery(result, self._table, self._operation, self._steps + (step,))
+
+        return call
+
+    def execute(self):
+        started = time.perf_counter()
+        response = self._query.execute()
+        if inspect.isawaitable(response):  # builders of the async client (supabase.AsyncClient)
+            return self._finish_async(response, started)
+        return self._record(response, started)
+
+    async def _finish_async(self, pending, started):
+        return self._record(await pending, started)
+
+    def _record(self, response, started):
+        data = response.data
+        rows = len(data) if isinstance(data, list) else int(data is not None)
+        record_query("supabase", self._table, self._operation,
+                     " ".join((self._operation, self._table) + self._steps), time.perf_counter() - started, rows)
+        return response
+
+
+class TracedClient:
+    """Supabase client (sync or async) whose table() and rpc() queries are recorded in the active trace."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def table(self, name):
+        return _TracedQuery(self.client.table(name), name, "select")
+
+    from_ = table
+
+    def rpc(self, name, params=None, **kwargs):
+        return _TracedQuery(self.client.rpc(name, params or {}, **kwargs), name, "rpc")
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def traced_client(client):
+    return TracedClient(client) if QUERY_TRACING else client
+
+
+# -------------------------------------------
+# ✅ SQLite: a connection factory whose cursors record their statements
+# -------------------------------------------
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+([\w\"]+)", re.IGNORECASE)
+_ROW_COUNTED = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+
+def _describe_sql(sql):
+    operation = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    match = _SQL_TABLE.search(sql)
+    return operation.lower(), match.group(1).strip('"') if match else None
+
+
+class TracedCursor(sqlite3.Cursor):
+    _query = None
+
+    def _record(self, sql, started):
+        operation, table = _describe_sql(sql)
+        rows = self.rowcount if operation.upper() in _ROW_COUNTED and self.rowcount >= 0 else 0
+        self._query = record_query("sqlite", table, operation, " ".join(sql.split()), time.perf_counter() - started,
+                                   rows)
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        if _current.get() is not None:
+            self._record(sql, started)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        if _current.get() is not None:
+            self._record(sql, started)
+        return self
+
+    def _fetched(self, rows, started):
+        # SELECTs do most of their work while rows are fetched
+        if self._query is not None and rows:
+            self._query["rows"] += len(rows)
+            self._query["duration_ms"] = round(self._query["duration_ms"] + (time.perf_counter() - started) * 1000, 3)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        return self._fetched(super().fetchall(), started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        return self._fetched(super().fetchmany(self.arraysize if size is None else size), started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched([row] if row is not None else [], started)
+        return row
+
+
+class TracedConnection(sqlite3.Connection):
+    """Pass as sqlite3.connect(..., factory=TracedConnection)."""
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or TracedCursor)
+
+    # The C shortcuts would skip TracedCursor.execute
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+SQLITE_CONNECTION_FACTORY = TracedConnection if QUERY_TRACING else sqlite3.Connection
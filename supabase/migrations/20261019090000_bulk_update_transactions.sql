@@ -0,0 +1,41 @@
+-- Applies a whole batch of category / ignore updates to transactions in one
+-- statement, so bulk categorization from the review page is one round trip.
+--
+-- `updates` is a JSON array of objects with a transaction_id plus any of
+-- user_category_id, user_subcategory_id, is_ignored and ignored (the legacy
+-- flag written by api.py). Columns whose key is absent are left unchanged.
+-- Returns the rows that were found and updated; callers report every other
+-- transaction_id in the batch as not found.
+--
+-- The legacy `ignored` column only exists on databases that api.py wrote to
+-- before is_ignored, so it is only set when it is there (as in the work_queue
+-- migration).
+do $$
+declare
+  legacy_ignored text := '';
+begin
+  if exists (
+    select 1 from information_schema.columns
+    where table_schema = 'public' and table_name = 'transactions' and column_name = 'ignored'
+  ) then
+    legacy_ignored := ',
+      ignored             = case when u.patch ? ''ignored''             then r.ignored             else t.ignored end';
+  end if;
+
+  execute format($function$
+    create or replace function public.bulk_update_transactions(updates jsonb)
+    returns table (transaction_id text, date text)
+    language sql
+    as $body$
+      update public.transactions t
+      set user_category_id    = case when u.patch ? 'user_category_id'    then r.user_category_id    else t.user_category_id end,
+          user_subcategory_id = case when u.patch ? 'user_subcategory_id' then r.user_subcategory_id else t.user_subcategory_id end,
+          is_ignored          = case when u.patch ? 'is_ignored'          then r.is_ignored          else t.is_ignored end%s
+      from jsonb_array_elements(updates) as u(patch)
+      cross join lateral jsonb_populate_record(null::public.transactions, u.patch) as r
+      where t.transaction_id = r.transaction_id
+      returning t.transaction_id::text, t.date::text;
+    $body$;
+  $function$, legacy_ignored);
+end;
+$$;
@@ -0,0 +1,107 @@
+-- Splits one or more transactions atomically.
+--
+-- `requests` is a JSON array of {"transaction_id": ..., "splits": [...]}, where
+-- each split carries amount and optionally date, name, user_category_id and
+-- user_subcategory_id. For every parent the function checks that the splits
+-- total the parent amount, inserts the children as <parent>-split-<n> and marks
+-- the parent is_ignored / is_split. Everything runs in the caller's
+-- transaction, so any failure rolls back the whole batch.
+--
+-- Retries are safe: a parent that is already split is reported as
+-- "already_split" and left untouched, and child ids are deterministic, so
+-- leftovers from an interrupted non-atomic split are overwritten, not
+-- duplicated. Leftover children numbered above the new split count are
+-- deleted, so the children always total the parent.
+create or replace function public.split_transactions(requests jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+  req jsonb;
+  parent public.transactions%rowtype;
+  split_count integer;
+  split_total numeric;
+  missing_amounts integer;
+  results jsonb := '[]'::jsonb;
+begin
+  for req in select value from jsonb_array_elements(requests) loop
+    select * into parent
+      from public.transactions
+     where transaction_id = req->>'transaction_id'
+       for update;
+
+    if not found then
+      raise exception 'Transaction % not found', req->>'transaction_id'
+        using errcode = 'P0002';
+    end if;
+
+    if parent.is_split then
+      results := results || jsonb_build_object(
+        'transaction_id', parent.transaction_id,
+        'date', parent.date,
+        'status', 'already_split');
+      continue;
+    end if;
+
+    select count(*), coalesce(sum(r.amount), 0), count(*) filter (where r.amount is null)
+      into split_count, split_total, missing_amounts
+      from jsonb_array_elements(coalesce(req->'splits', '[]'::jsonb)) as s(split)
+      cross join lateral jsonb_populate_record(null::public.transactions, s.split) as r;
+
+    if split_count = 0 or missing_amounts > 0 then
+      raise exception 'Every split of transaction % needs an amount', parent.transaction_id
+        using errcode = '22023';
+    end if;
+
+    if round(split_total::numeric, 2) <> round(parent.amount::numeric, 2) then
+      raise exception 'Split amounts for transaction % must total %', parent.transaction_id, parent.amount
+        using errcode = '22023';
+    end if;
+
+    insert into public.transactions (
+      transaction_id, parent_transaction_id, date, name, amount, account_id,
+      user_category_id, user_subcategory_id, is_ignored, is_split)
+    select parent.transaction_id || '-split-' || s.idx,
+           parent.transaction_id,
+           coalesce(r.date, parent.date),
+           coalesce(r.name, parent.name),
+           r.amount,
+           parent.account_id,
+           r.user_category_id,
+           r.user_subcategory_id,
+           false,
+           false
+      from jsonb_array_elements(req->'splits') with ordinality as s(split, idx)
+      cross join lateral jsonb_populate_record(null::public.transactions, s.split) as r
+    on conflict (transaction_id) do update
+      set parent_transaction_id = excluded.parent_transaction_id,
+          date = excluded.date,
+          name = excluded.name,
+          amount = excluded.amount,
+          account_id = excluded.account_id,
+          user_category_id = excluded.user_category_id,
+          user_subcategory_id = excluded.user_subcategory_id,
+          is_ignored = false,
+          is_split = false;
+
+    delete from public.transactions
+     where parent_transaction_id = parent.transaction_id
+       and left(transaction_id, length(parent.transaction_id) + 7) = parent.transaction_id || '-split-'
+       and substr(transaction_id, length(parent.transaction_id) + 8) ~ '^[0-9]+$'
+       and substr(transaction_id, length(parent.transaction_id) + 8)::integer > split_count;
+
+    update public.transactions
+       set is_ignored = true,
+           is_split = true
+     where transaction_id = parent.transaction_id;
+
+    results := results || jsonb_build_object(
+      'transaction_id', parent.transaction_id,
+      'date', parent.date,
+      'status', 'split',
+      'splits', split_count);
+  end loop;
+
+  return results;
+end;
+$$;
@@ -0,0 +1,110 @@
+-- Per-month spending totals by category and subcategory, kept up to date by a
+-- trigger on transactions so the summary endpoints read a handful of rollup
+-- rows instead of re-aggregating every transaction of the month.
+--
+-- A transaction counts towards its month when it has a user_category_id and
+-- is not ignored. Split parents are marked is_ignored by split_transactions,
+-- so their children replace them in the totals.
+create table if not exists public.category_monthly_rollups (
+  year              integer not null,
+  month             integer not null,
+  category_id       bigint  not null,
+  subcategory_id    bigint,
+  total_amount      numeric not null default 0,
+  transaction_count integer not null default 0,
+  unique nulls not distinct (year, month, category_id, subcategory_id)
+);
+
+create or replace function public.apply_transaction_rollup()
+returns trigger
+language plpgsql
+as $$
+begin
+  -- Take the old row's contribution out of its month...
+  if tg_op in ('UPDATE', 'DELETE')
+     and old.user_category_id is not null
+     and not coalesce(old.is_ignored, false)
+     and old.date is not null then
+    update public.category_monthly_rollups r
+    set total_amount      = r.total_amount - coalesce(old.amount, 0),
+        transaction_count = r.transaction_count - 1
+    where r.year = extract(year from old.date::date)
+      and r.month = extract(month from old.date::date)
+      and r.category_id = old.user_category_id
+      and r.subcategory_id is not distinct from old.user_subcategory_id;
+
+    delete from public.category_monthly_rollups r
+    where r.year = extract(year from old.date::date)
+      and r.month = extract(month from old.date::date)
+      and r.category_id = old.user_category_id
+      and r.subcategory_id is not distinct from old.user_subcategory_id
+      and r.transaction_count <= 0;
+  end if;
+
+  -- ...and add the new row's contribution to its (possibly different) month
+  if tg_op in ('INSERT', 'UPDATE')
+     and new.user_category_id is not null
+     and not coalesce(new.is_ignored, false)
+     and new.date is not null then
+    insert into public.category_monthly_rollups as r
+      (year, month, category_id, subcategory_id, total_amount, transaction_count)
+    values (
+      extract(year from new.date::date), extract(month from new.date::date),
+      new.user_category_id, new.user_subcategory_id, coalesce(new.amount, 0), 1
+    )
+    on conflict (year, month, category_id, subcategory_id) do update
+    set total_amount      = r.total_amount + excluded.total_amount,
+        transaction_count = r.transaction_count + 1;
+  end if;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists transactions_category_rollup on public.transactions;
+create trigger transactions_category_rollup
+after insert or delete or update of date, amount, user_category_id, user_subcategory_id, is_ignored
+on public.transactions
+for each row execute function public.apply_transaction_rollup();
+
+-- Backfill from the transactions already stored
+delete from public.category_monthly_rollups;
+insert into public.category_monthly_rollups
+  (year, month, category_id, subcategory_id, total_amount, transaction_count)
+select extract(year from date::date), extract(month from date::date),
+       user_category_id, user_subcategory_id, sum(coalesce(amount, 0)), count(*)
+from public.transactions
+where user_category_id is not null
+  and not coalesce(is_ignored, false)
+  and date is not null
+group by 1, 2, 3, 4;
+
+-- Summary rows for one month, read from the rollups. `reserve` limits the
+-- result to the reserve category (true) or everything else (false); null
+-- returns every category.
+create or replace function public.fetch_summary_rollup(month integer, year integer, reserve boolean default null)
+returns table (
+  category_id bigint,
+  category_name text,
+  subcategory_id bigint,
+  subcategory_name text,
+  total_amount numeric,
+  transaction_count integer
+)
+language sql
+stable
+as $$
+  select r.category_id,
+         c.name::text,
+         r.subcategory_id,
+         s.name::text,
+         round(r.total_amount, 2),
+         r.transaction_count
+  from public.category_monthly_rollups r
+  left join public.categories c on c.id = r.category_id
+  left join public.categories s on s.id = r.subcategory_id
+  where r.year = fetch_summary_rollup.year
+    and r.month = fetch_summary_rollup.month
+    and (reserve is null or (r.category_id = 9) = reserve)
+  order by c.name, s.name;
+$$;
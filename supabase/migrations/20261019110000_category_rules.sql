@@ -0,0 +1,22 @@
+-- Rules that categorize transactions automatically; see category_rules.py for
+-- how they are matched. plaid_sync.py applies the enabled rules to new
+-- transactions and the API's POST /rules/apply re-applies them to history.
+create table if not exists public.category_rules (
+  id                  bigint generated by default as identity primary key,
+  name                text,
+  priority            integer not null default 0,
+  merchant_contains   text,
+  plaid_category_id   text,
+  min_amount          numeric,
+  max_amount          numeric,
+  account_id          text,
+  user_category_id    bigint not null,
+  user_subcategory_id bigint,
+  is_enabled          boolean not null default true,
+  created_at          timestamptz not null default now()
+);
+
+-- Keyset pages of uncategorized history for the re-apply job
+create index if not exists transactions_uncategorized_idx
+  on public.transactions (transaction_id)
+  where user_category_id is null;
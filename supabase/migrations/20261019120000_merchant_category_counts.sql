@@ -0,0 +1,102 @@
+-- How often each merchant has been given each category, kept current by a
+-- trigger on transactions so category suggestions are a keyed lookup rather
+-- than a scan of past transactions.
+--
+-- Merchants are grouped by normalize_merchant(), which must match
+-- normalize_merchant() in api/utils/helpers.py.
+create or replace function public.normalize_merchant(merchant_name text, name text)
+returns text
+language sql
+immutable
+as $$
+  select nullif(btrim(regexp_replace(lower(coalesce(nullif(btrim(merchant_name), ''), name, '')), '[^a-z]+', ' ', 'g')), '');
+$$;
+
+create table if not exists public.merchant_category_counts (
+  merchant_key      text    not null,
+  category_id       bigint  not null,
+  subcategory_id    bigint,
+  transaction_count integer not null default 0,
+  unique nulls not distinct (merchant_key, category_id, subcategory_id)
+);
+
+create or replace function public.apply_merchant_category_count()
+returns trigger
+language plpgsql
+as $$
+declare
+  old_key text;
+  new_key text;
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    old_key := public.normalize_merchant(old.merchant_name, old.name);
+    if old_key is not null and old.user_category_id is not null and not coalesce(old.is_ignored, false) then
+      update public.merchant_category_counts m
+      set transaction_count = m.transaction_count - 1
+      where m.merchant_key = old_key
+        and m.category_id = old.user_category_id
+        and m.subcategory_id is not distinct from old.user_subcategory_id;
+
+      delete from public.merchant_category_counts m
+      where m.merchant_key = old_key
+        and m.category_id = old.user_category_id
+        and m.subcategory_id is not distinct from old.user_subcategory_id
+        and m.transaction_count <= 0;
+    end if;
+  end if;
+
+  if tg_op in ('INSERT', 'UPDATE') then
+    new_key := public.normalize_merchant(new.merchant_name, new.name);
+    if new_key is not null and new.user_category_id is not null and not coalesce(new.is_ignored, false) then
+      insert into public.merchant_category_counts as m
+        (merchant_key, category_id, subcategory_id, transaction_count)
+      values (new_key, new.user_category_id, new.user_subcategory_id, 1)
+      on conflict (merchant_key, category_id, subcategory_id) do update
+      set transaction_count = m.transaction_count + 1;
+    end if;
+  end if;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists transactions_merchant_category_count on public.transactions;
+create trigger transactions_merchant_category_count
+after insert or delete or update of merchant_name, name, user_category_id, user_subcategory_id, is_ignored
+on public.transactions
+for each row execute function public.apply_merchant_category_count();
+
+-- Backfill from the transactions already categorized
+delete from public.merchant_category_counts;
+insert into public.merchant_category_counts (merchant_key, category_id, subcategory_id, transaction_count)
+select public.normalize_merchant(merchant_name, name), user_category_id, user_subcategory_id, count(*)
+from public.transactions
+where user_category_id is not null
+  and not coalesce(is_ignored, false)
+  and public.normalize_merchant(merchant_name, name) is not null
+group by 1, 2, 3;
+
+-- Top `k` categories for each merchant key, with the merchant's total count
+-- so callers can turn counts into a confidence.
+create or replace function public.suggest_categories(merchant_keys text[], k integer default 3)
+returns table (
+  merchant_key text,
+  category_id bigint,
+  subcategory_id bigint,
+  transaction_count integer,
+  merchant_total bigint
+)
+language sql
+stable
+as $$
+  select ranked.merchant_key, ranked.category_id, ranked.subcategory_id, ranked.transaction_count, ranked.merchant_total
+  from (
+    select m.*,
+           sum(m.transaction_count) over (partition by m.merchant_key) as merchant_total,
+           row_number() over (partition by m.merchant_key order by m.transaction_count desc, m.category_id) as rank
+    from public.merchant_category_counts m
+    where m.merchant_key = any(merchant_keys)
+  ) ranked
+  where ranked.rank <= k
+  order by ranked.merchant_key, ranked.rank;
+$$;
@@ -0,0 +1,35 @@
+-- Full-text search over transaction names and merchants for
+-- GET /transactions/search. The index is on an expression of the row itself,
+-- so every insert and update (plaid_sync.py, /manual-add, the API) keeps it in
+-- sync without triggers or an extra column in `select *` responses.
+create or replace function public.transaction_search_document(name text, merchant_name text)
+returns tsvector
+language sql
+immutable
+as $$
+  select to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(merchant_name, ''));
+$$;
+
+create index if not exists transactions_search_idx
+  on public.transactions
+  using gin (public.transaction_search_document(name, merchant_name));
+
+-- `terms` are lowercase words (see search_terms in api/utils/helpers.py); each
+-- must prefix-match a word of the name or merchant. Best matches come first.
+create or replace function public.search_transactions(terms text[], max_results integer default 50)
+returns setof jsonb
+language sql
+stable
+as $$
+  with query as (
+    select to_tsquery('simple', string_agg(quote_literal(term) || ':*', ' & ')) as q
+    from unnest(terms) as term
+  )
+  select to_jsonb(t) || jsonb_build_object(
+           'rank', ts_rank(public.transaction_search_document(t.name, t.merchant_name), query.q)
+         )
+  from public.transactions t, query
+  where public.transaction_search_document(t.name, t.merchant_name) @@ query.q
+  order by ts_rank(public.transaction_search_document(t.name, t.merchant_name), query.q) desc, t.date desc
+  limit max_results;
+$$;
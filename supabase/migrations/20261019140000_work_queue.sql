@@ -0,0 +1,158 @@
+-- Work queue over transactions that still need a category, for the
+-- /work-queue endpoints. A transaction is unprocessed when user_category_id is
+-- null and is_ignored is not true; every function below uses exactly that
+-- predicate so Postgres can answer from the partial index.
+
+-- api.py used to flag ignored rows in the legacy `ignored` column only
+do $$
+begin
+  if exists (
+    select 1 from information_schema.columns
+    where table_schema = 'public' and table_name = 'transactions' and column_name = 'ignored'
+  ) then
+    update public.transactions
+    set is_ignored = true
+    where ignored::text in ('true', 'split') and is_ignored is not true;
+  end if;
+end;
+$$;
+
+create index if not exists transactions_work_queue_idx
+  on public.transactions (date, transaction_id)
+  where user_category_id is null and is_ignored is not true;
+
+-- Items handed to a reviewer; other claims skip them until expires_at
+create table if not exists public.work_queue_claims (
+  transaction_id text primary key,
+  claim_id       uuid not null,
+  claimed_by     text,
+  expires_at     timestamptz not null
+);
+
+create index if not exists work_queue_claims_claim_idx on public.work_queue_claims (claim_id);
+
+create or replace function public.work_queue_count()
+returns table (unprocessed bigint, claimed bigint)
+language sql
+stable
+as $$
+  select
+    (select count(*) from public.transactions t
+     where t.user_category_id is null and t.is_ignored is not true),
+    (select count(*) from public.work_queue_claims c
+     where c.expires_at > now()
+       and exists (select 1 from public.transactions t
+                   where t.transaction_id = c.transaction_id
+                     and t.user_category_id is null and t.is_ignored is not true));
+$$;
+
+-- One page of the queue, oldest first (or newest first), after the item
+-- whose transaction_id is `after_id`.
+create or replace function public.work_queue_page(newest boolean, after_id text, max_items integer)
+returns setof public.transactions
+language plpgsql
+stable
+as $$
+begin
+  if newest then
+    return query
+      select t.* from public.transactions t
+      where t.user_category_id is null and t.is_ignored is not true
+        and (after_id is null or (t.date, t.transaction_id) <
+             (select c.date, c.transaction_id from public.transactions c where c.transaction_id = after_id))
+      order by t.date desc, t.transaction_id desc
+      limit max_items;
+  else
+    return query
+      select t.* from public.transactions t
+      where t.user_category_id is null and t.is_ignored is not true
+        and (after_id is null or (t.date, t.transaction_id) >
+             (select c.date, c.transaction_id from public.transactions c where c.transaction_id = after_id))
+      order by t.date, t.transaction_id
+      limit max_items;
+  end if;
+end;
+$$;
+
+-- Claims up to `max_items` unclaimed items for `lease_seconds`. Concurrent
+-- callers never receive the same item (skip locked + the claims primary key).
+create or replace function public.claim_work_queue(
+  p_claim_id uuid, p_worker text, max_items integer, newest boolean, lease_seconds integer
+)
+returns setof public.transactions
+language plpgsql
+as $$
+declare
+  picked text[];
+begin
+  delete from public.work_queue_claims where expires_at <= now();
+
+  if newest then
+    select array_agg(q.transaction_id) into picked from (
+      select t.transaction_id from public.transactions t
+      where t.user_category_id is null and t.is_ignored is not true
+        and not exists (select 1 from public.work_queue_claims c where c.transaction_id = t.transaction_id)
+      order by t.date desc, t.transaction_id desc
+      limit max_items
+      for update of t skip locked
+    ) q;
+  else
+    select array_agg(q.transaction_id) into picked from (
+      select t.transaction_id from public.transactions t
+      where t.user_category_id is null and t.is_ignored is not true
+        and not exists (select 1 from public.work_queue_claims c where c.transaction_id = t.transaction_id)
+      order by t.date, t.transaction_id
+      limit max_items
+      for update of t skip locked
+    ) q;
+  end if;
+
+  insert into public.work_queue_claims (transaction_id, claim_id, claimed_by, expires_at)
+  select id, p_claim_id, p_worker, now() + make_interval(secs => lease_seconds)
+  from unnest(coalesce(picked, '{}')) as id
+  on conflict (transaction_id) do nothing;
+
+  return query
+    select t.* from public.transactions t
+    join public.work_queue_claims c on c.transaction_id = t.transaction_id and c.claim_id = p_claim_id
+    order by t.date, t.transaction_id;
+end;
+$$;
+
+-- Applies updates (same shape as bulk_update_transactions) for items still
+-- held by the claim and releases them. Returns the rows that were updated;
+-- items whose claim expired or belongs to someone else are left untouched.
+create or replace function public.complete_work_queue(p_claim_id uuid, updates jsonb)
+returns table (transaction_id text, date text)
+language plpgsql
+as $$
+declare
+  held text[];
+begin
+  with released as (
+    delete from public.work_queue_claims c
+    where c.claim_id = p_claim_id
+      and c.expires_at > now()
+      and c.transaction_id in (select u ->> 'transaction_id' from jsonb_array_elements(updates) u)
+    returning c.transaction_id
+  )
+  select array_agg(released.transaction_id) into held from released;
+
+  return query
+    select * from public.bulk_update_transactions((
+      select coalesce(jsonb_agg(u), '[]'::jsonb)
+      from jsonb_array_elements(updates) u
+      where u ->> 'transaction_id' = any(coalesce(held, '{}'))
+    ));
+end;
+$$;
+
+create or replace function public.release_work_queue(p_claim_id uuid)
+returns integer
+language sql
+as $$
+  with released as (
+    delete from public.work_queue_claims where claim_id = p_claim_id returning 1
+  )
+  select count(*)::integer from released;
+$$;
@@ -0,0 +1,8 @@
+-- One row per Plaid item with the /transactions/sync cursor reached so far.
+-- plaid_sync.sync_item() reads the cursor, applies the changes since then and
+-- stores the new cursor, so webhook-driven syncs only fetch what changed.
+create table if not exists public.plaid_items (
+  item_id    text primary key,
+  cursor     text,
+  updated_at timestamptz not null default now()
+);
@@ -0,0 +1,55 @@
+-- Server-side filters and keyset pages for /logs, plus the retention job
+-- (api/utils/log_retention.py) that folds old INFO/DEBUG rows into hourly
+-- counts so the logs table stops growing without bound.
+
+-- Newest first by (created_at, id), optionally per severity or route
+create index if not exists logs_created_id_idx on public.logs (created_at desc, id desc);
+create index if not exists logs_severity_created_idx on public.logs (severity, created_at desc, id desc);
+create index if not exists logs_route_created_idx on public.logs (route, created_at desc, id desc);
+
+create table if not exists public.log_rollups (
+  hour     timestamptz not null,
+  severity text not null,
+  service  text not null default '',
+  route    text not null default '',
+  count    bigint not null,
+  primary key (hour, severity, service, route)
+);
+
+-- Deletes up to `max_rows` logs older than `before` with one of `severities`
+-- and adds them to log_rollups in the same statement; returns how many.
+create or replace function public.compact_logs(before timestamptz, severities text[], max_rows integer)
+returns integer
+language plpgsql
+as $$
+declare
+  removed integer;
+begin
+  with doomed as (
+    select l.ctid from public.logs l
+    where l.created_at < before and l.severity = any(severities)
+    limit max_rows
+  ),
+  deleted as (
+    delete from public.logs l
+    using doomed d
+    where l.ctid = d.ctid
+    returning l.created_at, l.severity, l.service, l.route
+  ),
+  counted as (
+    select date_trunc('hour', created_at) as hour, severity,
+           coalesce(service, '') as service, coalesce(route, '') as route, count(*) as count
+    from deleted
+    group by 1, 2, 3, 4
+  ),
+  upserted as (
+    insert into public.log_rollups as r (hour, severity, service, route, count)
+    select * from counted
+    on conflict (hour, severity, service, route) do update set count = r.count + excluded.count
+    returning 1
+  )
+  -- Data-modifying CTEs always run, so `upserted` needs no reference
+  select coalesce(sum(c.count), 0) into removed from counted c;
+  return removed;
+end;
+$$;
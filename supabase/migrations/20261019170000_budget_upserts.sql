@@ -0,0 +1,62 @@
+-- One budget per category and month, so set_budget can write with a single
+-- upsert, and copy_budgets() to set up a month from another in one call.
+
+-- Earlier select-then-insert writes could race and leave duplicates; keep
+-- the lowest id, which is the row those writes used to update
+delete from public.budgets b
+using public.budgets d
+where b.month = d.month and b.year = d.year and b.category_id = d.category_id
+  and b.id > d.id;
+
+do $$
+begin
+  if not exists (
+    select 1 from pg_constraint
+    where conname = 'budgets_month_year_category_key' and conrelid = 'public.budgets'::regclass
+  ) then
+    alter table public.budgets
+      add constraint budgets_month_year_category_key unique (month, year, category_id);
+  end if;
+end;
+$$;
+
+-- Copies every budget of one month into another, amounts multiplied by
+-- p_scale. Budgets already set in the target month are kept unless
+-- p_overwrite. Returns the rows written.
+create or replace function public.copy_budgets(
+  p_from_month integer, p_from_year integer, p_to_month integer, p_to_year integer,
+  p_scale numeric default 1, p_overwrite boolean default false
+)
+returns setof public.budgets
+language plpgsql
+as $$
+begin
+  if p_scale < 0 then
+    raise exception 'scale must be non-negative' using errcode = '22023';
+  end if;
+
+  if p_overwrite then
+    return query
+      with written as (
+        insert into public.budgets as b (month, year, category_id, budgeted_amount)
+        select p_to_month, p_to_year, s.category_id, round((s.budgeted_amount * p_scale)::numeric, 2)
+        from public.budgets s
+        where s.month = p_from_month and s.year = p_from_year
+        on conflict (month, year, category_id) do update set budgeted_amount = excluded.budgeted_amount
+        returning b.*
+      )
+      select * from written;
+  else
+    return query
+      with written as (
+        insert into public.budgets as b (month, year, category_id, budgeted_amount)
+        select p_to_month, p_to_year, s.category_id, round((s.budgeted_amount * p_scale)::numeric, 2)
+        from public.budgets s
+        where s.month = p_from_month and s.year = p_from_year
+        on conflict (month, year, category_id) do nothing
+        returning b.*
+      )
+      select * from written;
+  end if;
+end;
+$$;
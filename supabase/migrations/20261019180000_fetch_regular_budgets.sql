@@ -0,0 +1,24 @@
+-- /budgets/regular in one round trip: a month's budgets outside the reserve
+-- (id 9) hierarchy, joined to their category and its parent. Rows have the
+-- same columns as fetch_reserve_budgets (see _BUDGETS_SQL in
+-- api/storage/sqlite_repository.py). Replaces listing every category id and
+-- sending them back in an in() filter.
+create or replace function public.fetch_regular_budgets(p_month integer, p_year integer)
+returns setof jsonb
+language sql
+stable
+as $$
+  select to_jsonb(b) || jsonb_build_object(
+           'category_name', c.name,
+           'parent_id', c.parent_id,
+           'parent_name', p.name,
+           'is_reserve', false
+         )
+  from public.budgets b
+  join public.categories c on c.id = b.category_id
+  left join public.categories p on p.id = c.parent_id
+  where b.month = p_month and b.year = p_year
+    and b.category_id <> 9
+    and c.parent_id is distinct from 9
+  order by p.name nulls first, c.name nulls first;  -- same order as SQLite
+$$;
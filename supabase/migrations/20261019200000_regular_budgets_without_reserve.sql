@@ -0,0 +1,25 @@
+-- /budgets/regular uses the same test as is_reserve in _BUDGETS_SQL
+-- (api/storage/sqlite_repository.py): a budget is reserve when it is on
+-- category 9 or one of its children, and regular otherwise, including budgets
+-- on categories that no longer exist. fetch_reserve_budgets is the API's
+-- original RPC and is left as it is.
+
+create or replace function public.fetch_regular_budgets(p_month integer, p_year integer)
+returns setof jsonb
+language sql
+stable
+as $$
+  select to_jsonb(b) || jsonb_build_object(
+           'category_name', c.name,
+           'parent_id', c.parent_id,
+           'parent_name', p.name,
+           'is_reserve', false
+         )
+  from public.budgets b
+  left join public.categories c on c.id = b.category_id
+  left join public.categories p on p.id = c.parent_id
+  where b.month = p_month and b.year = p_year
+    and b.category_id <> 9
+    and c.parent_id is distinct from 9
+  order by p.name nulls first, c.name nulls first;
+$$;
@@ -0,0 +1,54 @@
+-- Fold diacritics in transaction search, as the SQLite backend's FTS5 table
+-- does (tokenize='unicode61 remove_diacritics 2'): "cafe" finds "Café" and
+-- "CAFÉ" finds "cafe" on both backends.
+create extension if not exists unaccent with schema extensions;
+
+-- unaccent() is only stable (its dictionary could change), so it can't be used
+-- in an index expression. Naming the dictionary explicitly makes the result
+-- fixed, which is what lets this wrapper be declared immutable.
+create or replace function public.immutable_unaccent(value text)
+returns text
+language sql
+immutable
+parallel safe
+strict
+as $$
+  select extensions.unaccent('extensions.unaccent'::regdictionary, value);
+$$;
+
+-- The index holds the old documents, so drop it before changing the function
+-- and build it again afterwards.
+drop index if exists public.transactions_search_idx;
+
+create or replace function public.transaction_search_document(name text, merchant_name text)
+returns tsvector
+language sql
+immutable
+as $$
+  select to_tsvector(
+    'simple', public.immutable_unaccent(coalesce(name, '') || ' ' || coalesce(merchant_name, ''))
+  );
+$$;
+
+create index if not exists transactions_search_idx
+  on public.transactions
+  using gin (public.transaction_search_document(name, merchant_name));
+
+-- Same as before, with the terms folded the same way as the documents
+create or replace function public.search_transactions(terms text[], max_results integer default 50)
+returns setof jsonb
+language sql
+stable
+as $$
+  with query as (
+    select to_tsquery('simple', string_agg(quote_literal(public.immutable_unaccent(term)) || ':*', ' & ')) as q
+    from unnest(terms) as term
+  )
+  select to_jsonb(t) || jsonb_build_object(
+           'rank', ts_rank(public.transaction_search_document(t.name, t.merchant_name), query.q)
+         )
+  from public.transactions t, query
+  where public.transaction_search_document(t.name, t.merchant_name) @@ query.q
+  order by ts_rank(public.transaction_search_document(t.name, t.merchant_name), query.q) desc, t.date desc
+  limit max_results;
+$$;
@@ -0,0 +1,44 @@
+import numpy as np
+
+from utils.analytics import SpendingFrame, month_index, rolling_mean
+
+
+def test_monthly_totals_and_rolling_mean():
+    frame = SpendingFrame.from_columns({
+        "date": ["2025-01-05", "2025-01-20", "2025-02-01", "2025-03-31", "2024-12-31"],
+        "amount": [10.0, 5.0, 20.0, 30.0, 99.0],
+        "user_category_id": [1, 2, 1, 1, 1],
+        "user_subcategory_id": [3, None, 3, 4, 3],
+    })
+    keys, totals = frame.monthly_totals(month_index(2025, 1), month_index(2025, 3))
+    assert keys.tolist() == [1, 2]
+    assert totals.tolist() == [[10.0, 20.0, 30.0], [5.0, 0.0, 0.0]]
+
+    keys, totals = frame.monthly_totals(month_index(2025, 1), month_index(2025, 3), by="subcategory", keys=[4, 2])
+    assert totals.tolist() == [[0.0, 0.0, 30.0], [5.0, 0.0, 0.0]]
+    assert rolling_mean(np.array([[3.0, 6.0, 9.0, 12.0]]), 2).tolist() == [[3.0, 4.5, 7.5, 10.5]]
+
+
+def test_trends_and_budget_variance_endpoints(repository, client):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "a", "date": "2024-03-10", "amount": 40.0, "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "b", "date": "2025-02-10", "amount": 20.0, "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "c", "date": "2025-03-10", "amount": 60.0, "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "d", "date": "2025-03-11", "amount": 500.0, "user_category_id": 1, "is_ignored": True},
+    ])
+    repository.upsert_rows("budgets", [{"id": 1, "month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 50}])
+
+    trends = client.get("/analytics/trends?start=2025-02&end=2025-03&window=2").json
+    assert trends["months"] == ["2025-02", "2025-03"]
+    [food] = trends["series"]
+    assert food["category_name"] == "Food"
+    assert food["totals"] == [20.0, 60.0]
+    assert food["rolling_mean"] == [10.0, 40.0]
+    assert food["yoy_change"] == [20.0, 20.0]
+
+    [groceries] = client.get("/analytics/budget-variance?start=2025-03&end=2025-03").json["series"]
+    assert (groceries["category_name"], groceries["variance"]) == ("Groceries", [-10.0])
+
+    assert client.get("/analytics/trends?start=2025-03&end=2025-01").status_code == 400
+    assert client.get("/analytics/trends?start=2025-13&end=2026-01").status_code == 400
@@ -0,0 +1,153 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from supabase import acreate_client
+from supabase.lib.client_options import AsyncClientOptions
+
+from asgi import create_asgi_app
+from storage.async_repository import AsyncSupabaseRepository
+from storage.errors import StorageError
+from utils.cache import rpc_cache
+
+READ_PATHS = [
+    "/accounts", "/categories", "/categories/main", "/categories/sub/9", "/transactions",
+    "/unprocessed-transactions", "/processed-transactions", "/budgets?month=3&year=2025",
+    "/budgets/regular?month=3&year=2025", "/budgets/all?month=3&year=2025", "/summary?month=3&year=2025",
+    "/summary/regular?month=3&year=2025", "/summary/reserve?month=3&year=2025", "/budgets?month=3",
+    "/summary/rollup?month=3&year=2025&scope=reserve",
+]
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [
+        {"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1},
+        {"id": 9, "name": "Reserve"}, {"id": 10, "name": "Car", "parent_id": 9},
+    ])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "t1", "date": "2025-03-02", "name": "Market", "amount": 20.0,
+         "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "t2", "date": "2025-03-05", "name": "Garage", "amount": 80.0},
+    ])
+    repository.upsert_rows("budgets", [
+        {"id": 1, "month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 150},
+    ])
+    return repository
+
+
+@pytest.fixture
+def api(repository):
+    return create_asgi_app(repository=repository)
+
+
+def _request(app, method, path, **kwargs):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, **kwargs)
+    return asyncio.run(send())
+
+
+def test_async_routes_match_the_flask_routes(api):
+    flask_client = api.flask_app.test_client()
+    for path in READ_PATHS:
+        expected = flask_client.get(path)
+        response = _request(api, "GET", path)
+        assert response.status_code == expected.status_code, path
+        assert response.json() == expected.json, path
+
+
+def test_dashboard_awaits_every_part(api):
+    response = _request(api, "GET", "/dashboard?month=3&year=2025")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["errors"] == {}
+    assert set(body["timings_ms"]) == {"budgets", "regular_summary", "reserve_summary", "categories", "accounts"}
+    assert [row["category_id"] for row in body["regular_summary"]] == [1]
+
+
+def test_native_routes_report_their_queries_like_flask(api):
+    flask_client = api.flask_app.test_client()
+    paths = ["/accounts", "/budgets/regular?month=3&year=2025"]
+
+    async def run():
+        # One worker thread, whose SQLite connection the first request opens (those PRAGMAs count too)
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://test") as client:
+            await client.get("/accounts")
+            responses = []
+            for path in paths + ["/dashboard?month=3&year=2025"]:
+                rpc_cache.clear()
+                responses.append(await client.get(path))
+            return responses
+
+    *responses, dashboard = asyncio.run(run())
+    for path, response in zip(paths, responses):
+        rpc_cache.clear()
+        assert response.headers["x-query-count"] == flask_client.get(path).headers["X-Query-Count"] == "1", path
+        assert response.headers["server-timing"].startswith("db;dur="), path
+    assert dashboard.headers["x-query-count"] == "5"  # every part, though each runs in a worker thread
+
+
+def test_other_routes_and_methods_are_served_by_flask(api):
+    response = _request(api, "POST", "/update-transactions", json={"transactions": [
+        {"transaction_id": "t2", "user_category_id": 9, "user_subcategory_id": 10},
+    ]})
+    assert response.status_code == 200
+
+    summary = _request(api, "GET", "/summary/reserve?month=3&year=2025").json()
+    assert [(row["subcategory_id"], row["total_amount"]) for row in summary] == [(10, 80.0)]
+    assert _request(api, "GET", "/list-routes").status_code == 200
+    assert _request(api, "GET", "/no-such-route").status_code == 404
+
+
+def test_cors_headers_match_flask(api):
+    headers = {"Origin": "http://localhost:3000"}
+    native = _request(api, "GET", "/accounts", headers=headers).headers
+    flask = api.flask_app.test_client().get("/accounts", headers=headers).headers
+    assert native["access-control-allow-origin"] == flask["Access-Control-Allow-Origin"]
+    assert native["access-control-allow-credentials"] == flask["Access-Control-Allow-Credentials"]
+
+
+def test_async_supabase_repository_queries_postgrest():
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.url.path, dict(request.url.params)))
+        if request.url.path.endswith("/rpc/fetch_reserve_budgets"):
+            return httpx.Response(400, json={"code": "22023", "message": "bad month", "details": None, "hint": None})
+        return httpx.Response(200, json=[{"id": 1}])
+
+    async def run():
+        options = AsyncClientOptions(httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        repository = AsyncSupabaseRepository(await acreate_client("http://postgrest.test", "a.b.c", options),
+                                             max_concurrency=2)
+        rows = await asyncio.gather(*(repository.list_budgets(3, 2025) for _ in range(5)))
+        with pytest.raises(StorageError) as error:
+            await repository.fetch_reserve_budgets(13, 2025)
+        return rows, error.value
+
+    rows, error = asyncio.run(run())
+    assert rows == [[{"id": 1}]] * 5
+    assert seen[0] == ("GET", "/rest/v1/budgets", {"select": "*", "month": "eq.3", "year": "eq.2025"})
+    assert error.status == 400 and "bad month" in str(error)
+
+
+def test_lifespan_startup_builds_the_async_repository(api):
+    async def run():
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await api({"type": "lifespan"}, receive, send)
+        return sent
+
+    assert asyncio.run(run()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert api.repository.name == "sqlite"
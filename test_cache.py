@@ -0,0 +1,100 @@
+import pytest
+
+from utils.cache import RPCCache, cached_rpc, invalidate_transaction_months, rpc_cache
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    cache = RPCCache(max_entries=2, ttl=60)
+    cache.set(("fetch_summary", 1, 2025), "january")
+    cache.set(("fetch_summary", 2, 2025), "february")
+    assert cache.get(("fetch_summary", 1, 2025)) == (True, "january")  # now the most recent
+
+    cache.set(("fetch_summary", 3, 2025), "march")
+    assert cache.get(("fetch_summary", 2, 2025)) == (False, None)
+    assert len(cache) == 2
+
+    expired = RPCCache(ttl=-1)
+    expired.set(("fetch_summary", 1, 2025), "january")
+    assert expired.get(("fetch_summary", 1, 2025)) == (False, None) and len(expired) == 0
+
+
+def test_invalidation_drops_one_month_and_results_fetched_before_it():
+    cache = RPCCache()
+    cache.set(("fetch_summary", 3, 2025), "march")
+    cache.set(("fetch_all_budgets", 3, 2025), "march budgets")
+    cache.set(("fetch_summary", 4, 2025), "april")
+
+    generation = cache.generation(3, 2025)  # an RPC for March starts...
+    cache.invalidate_month(3, 2025)  # ...a write to March lands...
+    cache.set(("fetch_summary", 3, 2025), "stale march", generation)  # ...and its result is dropped
+    assert cache.get(("fetch_summary", 3, 2025)) == (False, None)
+    assert cache.get(("fetch_all_budgets", 3, 2025)) == (False, None)
+    assert cache.get(("fetch_summary", 4, 2025)) == (True, "april")
+
+    version = cache.version()
+    cache.clear()
+    assert len(cache) == 0 and cache.version() == version + 1
+
+
+def test_clear_drops_results_of_rpcs_in_flight_for_uncached_months():
+    rpc_cache.clear()
+
+    def fetch_across_a_clear():
+        rpc_cache.clear()  # e.g. a post-sync refresh lands while May is being fetched
+        return "stale may"
+
+    assert cached_rpc("fetch_summary", 5, 2025, fetch_across_a_clear) == "stale may"
+    assert rpc_cache.get(("fetch_summary", 5, 2025)) == (False, None)
+    assert cached_rpc("fetch_summary", 5, 2025, lambda: "may") == "may"
+    assert rpc_cache.get(("fetch_summary", 5, 2025)) == (True, "may")
+
+
+def test_cached_rpc_fetches_once_per_month_until_invalidated():
+    rpc_cache.clear()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [{"total_amount": len(calls)}]
+
+    assert cached_rpc("fetch_summary", 3, 2025, fetch) == [{"total_amount": 1}]
+    assert cached_rpc("fetch_summary", 3, 2025, fetch) == [{"total_amount": 1}]
+    assert len(calls) == 1
+
+    invalidate_transaction_months([{"transaction_id": "t1", "date": "2025-03-14"}])
+    assert cached_rpc("fetch_summary", 3, 2025, fetch) == [{"total_amount": 2}]
+
+    cached_rpc("fetch_summary", 4, 2025, fetch)
+    invalidate_transaction_months({"transaction_id": "t2", "date": "someday"})  # can't tell the month: drop all
+    assert len(rpc_cache) == 0
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "t1", "date": "2025-03-02", "name": "Market", "amount": 30.0},
+        {"transaction_id": "t2", "date": "2025-04-02", "name": "Market", "amount": 12.0},
+    ])
+    return repository
+
+
+def test_routes_serve_repeats_from_the_cache_and_writes_invalidate_it(client):
+    def summary(month):
+        response = client.get(f"/summary/regular?month={month}&year=2025")
+        return response.headers["X-Query-Count"], [row["total_amount"] for row in response.json]
+
+    assert summary(3) == ("1", [])
+    assert summary(4) == ("1", [])
+    assert summary(3) == ("0", [])  # served from the cache
+
+    # Categorizing a March transaction invalidates March only
+    client.post("/update-transactions", json={"transactions": [{"transaction_id": "t1", "user_category_id": 1}]})
+    assert summary(3) == ("1", [30.0])
+    assert summary(4) == ("0", [])
+
+    client.post("/budgets", json={"month": 4, "year": 2025, "category_id": 2, "budgeted_amount": 50})
+    assert summary(4)[0] == "1"
+
+    client.put("/categories/1", json={"name": "Food & Drink"})  # names appear in every month
+    assert summary(3)[0] == "1" and summary(4)[0] == "1"
@@ -0,0 +1,61 @@
+from category_rules import compile_rules, validate_rule
+from utils.jobs import job_runner
+from utils.rules import reapply_rules
+
+RULES = [
+    {"id": 1, "merchant_contains": "coffee", "user_category_id": 1, "user_subcategory_id": 11},
+    {"id": 2, "merchant_contains": "Blue Bottle Coffee", "priority": 5, "user_category_id": 1, "user_subcategory_id": 12},
+    {"id": 3, "plaid_category_id": "22001000", "min_amount": 20, "user_category_id": 2},
+    {"id": 4, "merchant_contains": "shell", "account_id": "card", "max_amount": 100, "user_category_id": 3},
+    {"id": 5, "merchant_contains": "coffee", "priority": 9, "user_category_id": 4, "is_enabled": False},
+]
+
+
+def test_rules_pick_the_best_matching_rule():
+    engine = compile_rules(RULES)
+    categorize = engine.categorize([
+        {"transaction_id": "a", "merchant_name": "BLUE BOTTLE COFFEE #12", "amount": 5},
+        {"transaction_id": "b", "name": "Corner coffee shop", "amount": 4},
+        {"transaction_id": "c", "name": "Uber", "plaid_category_id": "22001000", "amount": 25},
+        {"transaction_id": "d", "name": "Uber", "plaid_category_id": "22001000", "amount": 10},
+        {"transaction_id": "e", "name": "SHELL OIL 123", "account_id": "card", "amount": 40},
+        {"transaction_id": "f", "name": "SHELL OIL 123", "account_id": "checking", "amount": 40},
+        {"transaction_id": "g", "name": "Coffee", "user_category_id": 7},
+    ])
+    assert {tid: update["user_category_id"] for tid, update in categorize.items()} == {"a": 1, "b": 1, "c": 2, "e": 3}
+    assert categorize["a"]["user_subcategory_id"] == 12
+    assert categorize["b"]["user_subcategory_id"] == 11
+
+
+def test_apply_rules_to_history(repository, client):
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"t{i:03d}", "date": "2025-03-01", "name": name, "amount": 5.0, "is_ignored": False}
+        for i, name in enumerate(["Coffee Bar", "Grocer", "coffee cart"] * 5)
+    ] + [{"transaction_id": "manual", "date": "2025-03-01", "name": "Coffee", "user_category_id": 8}])
+
+    assert client.post("/rules", json={"user_category_id": 1}).status_code == 400
+    assert client.post("/rules", json={"merchant_contains": "coffee", "user_category_id": 1}).status_code == 201
+
+    result = reapply_rules(repository, page_size=4)  # several keyset pages
+    assert (result["scanned"], result["categorized"]) == (15, 10)
+
+    rows = {row["transaction_id"]: row["user_category_id"] for row in repository.list_transactions()}
+    assert rows["manual"] == 8
+    assert sum(1 for category in rows.values() if category == 1) == 10
+    # The endpoint queues the same pass as a job instead of holding the request
+    response = client.post("/rules/apply")
+    assert response.status_code == 202 and response.json["status_url"] == f"/jobs/{response.json['job_id']}"
+    job = job_runner.wait(response.json["job_id"], timeout=5)
+    assert job["status"] == "succeeded" and job["result"]["categorized"] == 0
+
+
+def test_rules_with_non_numeric_amounts_are_rejected(client):
+    assert validate_rule({"min_amount": "20", "user_category_id": 1}) == "min_amount must be a number"
+    assert validate_rule({"max_amount": True, "user_category_id": 1}) == "max_amount must be a number"
+    assert validate_rule({"min_amount": 5, "max_amount": 20.5, "user_category_id": 1}) is None
+
+    # Rows stored before the check are skipped instead of failing every match
+    engine = compile_rules([{"id": 1, "min_amount": "abc", "user_category_id": 1}])
+    assert len(engine) == 0 and engine.categorize([{"transaction_id": "a", "amount": 5}]) == {}
+
+    assert client.post("/rules", json={"merchant_contains": "x", "max_amount": "lots", "user_category_id": 1}).status_code == 400
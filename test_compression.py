@@ -0,0 +1,72 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from asgi import AsyncAPI
+from app import create_app
+from utils.compression import accepts_gzip
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"t{i:03d}", "date": "2025-03-02", "name": "Café Market", "amount": 10.5}
+        for i in range(100)
+    ])
+    return repository
+
+
+@pytest.fixture
+def app(repository):
+    return create_app(repository=repository)
+
+
+def test_large_responses_are_gzipped_when_accepted(app):
+    client = app.test_client()
+    plain = client.get("/transactions")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    compressed = client.get("/transactions", headers={"Accept-Encoding": "br, gzip;q=0.8"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(compressed.data) < len(plain.data) / 5
+    assert json.loads(gzip.decompress(compressed.data)) == plain.json
+
+
+def test_small_responses_and_refused_gzip_skip_compression(app):
+    client = app.test_client()
+    assert "Content-Encoding" not in client.get("/categories", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/transactions", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_accept_encoding_negotiation():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("*;q=0.5, gzip;q=0")
+    assert not accepts_gzip(None)
+
+
+def test_fast_encoder_matches_flask_encoder(app):
+    body = app.test_client().get("/transactions").data
+    assert body.endswith(b"\n") and b"Caf\xc3\xa9" in body  # UTF-8 rather than \u escapes
+    with app.app_context():
+        rows = app.extensions["repository"].list_transactions()
+        assert json.loads(body) == json.loads(json.dumps(rows))
+        assert app.json.loads(app.json.dumps({"b": 1, "a": [1, 2**70]})) == {"a": [1, 2**70], "b": 1}
+
+
+def test_asgi_native_routes_are_gzipped(app):
+    async def get(path, headers):
+        transport = httpx.ASGITransport(app=AsyncAPI(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+
+    response = asyncio.run(get("/transactions", {"Accept-Encoding": "gzip", "Origin": "http://localhost:3000"}))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding, Origin"
+    assert len(response.json()) == 100  # httpx decompresses
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+PARTS = {"budgets", "regular_summary", "reserve_summary", "categories", "accounts"}
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1}])
+    repository.upsert_rows("accounts", [{"id": 1, "name": "Checking"}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "t1", "date": "2025-03-02", "name": "Market", "amount": 30.0,
+         "user_category_id": 1, "user_subcategory_id": 2},
+    ])
+    repository.upsert_rows("budgets", [{"id": 1, "month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 150}])
+    return repository
+
+
+def test_dashboard_returns_every_part_of_the_month(client):
+    body = client.get("/dashboard?month=3&year=2025").json
+    assert (body["month"], body["year"], body["errors"]) == (3, 2025, {})
+    assert set(body["timings_ms"]) == PARTS
+    assert [row["category_id"] for row in body["budgets"]] == [2]
+    assert [row["total_amount"] for row in body["regular_summary"]] == [30.0]
+    assert [row["name"] for row in body["accounts"]] == ["Checking"]
+    # Every part is the same data its own route returns
+    assert body["categories"] == client.get("/categories").json
+    assert body["regular_summary"] == client.get("/summary/regular?month=3&year=2025").json
+
+    assert client.get("/dashboard?month=3").status_code == 400
+
+
+def test_dashboard_parts_are_fetched_concurrently(repository, client, monkeypatch):
+    # Both calls wait for each other; run one after the other, they would time out
+    both_started = threading.Barrier(2, timeout=5)
+
+    def waiting(fetch):
+        def call():
+            both_started.wait()
+            return fetch()
+        return call
+
+    monkeypatch.setattr(repository, "list_categories", waiting(repository.list_categories))
+    monkeypatch.setattr(repository, "list_accounts", waiting(repository.list_accounts))
+    response = client.get("/dashboard?month=3&year=2025")
+    assert response.status_code == 200 and response.json["errors"] == {}
+
+
+def test_a_failing_part_answers_207_with_the_rest(repository, client, monkeypatch):
+    def unavailable():
+        raise RuntimeError("accounts table unavailable")
+
+    monkeypatch.setattr(repository, "list_accounts", unavailable)
+    response = client.get("/dashboard?month=3&year=2025")
+
+    assert response.status_code == 207
+    assert response.json["errors"] == {"accounts": "accounts table unavailable"}
+    assert response.json["accounts"] is None
+    assert [row["category_id"] for row in response.json["budgets"]] == [2]
+    # Each part's query counts though it ran in a worker thread (plus PRAGMAs of threads new to SQLite)
+    assert int(response.headers["X-Query-Count"]) >= 4
+
+
+def test_a_dashboard_with_no_part_answers_502(repository, client, monkeypatch):
+    def unavailable(*args):
+        raise RuntimeError("database unavailable")
+
+    for method in ("fetch_all_budgets", "fetch_regular_summary", "fetch_reserve_summary", "list_categories",
+                   "list_accounts"):
+        monkeypatch.setattr(repository, method, unavailable)
+    response = client.get("/dashboard?month=3&year=2025")
+
+    assert response.status_code == 502
+    assert set(response.json["errors"]) == PARTS
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from routes import sync
+from utils.jobs import JobRunner
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    runner = JobRunner(workers=2, history=5)
+    monkeypatch.setattr(sync, "job_runner", runner)
+    return runner
+
+
+def test_concurrent_sync_requests_share_one_run(client, runner, monkeypatch):
+    release, runs = threading.Event(), []
+
+    def fake_sync(progress, repository=None):
+        runs.append(repository)
+        progress("fetching_transactions")
+        release.wait(5)
+        progress("done", inserted=3)
+        return {"inserted": 3}
+
+    monkeypatch.setattr(sync, "run_plaid_sync", fake_sync)
+
+    first = client.post("/sync-plaid")
+    second = client.post("/sync-plaid")
+    assert first.status_code == second.status_code == 202
+    assert first.json["deduplicated"] is False
+    assert second.json["deduplicated"] is True
+    assert second.json["job_id"] == first.json["job_id"]
+
+    release.set()
+    job = runner.wait(first.json["job_id"], timeout=5)
+    assert job["status"] == "succeeded"
+    assert job["requests"] == 2
+    assert job["result"] == {"inserted": 3}
+    assert [event["stage"] for event in job["events"]] == ["fetching_transactions", "done"]
+    assert len(runs) == 1 and runs[0] is not None
+
+    status = client.get(f"/jobs/{job['id']}").json
+    assert status["status"] == "succeeded" and status["duration_ms"] >= 0
+
+    # Once finished, the next request starts a fresh run
+    third = client.post("/sync-plaid").json
+    assert third["job_id"] != job["id"] and third["deduplicated"] is False
+    runner.wait(third["job_id"], timeout=5)
+    assert client.get("/jobs").json["stats"]["deduplicated"] == 1
+
+
+def test_failed_job_reports_error_and_unknown_job_is_404(client, runner, monkeypatch):
+    def broken_sync(progress, repository=None):
+        raise RuntimeError("Plaid is down")
+
+    monkeypatch.setattr(sync, "run_plaid_sync", broken_sync)
+    job_id = client.post("/sync-plaid").json["job_id"]
+    job = runner.wait(job_id, timeout=5)
+    assert job["status"] == "failed" and job["error"] == "Plaid is down"
+    assert client.get("/jobs/nope").status_code == 404
+
+
+def test_history_keeps_only_recent_finished_jobs():
+    runner = JobRunner(workers=1, history=3)
+    ids = []
+    for i in range(6):
+        job, _ = runner.submit(f"kind-{i}", lambda progress, i=i: i)
+        runner.wait(job["id"], timeout=5)
+        ids.append(job["id"])
+    assert [job["id"] for job in runner.list()] == ids[:2:-1]
+
+
+def test_jobs_in_one_lane_never_overlap():
+    runner = JobRunner(workers=2)
+    running, overlaps, release = [], [], threading.Event()
+
+    def sync(progress, name):
+        running.append(name)
+        overlaps.append(len(running))
+        release.wait(2)
+        running.remove(name)
+        return name
+
+    full, _ = runner.submit("plaid_sync", sync, lane="plaid", name="full")
+    item, _ = runner.submit("plaid_item:a", sync, lane="plaid", name="item")
+    other, _ = runner.submit("log_retention", lambda progress: "other")
+    assert runner.wait(other["id"], timeout=5)["status"] == "succeeded"  # other lanes are not held up
+    assert runner.get(item["id"])["status"] == "queued"
+
+    release.set()
+    assert runner.wait(item["id"], timeout=5)["result"] == "item"
+    assert runner.get(full["id"])["status"] == "succeeded" and overlaps == [1, 1]
@@ -0,0 +1,91 @@
+import importlib.util
+import json
+import os
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def legacy_api(postgrest_client, monkeypatch):
+    """api.py (the Render entry point) with its Supabase client answering from `handler`."""
+    spec = importlib.util.spec_from_file_location("legacy_api", os.path.join(ROOT, "api.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def install(handler):
+        monkeypatch.setattr(module, "_supabase_client", postgrest_client(handler))
+        return module.app.test_client()
+    return install
+
+
+def _rpc_error(code, message):
+    return lambda request: httpx.Response(400, json={"code": code, "message": message, "details": None, "hint": None})
+
+
+def test_split_transaction_maps_database_errors(legacy_api):
+    body = {"transaction_id": "t1", "splits": [{"amount": 5}]}
+
+    response = legacy_api(_rpc_error("P0002", "Transaction t1 not found")).post("/split-transaction", json=body)
+    assert response.status_code == 404 and response.json["error"] == "Original transaction not found"
+
+    response = legacy_api(_rpc_error("22023", "Split amounts for transaction t1 must total 10")).post(
+        "/split-transaction", json=body)
+    assert response.status_code == 400 and "must total" in response.json["error"]
+
+    response = legacy_api(_rpc_error("42501", "permission denied")).post("/split-transaction", json=body)
+    assert response.status_code == 500
+
+    calls = []
+    client = legacy_api(lambda request: calls.append(json.loads(request.content)) or httpx.Response(200, json=[{"ok": 1}]))
+    assert client.post("/split-transaction", json=body).status_code == 200
+    assert calls[0]["requests"][0]["splits"][0]["amount"] == 5
+
+
+def test_logs_reject_malformed_cursors_before_querying(legacy_api):
+    requests = []
+    client = legacy_api(lambda request: requests.append(request) or httpx.Response(200, json=[]))
+
+    for cursor in ("log004", "not-a-date|log004", "2026-10-19T13:00:00|x,id.gt.0"):
+        assert client.get("/logs", query_string={"cursor": cursor}).status_code == 400
+    assert requests == []
+
+    assert client.get("/logs", query_string={"cursor": "2026-10-19T13:00:00+00:00|log004"}).status_code == 200
+    assert 'created_at.lt."2026-10-19T13:00:00+00:00"' in requests[0].url.params["or"]
+
+
+def test_logs_limit_is_clamped(legacy_api):
+    requests = []
+    client = legacy_api(lambda request: requests.append(request) or httpx.Response(200, json=[]))
+
+    for limit, sent in (("0", "1"), ("-5", "1"), ("10000", "500")):
+        response = client.get("/logs", query_string={"limit": limit})
+        assert response.status_code == 200 and response.json == {"items": [], "next_cursor": None}
+        assert requests[-1].url.params["limit"] == sent
+
+
+def test_update_transactions_reports_bad_entries_per_row(legacy_api):
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content)["updates"])
+        return httpx.Response(200, json=[{"transaction_id": "t1", "date": "2025-03-02"}])
+
+    client = legacy_api(handler)
+    response = client.post("/update-transactions", json=[
+        "t3", {"transaction_id": "t1", "user_category_id": 4, "ignored": False},
+        {"transaction_id": "t2", "user_category_id": "food"}, {"transaction_id": "gone"},
+    ])
+    assert response.status_code == 207
+    assert [(r["transaction_id"], r["success"], r["error"]) for r in response.json["results"]] == [
+        (None, False, "Each transaction must be an object"), ("t1", True, None),
+        ("t2", False, "Invalid category id: invalid literal for int() with base 10: 'food'"),
+        ("gone", False, "Transaction not found"),
+    ]
+    assert sent == [[
+        {"transaction_id": "t1", "user_category_id": 4, "user_subcategory_id": None, "is_ignored": False},
+        {"transaction_id": "gone", "user_category_id": None, "user_subcategory_id": None},
+    ]]
+    assert client.post("/update-transactions", json="t1").status_code == 400
@@ -0,0 +1,44 @@
+import queue
+
+from utils import logger
+
+
+def _capture_batches(monkeypatch):
+    batches = []
+    monkeypatch.setattr(logger, "_write_batch", lambda batch: batches.append(list(batch)))
+    return batches
+
+
+def test_log_messages_are_written_in_batches(monkeypatch):
+    """Messages are grouped into bulk inserts instead of one insert per call."""
+    logger.shutdown_logger()
+    batches = _capture_batches(monkeypatch)
+    monkeypatch.setattr(logger, "LOG_BATCH_SIZE", 50)
+
+    for i in range(120):
+        logger.log_message(f"message {i}", "INFO", "Backend", "Test Route")
+    assert logger.flush_logs()
+
+    written = [entry["message"] for batch in batches for entry in batch]
+    assert written == [f"message {i}" for i in range(120)]
+    assert len(batches) <= 3
+    logger.shutdown_logger()
+
+
+def test_full_queue_drops_info_but_keeps_errors(monkeypatch):
+    """When the queue is full, low-severity entries are shed and errors survive."""
+    logger.shutdown_logger()
+    batches = _capture_batches(monkeypatch)
+    monkeypatch.setattr(logger, "_queue", queue.Queue(maxsize=5))
+    monkeypatch.setattr(logger, "LOG_OVERFLOW_SAMPLE", 1000)
+    monkeypatch.setattr(logger, "_ensure_worker", lambda: None)  # keep the queue full
+    before = logger.get_log_stats()["dropped"]
+
+    for i in range(20):
+        logger.log_message(f"info {i}", "INFO")
+    logger.log_message("boom", "ERROR")
+
+    pending = [logger._queue.get_nowait()["message"] for _ in range(5)]
+    assert "boom" in pending
+    assert logger.get_log_stats()["dropped"] - before == 16
+    assert batches == []
@@ -0,0 +1,85 @@
+import pytest
+
+from utils.log_retention import compact_logs
+
+
+def _log(i, severity, created_at, route="/transactions"):
+    return {"id": f"log{i:03d}", "message": f"message {i}", "severity": severity, "service": "Backend",
+            "route": route, "created_at": created_at}
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("logs", [
+        # Two rows share a timestamp, so pages must break ties on id
+        _log(0, "INFO", "2026-10-19T10:00:00"),
+        _log(1, "INFO", "2026-10-19T10:00:00"),
+        _log(2, "ERROR", "2026-10-19T11:00:00", route="/sync-plaid"),
+        _log(3, "DEBUG", "2026-10-19T12:00:00"),
+        _log(4, "INFO", "2026-10-19T13:00:00"),
+        # Old enough for the retention job
+        _log(5, "INFO", "2020-01-01T08:15:00"),
+        _log(6, "INFO", "2020-01-01T08:45:00"),
+        _log(7, "DEBUG", "2020-01-01T09:05:00", route=None),
+        _log(8, "ERROR", "2020-01-01T08:30:00"),
+    ])
+    return repository
+
+
+def test_logs_are_filtered_on_the_server(client):
+    ids = lambda query: [row["id"] for row in client.get(f"/logs?{query}").json["items"]]  # noqa: E731
+
+    assert ids("severity=ERROR") == ["log002", "log008"]
+    assert ids("severity=INFO,DEBUG&route=/transactions&start=2026-10-19T11:00:00") == ["log004", "log003"]
+    assert ids("start=2026-10-19T10:00:00&end=2026-10-19T12:00:00") == ["log002", "log001", "log000"]
+    assert ids("route=/sync-plaid&service=Frontend") == []
+
+
+def test_keyset_pages_cover_every_log_once(client):
+    seen, cursor = [], None
+    while True:
+        page = client.get("/logs?limit=2" + (f"&cursor={cursor}" if cursor else "")).json
+        seen += [row["id"] for row in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["log004", "log003", "log002", "log001", "log000", "log007", "log006", "log008", "log005"]
+
+
+def test_retention_compacts_old_info_and_debug_into_hourly_counts(repository, client):
+    result = compact_logs(repository, days=30, severities=["INFO", "DEBUG"], batch=2)
+    assert result["compacted"] == 3 and result["batches"] == 2
+
+    remaining = {row["id"] for row in repository.list_logs(limit=100)}
+    assert remaining == {"log000", "log001", "log002", "log003", "log004", "log008"}  # ERROR rows are kept
+
+    rollups = {(r["hour"], r["severity"], r["route"]): r["count"] for r in repository.list_log_rollups()}
+    assert rollups == {
+        ("2020-01-01T08:00:00", "INFO", "/transactions"): 2,
+        ("2020-01-01T09:00:00", "DEBUG", ""): 1,
+    }
+
+    # Running again finds nothing new and leaves the counts alone
+    assert compact_logs(repository, days=30, severities=["INFO", "DEBUG"])["compacted"] == 0
+    assert client.get("/logs/rollups?severity=INFO").json == [
+        {"hour": "2020-01-01T08:00:00", "severity": "INFO", "service": "Backend", "route": "/transactions",
+         "count": 2},
+    ]
+
+
+def test_each_compaction_batch_takes_the_oldest_rows(repository):
+    # Inserted last, but older than every other row
+    repository.upsert_rows("logs", [_log(9, "INFO", "2019-06-01T08:00:00")])
+    assert repository.compact_logs("2021-01-01T00:00:00", ["INFO", "DEBUG"], 1) == 1
+    assert repository.compact_logs("2021-01-01T00:00:00", ["INFO", "DEBUG"], 1) == 1
+    remaining = {row["id"] for row in repository.list_logs(limit=100)}
+    assert "log009" not in remaining and "log005" not in remaining
+    assert {"log006", "log007"} <= remaining
+
+
+def test_malformed_cursors_are_rejected(client):
+    for cursor in ("log004", "yesterday|log004", "2026-10-19T13:00:00|", "2026-10-19T13:00:00|a,id.gt.0"):
+        assert client.get("/logs", query_string={"cursor": cursor}).status_code == 400
+    page = client.get("/logs", query_string={"cursor": "2026-10-19T13:00:00|log004", "limit": 1}).json
+    assert [row["id"] for row in page["items"]] == ["log003"]
@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+
+from asgi import AsyncAPI
+from app import create_app
+from utils.metrics import RequestMetrics, request_metrics
+
+
+@pytest.fixture
+def app(repository):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1}])
+    request_metrics.clear()
+    return create_app(repository=repository)
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_endpoint_reports_each_route(app):
+    client = app.test_client()
+    client.get("/categories/sub/1")
+    client.get("/categories/sub/2")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200 and response.mimetype == "text/plain"
+    samples = _samples(response.get_data(as_text=True))
+
+    sub = 'method="GET",route="/categories/sub/<int:main_category_id>"'
+    assert samples[f'http_requests_total{{{sub},status="200"}}'] == 2
+    assert samples[f'http_requests_total{{method="GET",route="<unmatched>",status="404"}}'] == 1
+    assert samples[f'http_request_duration_seconds_count{{{sub}}}'] == 2
+    assert samples[f'http_request_duration_seconds_bucket{{{sub},le="+Inf"}}'] == 2
+    assert samples[f'http_response_size_bytes_count{{{sub}}}'] == 2
+    assert samples[f'http_requests_in_flight{{{sub}}}'] == 0
+    # The scrape itself is still in flight while it renders
+    assert samples['http_requests_in_flight{method="GET",route="/metrics"}'] == 1
+
+
+def test_unhandled_errors_count_as_500(app):
+    @app.route("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.testing = False
+    app.test_client().get("/boom")
+    assert 'http_requests_total{method="GET",route="/boom",status="500"} 1' in request_metrics.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RequestMetrics(latency_buckets=[1.0], size_buckets=[10, 100])
+    for size in (5, 50, 500):
+        metrics.finish("GET", "/x", 200, size, metrics.start("GET", "/x"))
+    text = metrics.render()
+    assert 'http_response_size_bytes_bucket{method="GET",route="/x",le="10"} 1' in text
+    assert 'http_response_size_bytes_bucket{method="GET",route="/x",le="100"} 2' in text
+    assert 'http_response_size_bytes_bucket{method="GET",route="/x",le="+Inf"} 3' in text
+    assert 'http_response_size_bytes_sum{method="GET",route="/x"} 555.000000' in text
+
+
+def test_asgi_native_routes_share_the_flask_series(app):
+    async def get(path):
+        transport = httpx.ASGITransport(app=AsyncAPI(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    assert asyncio.run(get("/categories/sub/1")).status_code == 200
+    app.test_client().get("/categories/sub/1")
+    samples = _samples(request_metrics.render())
+    assert samples['http_requests_total{method="GET",route="/categories/sub/<int:main_category_id>",status="200"}'] == 2
@@ -0,0 +1,115 @@
+import json
+import os
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.test")
+os.environ.setdefault("SUPABASE_KEY", "a.b.c")
+
+import plaid_sync  # noqa: E402
+
+
+class FakePostgREST:
+    """In-memory transactions and plaid_items tables behind an httpx MockTransport."""
+
+    def __init__(self, rows=(), failing_ids=()):
+        self.transactions = {row["transaction_id"]: dict(row) for row in rows}
+        self.cursors = {}
+        self.failing_ids = set(failing_ids)
+        self.deletes = []
+
+    def __call__(self, request):
+        table = request.url.path.rsplit("/", 1)[-1]
+        params = dict(parse_qsl(request.url.query.decode()))
+        body = json.loads(request.content) if request.content else None
+        transaction_id = params.get("transaction_id", "eq.")[3:]
+
+        if table == "plaid_items":
+            if request.method == "GET":
+                return httpx.Response(200, json=[])
+            self.cursors[body["item_id"]] = body["cursor"]
+            return httpx.Response(201, json=[body])
+        if table != "transactions":
+            return httpx.Response(200, json=[])
+        if request.method == "GET":
+            row = self.transactions.get(transaction_id)
+            return httpx.Response(200, json=[row] if row else [])
+        if transaction_id in self.failing_ids or (body and body.get("transaction_id") in self.failing_ids):
+            return httpx.Response(400, json={"code": "22P02", "message": "bad row", "details": None, "hint": None})
+        if request.method == "POST":
+            self.transactions[body["transaction_id"]] = body
+            return httpx.Response(201, json=[body])
+        if request.method == "PATCH":
+            self.transactions[transaction_id].update(body)
+            return httpx.Response(200, json=[self.transactions[transaction_id]])
+        self.deletes.append(params["transaction_id"][4:-1].split(","))
+        for removed in self.deletes[-1]:
+            self.transactions.pop(removed, None)
+        return httpx.Response(200, json=[])
+
+
+def _tx(transaction_id, pending=False, name="Market", amount=10.0):
+    return {"transaction_id": transaction_id, "account_id": "acc", "amount": amount, "pending": pending,
+            "date": "2025-03-02", "name": name, "location": {}}
+
+
+@pytest.fixture
+def postgrest(postgrest_client, monkeypatch):
+    def install(rows=(), failing_ids=(), changes=((), (), ())):
+        fake = FakePostgREST(rows, failing_ids)
+        monkeypatch.setattr(plaid_sync, "supabase", postgrest_client(fake))
+        added, modified, removed = changes
+        monkeypatch.setattr(plaid_sync, "fetch_transaction_changes",
+                            lambda token, cursor: (list(added), list(modified), list(removed), "cursor-2"))
+        return fake
+    return install
+
+
+def test_modified_rows_update_posted_transactions(postgrest):
+    stored = {"transaction_id": "t1", "pending": False, "name": "Old name", "date": "2025-03-01",
+              "user_category_id": 4}
+    fake = postgrest(rows=[stored], changes=([_tx("t2")], [_tx("t1", name="New name", amount=12.5)], ["gone"]))
+
+    summary = plaid_sync.sync_item("item-1")
+    assert (summary["inserted"], summary["updated"], summary["failed"]) == (1, 1, 0)
+    assert fake.transactions["t1"]["name"] == "New name" and fake.transactions["t1"]["amount"] == 12.5
+    assert fake.transactions["t1"]["user_category_id"] == 4  # the user's category is kept
+    assert summary["cursor_advanced"] and fake.cursors == {"item-1": "cursor-2"}
+
+
+def test_a_failed_row_keeps_the_cursor(postgrest):
+    fake = postgrest(failing_ids=["t2"], changes=([_tx("t1"), _tx("t2")], [], []))
+
+    summary = plaid_sync.sync_item("item-1")
+    assert summary["failed"] == 1 and summary["failed_ids"] == ["t2"]
+    assert summary["cursor_advanced"] is False and fake.cursors == {}
+    assert list(fake.transactions) == ["t1"]
+
+
+def test_posted_rows_are_still_skipped_by_a_full_sync(postgrest):
+    fake = postgrest(rows=[{"transaction_id": "t1", "pending": False, "name": "Kept", "date": "2025-03-01"}])
+
+    counts = plaid_sync.store_transactions([_tx("t1", name="Changed")], plaid_sync.compile_rules([]))
+    assert (counts["skipped"], counts["failed"]) == (1, 0) and fake.transactions["t1"]["name"] == "Kept"
+
+
+def test_a_failing_rule_leaves_rows_uncategorized(postgrest):
+    class BrokenRules:
+        def categorize(self, transactions):
+            raise TypeError("'<' not supported between instances of 'float' and 'str'")
+
+    fake = postgrest()
+    counts = plaid_sync.store_transactions([_tx("t1"), _tx("t2")], BrokenRules())
+    assert (counts["inserted"], counts["failed"]) == (2, 0)
+    assert all(row.get("user_category_id") is None for row in fake.transactions.values())
+
+
+def test_removed_transactions_are_deleted_in_chunks(postgrest, monkeypatch):
+    monkeypatch.setattr(plaid_sync, "DELETE_CHUNK", 2)
+    fake = postgrest(rows=[_tx(f"t{i}") for i in range(5)], changes=((), (), [f"t{i}" for i in range(5)]))
+
+    summary = plaid_sync.sync_item("item-1")
+    assert summary["removed"] == 5 and fake.transactions == {}
+    assert fake.deletes == [["t0", "t1"], ["t2", "t3"], ["t4"]]
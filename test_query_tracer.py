@@ -0,0 +1,52 @@
+import httpx
+import pytest
+
+from query_tracer import QueryBudgetExceeded, TracedClient, trace_queries
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Groceries", "parent_id": 1}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"t{i}", "date": "2025-03-02", "name": "Market", "amount": 10.0} for i in range(20)
+    ])
+    return repository
+
+
+def test_requests_report_their_query_count(client):
+    response = client.get("/categories")
+    assert int(response.headers["X-Query-Count"]) == 1
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_bulk_update_stays_within_its_budget(client):
+    rows = [{"transaction_id": f"t{i}", "user_category_id": 1, "user_subcategory_id": 2} for i in range(20)]
+    with trace_queries("bulk update") as trace:
+        assert client.post("/update-transactions", json={"transactions": rows}).status_code == 200
+
+    # The query count must not grow with the number of rows
+    trace.assert_within(5)
+    assert trace.repeated() == []
+    with pytest.raises(QueryBudgetExceeded):
+        trace.assert_within(0)
+
+
+def test_supabase_queries_are_traced_and_n_plus_one_flagged(postgrest_client):
+    def handler(request):
+        return httpx.Response(200, json=[{"transaction_id": "t1", "pending": False}])
+
+    supabase = TracedClient(postgrest_client(handler))
+
+    with trace_queries("sync", budget=5) as trace:
+        for i in range(12):
+            supabase.table("transactions").select("pending").eq("transaction_id", f"t{i}").execute()
+        supabase.rpc("fetch_summary", {"month": 3, "year": 2025}).execute()
+
+    totals = trace.totals()
+    assert totals["queries"] == 13 and totals["rows"] == 13
+    assert totals["by_operation"] == {"select transactions": 12, "rpc fetch_summary": 1}
+    assert trace.repeated() == [("select transactions eq(transaction_id)", 12)]
+    assert trace.warnings() == [
+        "sync made 13 queries (budget 5)",
+        "sync: possible N+1, 12x select transactions eq(transaction_id)",
+    ]
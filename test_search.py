@@ -0,0 +1,53 @@
+from storage.sqlite_repository import SQLiteRepository
+
+
+def _ids(response):
+    return [row["transaction_id"] for row in response.json]
+
+
+def test_search_prefix_matching_ranking_and_sync(repository, client):
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "a", "date": "2025-03-01", "name": "BLUE BOTTLE COFFEE", "merchant_name": "Blue Bottle"},
+        {"transaction_id": "b", "date": "2025-03-02", "name": "Bottle shop", "merchant_name": None},
+        {"transaction_id": "c", "date": "2025-03-03", "name": "Café Bleu", "merchant_name": None},
+    ])
+
+    assert _ids(client.get("/transactions/search?q=blue bot")) == ["a"]
+    results = client.get("/transactions/search?q=bottle").json
+    assert sorted(row["transaction_id"] for row in results) == ["a", "b"]
+    assert results[0]["rank"] >= results[1]["rank"]
+    assert _ids(client.get("/transactions/search?q=cafe")) == ["c"]
+
+    # Inserts, renames, replacements and deletes keep the index in step
+    client.post("/transactions", json={"transaction_id": "d", "date": "2025-03-04", "name": "Bluebird Diner"})
+    client.put("/transactions/b", json={"name": "Liquor store"})
+    repository.upsert_rows("transactions", [{"transaction_id": "c", "date": "2025-03-03", "name": "Blue Cafe"}])
+    client.delete("/transactions/a")
+    assert sorted(_ids(client.get("/transactions/search?q=blu"))) == ["c", "d"]
+    assert _ids(client.get("/transactions/search?q=bottle")) == []
+    assert _ids(client.get("/transactions/search?q=liquor")) == ["b"]
+
+    assert client.get("/transactions/search?q=%20%21").status_code == 400
+
+
+def test_existing_database_is_indexed_on_open(repository):
+    repository.upsert_rows("transactions", [{"transaction_id": "a", "date": "2025-03-01", "name": "Shell Oil"}])
+    conn = repository.connection()
+    conn.executescript("DROP TABLE transactions_fts;")
+
+    reopened = SQLiteRepository(repository.path)
+    assert [row["transaction_id"] for row in reopened.search_transactions(["shel"])] == ["a"]
+
+
+def test_vacuum_reindexes_search(repository):
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "a", "date": "2025-03-01", "name": "Shell Oil"},
+        {"transaction_id": "b", "date": "2025-03-02", "name": "Trader Joes"},
+        {"transaction_id": "c", "date": "2025-03-03", "name": "Shake Shack"},
+    ])
+    repository.delete_transaction("a")
+    repository.vacuum()
+
+    assert [row["transaction_id"] for row in repository.search_transactions(["sha"])] == ["c"]
+    # Raises if the index disagrees with transactions
+    repository.connection().execute("INSERT INTO transactions_fts (transactions_fts, rank) VALUES ('integrity-check', 1)")
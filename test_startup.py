@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import create_app
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api")
+
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 2.0))
+
+# Runs in a fresh interpreter so module imports are part of the measurement
+_BOOT = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+app = create_app("supabase")
+elapsed = time.perf_counter() - started
+
+import supabase_client
+client = app.test_client()
+live = client.get("/healthz")
+report = {"elapsed": elapsed, "sdk_imported": "supabase" in sys.modules,
+          "client_after_boot": supabase_client.supabase.initialized, "live": live.status_code}
+ready = client.get("/readyz")
+report.update(ready=ready.status_code, ready_body=ready.json, again=client.get("/readyz").json)
+print(json.dumps(report))
+"""
+
+
+def _boot(env):
+    result = subprocess.run([sys.executable, "-c", _BOOT], cwd=API_DIR, capture_output=True, text=True, timeout=60,
+                            env={**os.environ, "STORAGE_BACKEND": "supabase", "WARM_UP": "0", **env})
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_supabase_backend_boots_without_creating_the_client():
+    # Nothing listens on port 9, so the first real query fails fast
+    report = _boot({"SUPABASE_URL": "http://127.0.0.1:9", "SUPABASE_SERVICE_ROLE": "a.b.c"})
+
+    assert report["elapsed"] < STARTUP_BUDGET_SECONDS, f"create_app('supabase') took {report['elapsed']:.3f}s"
+    assert not report["sdk_imported"] and not report["client_after_boot"]
+    assert report["live"] == 200  # liveness never touches the database
+    assert report["ready"] == 503 and report["ready_body"]["checks"]["database"]["ok"] is False
+    assert report["again"]["cached"] is True
+
+
+def test_missing_credentials_fail_readiness_not_startup():
+    report = _boot({"SUPABASE_URL": "", "SUPABASE_SERVICE_ROLE": ""})
+    assert report["live"] == 200 and report["ready"] == 503
+    assert "credentials not found" in report["ready_body"]["checks"]["database"]["error"]
+
+
+def test_readiness_is_cached(repository, monkeypatch):
+    pings = []
+    monkeypatch.setattr(repository, "ping", lambda: pings.append(1))
+    app = create_app(repository=repository)
+    client = app.test_client()
+
+    assert client.get("/healthz").status_code == 200 and pings == []
+    first, second = client.get("/readyz"), client.get("/readyz")
+    assert first.status_code == second.status_code == 200
+    assert (first.json["cached"], second.json["cached"]) == (False, True) and len(pings) == 1
+
+    app.extensions["readiness"].ttl = 0
+    assert client.get("/readyz").json["cached"] is False and len(pings) == 2
+
+
+@pytest.mark.parametrize("warm", [True, False])
+def test_warm_up_creates_the_client_in_the_background(warm):
+    from supabase_client import LazyClient
+    from utils.health import warm_up
+
+    created = []
+    client = LazyClient(lambda: created.append(1) or object())
+    assert not client.initialized
+
+    class Repository:
+        name = "fake"
+
+        def warm_up(self):
+            client.get()
+
+    if warm:
+        warm_up(Repository()).join(timeout=5)
+    assert client.initialized is warm and len(created) == int(warm)
+    client.get()
+    assert len(created) == 1
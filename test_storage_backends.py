@@ -0,0 +1,230 @@
+import json
+
+import httpx
+import pytest
+
+from storage.sqlite_repository import SQLiteRepository
+from storage.supabase_repository import SupabaseRepository
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("categories", [
+        {"id": 1, "name": "Food", "parent_id": None},
+        {"id": 2, "name": "Groceries", "parent_id": 1},
+        {"id": 9, "name": "Reserve", "parent_id": None},
+        {"id": 10, "name": "Car", "parent_id": 9},
+    ])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": "t1", "date": "2025-03-02", "name": "Market", "amount": 30.0,
+         "account_id": "acc", "is_ignored": False, "pending": False},
+        {"transaction_id": "t2", "date": "2025-03-05", "name": "Garage", "amount": 100.0,
+         "account_id": "acc", "is_ignored": False, "pending": False},
+    ])
+    return repository
+
+
+def test_bulk_update_reports_each_row(client):
+    response = client.post("/update-transactions", json={"transactions": [
+        {"transaction_id": "t1", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "missing", "user_category_id": 1},
+    ]})
+    assert response.status_code == 207
+    assert [r["success"] for r in response.json["results"]] == [True, False]
+    assert [t["transaction_id"] for t in client.get("/unprocessed-transactions").json] == ["t2"]
+
+
+def test_bulk_update_rejects_bad_rows_without_touching_the_rest(client):
+    response = client.post("/update-transactions", json={"transactions": [
+        "t2", {"user_category_id": 1}, {"transaction_id": "t1", "user_category_id": "food"},
+        {"transaction_id": "t2", "is_ignored": "yes"}, {"transaction_id": "t2", "is_ignored": True},
+        {"transaction_id": "t2", "user_category_id": 1},
+    ]})
+    assert response.status_code == 207
+    assert [(r["success"], r["error"]) for r in response.json["results"]] == [
+        (False, "Missing transaction_id"), (False, "Missing transaction_id"),
+        (False, "user_category_id must be an integer"), (False, "is_ignored must be a boolean"),
+        (True, None), (False, "Duplicate transaction_id in batch"),
+    ]
+    assert [t["transaction_id"] for t in client.get("/unprocessed-transactions").json] == ["t1"]
+    assert client.post("/update-transactions", json={"transactions": []}).status_code == 400
+
+
+def test_split_is_validated_and_idempotent(client):
+    bad = client.post("/split-transaction", json={"transaction_id": "t2", "splits": [{"amount": 10}]})
+    assert bad.status_code == 400
+
+    splits = {"transaction_id": "t2", "splits": [
+        {"amount": 60, "user_category_id": 9, "user_subcategory_id": 10},
+        {"amount": 40, "user_category_id": 1},
+    ]}
+    assert client.post("/split-transaction", json=splits).json["results"][0]["status"] == "split"
+    assert client.post("/split-transaction", json=splits).json["results"][0]["status"] == "already_split"
+
+    ids = sorted(t["transaction_id"] for t in client.get("/transactions").json)
+    assert ids == ["t1", "t2", "t2-split-1", "t2-split-2"]
+    assert client.post("/split-transaction", json={"transaction_id": "nope", "splits": [{"amount": 1}]}).status_code == 404
+    assert client.post("/split-transaction", json={"transaction_id": "t1", "splits": [{"amount": True}]}).status_code == 400
+
+
+def test_split_retry_with_fewer_splits_drops_leftover_children(client, repository):
+    # An interrupted non-atomic attempt left three children of t1 behind
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"t1-split-{i}", "parent_transaction_id": "t1", "date": "2025-03-02", "amount": 10.0}
+        for i in range(1, 4)
+    ])
+    splits = {"transaction_id": "t1", "splits": [{"amount": 20, "user_category_id": 1}, {"amount": 10}]}
+    assert client.post("/split-transaction", json=splits).json["results"][0]["splits"] == 2
+
+    children = repository.list_transactions_with_splits(["t1"])
+    assert sorted(row["transaction_id"] for row in children) == ["t1", "t1-split-1", "t1-split-2"]
+    assert sum(row["amount"] for row in children if row["transaction_id"] != "t1") == 30.0
+
+
+def test_summaries_follow_writes(client):
+    assert client.get("/summary?month=3&year=2025").json == []
+
+    client.post("/update-transactions", json={"transactions": [
+        {"transaction_id": "t1", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "t2", "user_category_id": 9, "user_subcategory_id": 10},
+    ]})
+    regular = client.get("/summary/regular?month=3&year=2025").json
+    reserve = client.get("/summary/reserve?month=3&year=2025").json
+    assert [(r["subcategory_name"], r["total_amount"]) for r in regular] == [("Groceries", 30.0)]
+    assert [(r["subcategory_name"], r["total_amount"]) for r in reserve] == [("Car", 100.0)]
+
+    rollup = lambda scope: client.get(f"/summary/rollup?month=3&year=2025&scope={scope}").json  # noqa: E731
+    assert (rollup("regular"), rollup("reserve")) == (regular, reserve)
+    assert rollup("all") == client.get("/summary/rollup?month=3&year=2025").json == regular + reserve
+    assert client.get("/summary/rollup?month=3&year=2025&scope=other").status_code == 400
+
+
+def test_budget_and_category_crud(client):
+    client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 50})
+    client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 75})
+    client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 10, "budgeted_amount": 20})
+
+    assert [b["budgeted_amount"] for b in client.get("/budgets?month=3&year=2025").json] == [75.0, 20.0]
+    reserve = client.get("/budgets/reserve?month=3&year=2025").json
+    assert [(b["category_name"], b["parent_name"]) for b in reserve] == [("Car", "Reserve")]
+
+    created = client.post("/categories", json={"name": "Fuel", "parent_id": 9}).json
+    assert created[0]["id"] > 10
+    assert {c["name"] for c in client.get("/categories/sub/9").json} == {"Car", "Fuel"}
+
+
+def test_budget_writes_upsert_and_months_copy_in_bulk(client):
+    first = client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 50}).json
+    second = client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 2, "budgeted_amount": 75}).json
+    assert first[0]["id"] == second[0]["id"] and second[0]["budgeted_amount"] == 75.0
+    client.post("/budgets", json={"month": 3, "year": 2025, "category_id": 10, "budgeted_amount": 20})
+    client.post("/budgets", json={"month": 4, "year": 2025, "category_id": 10, "budgeted_amount": 5})
+
+    copied = client.post("/budgets/copy", json={"from_month": 3, "from_year": 2025, "to_month": 4, "to_year": 2025,
+                                                "scale": 1.1})
+    assert copied.json["copied"] == 1  # the April budget for category 10 is kept
+    april = {b["category_id"]: b["budgeted_amount"] for b in client.get("/budgets?month=4&year=2025").json}
+    assert april == {2: 82.5, 10: 5.0}
+
+    client.post("/budgets/copy", json={"from_month": 3, "from_year": 2025, "to_month": 4, "to_year": 2025,
+                                       "overwrite": True})
+    april = {b["category_id"]: b["budgeted_amount"] for b in client.get("/budgets?month=4&year=2025").json}
+    assert april == {2: 75.0, 10: 20.0}
+
+    same = {"from_month": 3, "from_year": 2025, "to_month": 3, "to_year": 2025}
+    assert client.post("/budgets/copy", json=same).status_code == 400
+    assert client.post("/budgets/copy", json={"from_month": 3}).status_code == 400
+
+
+def test_regular_budgets_exclude_the_reserve_hierarchy_in_one_query(client):
+    for category_id, amount in ((2, 50), (1, 300), (9, 40), (10, 20), (99, 5)):  # 99 has no category
+        client.post("/budgets", json={"month": 3, "year": 2025, "category_id": category_id, "budgeted_amount": amount})
+
+    response = client.get("/budgets/regular?month=3&year=2025")
+    assert response.headers["X-Query-Count"] == "1"
+    assert [(b["category_id"], b["category_name"], b["parent_name"]) for b in response.json] == [
+        (99, None, None), (1, "Food", None), (2, "Groceries", "Food"),
+    ]
+    reserve = client.get("/budgets/reserve?month=3&year=2025").json
+    assert sorted(b["category_id"] for b in reserve) == [9, 10]
+    assert client.get("/budgets/regular?month=3").status_code == 400
+
+
+def test_regular_and_reserve_budgets_together_are_all_budgets(client):
+    for category_id in (1, 2, 9, 10, 99):
+        client.post("/budgets", json={"month": 4, "year": 2025, "category_id": category_id, "budgeted_amount": 10})
+
+    regular = client.get("/budgets/regular?month=4&year=2025").json
+    reserve = client.get("/budgets/reserve?month=4&year=2025").json
+    everything = client.get("/budgets/all?month=4&year=2025").json
+    assert sorted(b["id"] for b in regular + reserve) == sorted(b["id"] for b in everything)
+    assert not {b["id"] for b in regular} & {b["id"] for b in reserve}
+
+
+def test_rollups_match_a_full_recount(client, repository):
+    """Incremental rollups agree with re-aggregating the transactions table."""
+    client.post("/update-transactions", json={"transactions": [
+        {"transaction_id": "t1", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "t2", "user_category_id": 1},
+    ]})
+    client.post("/split-transaction", json={"transaction_id": "t2", "splits": [
+        {"amount": 70, "user_category_id": 1, "user_subcategory_id": 2},
+        {"amount": 30, "user_category_id": 9, "date": "2025-04-01"},
+    ]})
+    client.put("/transactions/t1", json={"date": "2025-02-27"})
+    client.post("/update-transactions", json={"transactions": [{"transaction_id": "t2-split-2", "is_ignored": True}]})
+
+    incremental = repository.query("SELECT * FROM category_rollups ORDER BY 1, 2, 3, 4")
+    rebuilt = SQLiteRepository(repository.path)
+    rebuilt.rebuild_table("category_rollups")
+    assert rebuilt.query("SELECT * FROM category_rollups ORDER BY 1, 2, 3, 4") == incremental
+    assert [(r["year"], r["month"], r["total_amount"]) for r in incremental] == [(2025, 2, 30.0), (2025, 3, 70.0)]
+
+
+def test_replacing_a_row_does_not_double_count(client, repository):
+    """Replica write-throughs replace whole rows; the rollups must not count them twice."""
+    client.post("/update-transactions", json={"transactions": [{"transaction_id": "t1", "user_category_id": 1}]})
+    [row] = repository.list_transactions_with_splits(["t1"])
+    repository.upsert_rows("transactions", [row, row])
+
+    [rollup] = repository.query("SELECT * FROM category_rollups")
+    assert (rollup["total_amount"], rollup["transaction_count"]) == (30.0, 1)
+
+
+def test_supabase_summaries_call_the_original_rpcs(postgrest_client):
+    """The /summary endpoints keep their RPCs; /summary/rollup reads the rollups through its own."""
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path.rsplit("/", 1)[-1], json.loads(request.content)))
+        return httpx.Response(200, json=[])
+
+    repository = SupabaseRepository(postgrest_client(handler))
+    repository.fetch_summary(3, 2025)
+    repository.fetch_regular_summary(3, 2025)
+    repository.fetch_reserve_summary(3, 2025)
+    repository.fetch_summary_rollup(3, 2025, reserve=True)
+    assert seen == [(name, {"month": 3, "year": 2025})
+                    for name in ("fetch_summary", "fetch_regular_summary", "fetch_reserve_summary")] + [
+        ("fetch_summary_rollup", {"month": 3, "year": 2025, "reserve": True}),
+    ]
+
+
+def test_supabase_analytics_columns_page_by_transaction_id(postgrest_client, monkeypatch):
+    rows = [{"transaction_id": f"t{i:02d}", "date": "2025-03-01", "amount": float(i), "user_category_id": 1,
+             "user_subcategory_id": None} for i in range(5)]
+    queries = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        queries.append(params)
+        after = params.get("transaction_id", "gt.")[3:]
+        page = [row for row in rows if row["transaction_id"] > after][:int(params["limit"])]
+        return httpx.Response(200, json=page)
+
+    monkeypatch.setattr("storage.supabase_repository.PAGE_SIZE", 2)
+    columns = SupabaseRepository(postgrest_client(handler)).load_transaction_columns()
+
+    assert columns["amount"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert [q.get("transaction_id") for q in queries] == [None, "gt.t01", "gt.t03"]
+    assert not any("offset" in q for q in queries)
@@ -0,0 +1,41 @@
+from utils.helpers import normalize_merchant
+
+
+def test_normalize_merchant():
+    assert normalize_merchant("SQ *BLUE BOTTLE #12", "ignored") == "sq blue bottle"
+    assert normalize_merchant(None, "  Shell Oil 5742 ") == "shell oil"
+    assert normalize_merchant("", "1234") is None
+
+
+def test_suggestions_follow_categorizations(repository, client):
+    repository.upsert_rows("categories", [{"id": 1, "name": "Food"}, {"id": 2, "name": "Coffee", "parent_id": 1},
+                                          {"id": 3, "name": "Gifts"}])
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"old{i}", "date": "2025-01-01", "merchant_name": f"Blue Bottle #{i}", "amount": 5.0,
+         "is_ignored": False}
+        for i in range(4)
+    ] + [{"transaction_id": "new", "date": "2025-02-01", "name": "BLUE BOTTLE 99", "is_ignored": False}])
+
+    client.post("/update-transactions", json={"transactions": [
+        {"transaction_id": "old0", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "old1", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "old2", "user_category_id": 1, "user_subcategory_id": 2},
+        {"transaction_id": "old3", "user_category_id": 3},
+    ]})
+    body = {"transactions": [{"transaction_id": "new", "name": "BLUE BOTTLE 99"},
+                             {"transaction_id": "x", "name": "Unknown Shop"}], "k": 2}
+    suggestions = client.post("/suggestions", json=body).json["suggestions"]
+    assert suggestions["x"] == []
+    assert [(s["category_name"], s["subcategory_name"], s["confidence"]) for s in suggestions["new"]] == [
+        ("Food", "Coffee", 0.75), ("Gifts", None, 0.25),
+    ]
+
+    # Recategorizing moves the counts instead of re-scanning history
+    client.post("/update-transactions", json={"transactions": [{"transaction_id": "old3", "is_ignored": True}]})
+    [only] = client.post("/suggestions", json=body).json["suggestions"]["new"]
+    assert (only["count"], only["confidence"]) == (3, 1.0)
+
+    counts = repository.query("SELECT * FROM merchant_category_counts ORDER BY 1, 2, 3")
+    repository.rebuild_table("merchant_category_counts")
+    assert repository.query("SELECT * FROM merchant_category_counts ORDER BY 1, 2, 3") == counts
+    assert client.post("/suggestions", json={"transactions": []}).status_code == 400
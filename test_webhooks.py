@@ -0,0 +1,195 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+from routes import sync, webhooks
+from utils.jobs import Debouncer, JobRunner
+from utils.webhooks import PlaidWebhookVerifier
+
+KID = "test-key"
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+@pytest.fixture(scope="module")
+def plaid_stand_in():
+    """Local stand-in for Plaid's /webhook_verification_key/get; yields (url, signing key, key requests)."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    numbers = private_key.public_key().public_numbers()
+    jwk = {"alg": "ES256", "crv": "P-256", "kid": KID, "kty": "EC", "use": "sig",
+           "x": _b64(numbers.x.to_bytes(32, "big")), "y": _b64(numbers.y.to_bytes(32, "big")),
+           "created_at": 1560466150, "expired_at": None}
+    key_requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            key_requests.append(body["key_id"])
+            status, payload = (200, {"key": jwk}) if body["key_id"] == KID else (400, {"error_code": "INVALID_KEY"})
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", private_key, key_requests
+    server.shutdown()
+
+
+def _sign(private_key, body, iat=None, kid=KID):
+    return _sign_json(private_key, {"alg": "ES256", "kid": kid, "typ": "JWT"}, {
+        "iat": int(iat if iat is not None else time.time()),
+        "request_body_sha256": hashlib.sha256(body).hexdigest(),
+    })
+
+
+def _sign_json(private_key, header, claims):
+    header, claims = _b64(json.dumps(header).encode()), _b64(json.dumps(claims).encode())
+    r, s = decode_dss_signature(private_key.sign(f"{header}.{claims}".encode(), ec.ECDSA(hashes.SHA256())))
+    return f"{header}.{claims}.{_b64(r.to_bytes(32, 'big') + s.to_bytes(32, 'big'))}"
+
+
+def _webhook(code="SYNC_UPDATES_AVAILABLE", item_id="item-1", webhook_type="TRANSACTIONS"):
+    return json.dumps({"webhook_type": webhook_type, "webhook_code": code, "item_id": item_id}).encode()
+
+
+@pytest.fixture
+def setup(client, plaid_stand_in, monkeypatch):
+    url, private_key, _ = plaid_stand_in
+    runner = JobRunner(workers=2)
+    runs = []
+
+    def fake_item_sync(progress, item_id, repository=None):
+        runs.append(item_id)
+        return {"item_id": item_id, "added": 1}
+
+    monkeypatch.setattr(webhooks, "webhook_verifier", PlaidWebhookVerifier(plaid_url=url))
+    monkeypatch.setattr(webhooks, "webhook_debouncer", Debouncer(runner, delay=0.1, max_wait=1.0))
+    monkeypatch.setattr(sync, "run_item_sync", fake_item_sync)
+
+    def post(body, token=None):
+        token = _sign(private_key, body) if token is None else token
+        return client.post("/webhooks/plaid", data=body, content_type="application/json",
+                           headers={"Plaid-Verification": token})
+
+    return post, runner, runs, private_key
+
+
+def _wait_for_jobs(runner, count, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = runner.list()
+        if len(jobs) >= count and all(job["status"] == "succeeded" for job in jobs):
+            return jobs
+        time.sleep(0.02)
+    return runner.list()
+
+
+def test_burst_of_webhooks_runs_one_sync_per_item(setup):
+    post, runner, runs, _ = setup
+    for _ in range(5):
+        assert post(_webhook()).json["queued"] is True
+    post(_webhook("DEFAULT_UPDATE", item_id="item-2"))
+
+    jobs = _wait_for_jobs(runner, 2)
+    time.sleep(0.2)  # nothing else should fire after the quiet period
+    assert sorted(runs) == ["item-1", "item-2"]
+    assert {job["kind"] for job in jobs} == {"plaid_item:item-1", "plaid_item:item-2"}
+
+
+def test_unverified_webhooks_are_rejected(setup, plaid_stand_in):
+    post, runner, runs, private_key = setup
+    body = _webhook()
+    other_key = ec.generate_private_key(ec.SECP256R1())
+
+    assert post(body, token="").status_code == 401
+    assert post(body, token="not.a.jwt").status_code == 401
+    assert post(body, token=_sign(other_key, body)).status_code == 401  # wrong signer
+    assert post(_webhook(item_id="item-9"), token=_sign(private_key, body)).status_code == 401  # body swapped
+    assert post(body, token=_sign(private_key, body, iat=time.time() - 3600)).status_code == 401  # replayed
+    assert post(body, token=_sign(private_key, body, kid="unknown")).status_code == 401
+    # Well-signed tokens with the wrong JSON shapes are rejected too, not a 500
+    header, digest = {"alg": "ES256", "kid": KID}, hashlib.sha256(body).hexdigest()
+    for token_header, claims in (
+        (["ES256", KID], {"iat": int(time.time()), "request_body_sha256": digest}),
+        ({"alg": "ES256", "kid": [KID]}, {"iat": int(time.time()), "request_body_sha256": digest}),
+        (header, "claims"),
+        (header, {"iat": str(int(time.time())), "request_body_sha256": digest}),
+    ):
+        assert post(body, token=_sign_json(private_key, token_header, claims)).status_code == 401
+
+    time.sleep(0.2)
+    assert runs == [] and runner.list() == []
+
+
+def test_key_lookup_failures_answer_503(setup, monkeypatch):
+    post, runner, runs, private_key = setup
+    monkeypatch.setattr(webhooks, "webhook_verifier", PlaidWebhookVerifier(plaid_url="http://127.0.0.1:9"))
+    response = post(_webhook())
+    assert response.status_code == 503 and "Could not reach Plaid" in response.json["error"]
+    assert runs == []
+
+
+def test_unknown_kids_are_remembered_and_lookups_capped(setup, plaid_stand_in, monkeypatch):
+    post, runner, runs, private_key = setup
+    url, _, key_requests = plaid_stand_in
+    monkeypatch.setattr(webhooks, "webhook_verifier", PlaidWebhookVerifier(plaid_url=url, fetches_per_minute=3))
+    body, before = _webhook(), len(key_requests)
+
+    for _ in range(3):
+        assert post(body, token=_sign(private_key, body, kid="retired")).status_code == 401
+    assert key_requests[before:] == ["retired"]
+
+    statuses = [post(body, token=_sign(private_key, body, kid=f"random-{i}")).status_code for i in range(5)]
+    assert statuses == [401, 401, 503, 503, 503]
+    assert len(key_requests) - before == 3
+
+
+def test_non_transaction_webhooks_are_acknowledged_without_a_sync(setup, plaid_stand_in):
+    post, runner, runs, _ = setup
+    _, _, key_requests = plaid_stand_in
+    before = len(key_requests)
+
+    assert post(_webhook("ERROR", webhook_type="ITEM")).json == {"received": True, "queued": False}
+    assert post(_webhook("WEBHOOK_UPDATE_ACKNOWLEDGED", webhook_type="ITEM")).status_code == 200
+    time.sleep(0.2)
+    assert runs == []
+    assert len(key_requests) - before <= 1  # the signing key is cached between webhooks
+
+
+def test_webhook_during_a_running_sync_gets_its_own_follow_up_run():
+    runner = JobRunner(workers=2)
+    debouncer = Debouncer(runner, delay=0.05, max_wait=1.0)
+    release, runs = threading.Event(), []
+
+    def slow_sync(progress):
+        runs.append(time.monotonic())
+        release.wait(2)
+
+    debouncer.trigger("plaid_item:a", slow_sync)
+    deadline = time.monotonic() + 2
+    while not runs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    debouncer.trigger("plaid_item:a", slow_sync)  # new data while the first run is in progress
+    time.sleep(0.2)
+    assert len(runs) == 1 and debouncer.pending() == {"plaid_item:a": 1}
+
+    release.set()
+    jobs = _wait_for_jobs(runner, 2)
+    assert len(runs) == 2 and len(jobs) == 2
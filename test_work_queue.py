@@ -0,0 +1,63 @@
+import pytest
+
+from storage.sqlite_repository import _UNPROCESSED, _WORK_QUEUE
+
+
+@pytest.fixture
+def repository(repository):
+    repository.upsert_rows("transactions", [
+        {"transaction_id": f"t{i:02d}", "date": f"2025-03-{i + 1:02d}", "name": f"Shop {i}", "amount": 1.0,
+         "is_ignored": None if i % 2 else False}  # NULL flags count as not ignored
+        for i in range(10)
+    ] + [
+        {"transaction_id": "done", "date": "2025-03-01", "user_category_id": 1},
+        {"transaction_id": "skip", "date": "2025-03-01", "is_ignored": True},
+    ])
+    return repository
+
+
+def test_count_and_cursor_pages(client):
+    assert client.get("/work-queue/count").json == {"unprocessed": 10, "claimed": 0}
+
+    seen, cursor = [], None
+    while True:
+        page = client.get("/work-queue", query_string={"limit": 4, "order": "newest", "cursor": cursor}).json
+        seen += [item["transaction_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"t{i:02d}" for i in range(9, -1, -1)]
+
+    oldest = client.get("/work-queue?limit=3").json["items"]
+    assert [item["transaction_id"] for item in oldest] == ["t00", "t01", "t02"]
+
+
+def test_claims_do_not_overlap_and_complete_releases(client):
+    alice = client.post("/work-queue/claim", json={"worker": "alice", "limit": 3}).json
+    bob = client.post("/work-queue/claim", json={"worker": "bob", "limit": 3}).json
+    alice_ids = [item["transaction_id"] for item in alice["items"]]
+    bob_ids = [item["transaction_id"] for item in bob["items"]]
+    assert alice_ids == ["t00", "t01", "t02"] and bob_ids == ["t03", "t04", "t05"]
+    assert client.get("/work-queue/count").json == {"unprocessed": 10, "claimed": 6}
+
+    response = client.post("/work-queue/complete", json={"claim_id": alice["claim_id"], "transactions": [
+        {"transaction_id": "t00", "user_category_id": 1},
+        {"transaction_id": "t01", "is_ignored": True},
+        {"transaction_id": "t03", "user_category_id": 1},  # bob's
+    ]})
+    assert response.status_code == 207
+    assert [result["success"] for result in response.json["results"]] == [True, True, False]
+
+    assert client.post("/work-queue/release", json={"claim_id": alice["claim_id"]}).json == {"released": 1}
+    assert client.get("/work-queue/count").json == {"unprocessed": 8, "claimed": 3}
+    again = client.post("/work-queue/claim", json={"worker": "carol", "limit": 2}).json
+    assert [item["transaction_id"] for item in again["items"]] == ["t02", "t06"]
+
+
+def test_queue_reads_use_the_partial_index(repository):
+    for sql in (
+        f"SELECT COUNT(*) FROM {_WORK_QUEUE} WHERE {_UNPROCESSED}",
+        f"SELECT * FROM {_WORK_QUEUE} WHERE {_UNPROCESSED} ORDER BY date DESC, transaction_id DESC LIMIT 50",
+    ):
+        plan = " ".join(row["detail"] for row in repository.query(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "idx_transactions_work_queue" in plan and "TEMP B-TREE" not in plan